@@ -1,5 +1,15 @@
-import pkg_resources
+from typing import Any
 
 sentry_dsn = "https://0c1dcd24a5c346e09115ffebdb780772@sentry.namibsun.net/9"
 
-version = pkg_resources.get_distribution("manga-dl").version
+
+def __getattr__(name: str) -> Any:
+    if name == "version":
+        from importlib import metadata
+        try:
+            resolved = metadata.version("manga-dl")
+        except metadata.PackageNotFoundError:
+            resolved = "unknown"
+        globals()["version"] = resolved
+        return resolved
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
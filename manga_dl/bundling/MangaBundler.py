@@ -1,5 +1,5 @@
-import importlib
-import pkgutil
+import os
+import shutil
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import List
@@ -10,6 +10,7 @@ from manga_dl.model.DownloadedFile import DownloadedFile
 from manga_dl.model.MangaChapter import MangaChapter
 from manga_dl.model.MangaFileFormat import MangaFileFormat
 from manga_dl.model.MangaSeries import MangaSeries
+from manga_dl.util.PluginRegistry import PluginRegistry
 
 
 class MangaBundler(ABC):
@@ -21,16 +22,40 @@ class MangaBundler(ABC):
     def get_file_format(self) -> MangaFileFormat:
         pass
 
+    def requires_cover(self) -> bool:
+        return False
+
     @abstractmethod  # pragma: no cover
     def bundle(self, images: List[DownloadedFile], destination: Path, series: MangaSeries, chapter: MangaChapter):
         pass
 
+    def bundle_atomically(
+            self, images: List[DownloadedFile], destination: Path, series: MangaSeries, chapter: MangaChapter
+    ):
+        partial = self.get_partial_path(destination)
+        self._remove(partial)
+        try:
+            self.bundle(images, partial, series, chapter)
+        except BaseException:
+            self._remove(partial)
+            raise
+
+        if destination.is_dir():
+            shutil.rmtree(destination)
+        os.replace(partial, destination)
+
     @staticmethod
-    def get_bundlers(injector: Injector) -> List["MangaBundler"]:
-        import manga_dl.bundling.impl as impl_module
-        modules = pkgutil.iter_modules(impl_module.__path__)
+    def get_partial_path(destination: Path) -> Path:
+        return destination.with_name(f"{destination.name}.part")
 
-        for module in modules:
-            importlib.import_module("manga_dl.bundling.impl." + module.name)
+    @staticmethod
+    def _remove(path: Path):
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink(missing_ok=True)
 
-        return list(map(lambda subclass: injector.get(subclass), MangaBundler.__subclasses__()))  # type: ignore
+    @staticmethod
+    def get_bundlers(injector: Injector) -> List["MangaBundler"]:
+        plugins = PluginRegistry.get_plugins(MangaBundler, "manga_dl.bundling.impl", PluginRegistry.BUNDLERS_GROUP)
+        return list(map(lambda subclass: injector.get(subclass), plugins))  # type: ignore
@@ -0,0 +1,66 @@
+import os
+import shutil
+from pathlib import Path
+from typing import List, Dict, Optional
+from zipfile import ZipFile
+
+from manga_dl.bundling.MangaBundler import MangaBundler
+from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.model.MangaSeries import MangaSeries
+from manga_dl.model.MangaVolume import MangaVolume
+from manga_dl.util.ComicRackMetadataGenerator import ComicRackMetadataGenerator
+
+
+class VolumeArchive:
+    COPY_CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+            self, destination: Path, series: MangaSeries, volume: MangaVolume,
+            comicrack: Optional[ComicRackMetadataGenerator]
+    ):
+        self.destination = destination
+        self.series = series
+        self.volume = volume
+        self.comicrack = comicrack
+        self._partial = MangaBundler.get_partial_path(destination)
+        self._zip_file = ZipFile(self._partial, "w", allowZip64=True)
+        self._page_files: List[str] = []
+        self._bookmarks: Dict[str, str] = {}
+        self._cover_file = self._write_cover()
+
+    def append_chapter(self, images: List[DownloadedFile], chapter: MangaChapter):
+        directory = chapter.get_filename(MangaFileFormat.DIR)
+        for image in images:
+            page_file = f"{directory}/{image.filename}"
+            self._write(image, page_file)
+            self._page_files.append(page_file)
+
+        if len(images) > 0:
+            self._bookmarks[f"{directory}/{images[0].filename}"] = f"Chapter {chapter.number}"
+
+    def close(self):
+        if self.comicrack is not None:
+            self._zip_file.writestr("ComicInfo.xml", self.comicrack.create_volume_metadata(
+                self.series, self.volume, self._cover_file, self._page_files, self._bookmarks
+            ))
+        self._zip_file.close()
+        os.replace(self._partial, self.destination)
+
+    def abort(self):
+        self._zip_file.close()
+        self._partial.unlink(missing_ok=True)
+
+    def _write_cover(self) -> Optional[str]:
+        cover = self.volume.resolve_cover()
+        if cover is None:
+            return None
+
+        cover_file = f"0-cover.{cover.get_extension()}"
+        self._write(cover, cover_file)
+        return cover_file
+
+    def _write(self, image: DownloadedFile, filename: str):
+        with image.open() as source, self._zip_file.open(filename, "w") as entry:
+            shutil.copyfileobj(source, entry, self.COPY_CHUNK_SIZE)
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from injector import inject
+
+from manga_dl.bundling.VolumeArchive import VolumeArchive
+from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.model.MangaSeries import MangaSeries
+from manga_dl.model.MangaVolume import MangaVolume
+from manga_dl.util.ComicRackMetadataGenerator import ComicRackMetadataGenerator
+
+
+class VolumeBundler:
+
+    @inject
+    def __init__(self, comicrack: ComicRackMetadataGenerator):
+        self.comicrack = comicrack
+
+    @staticmethod
+    def is_applicable(file_format: MangaFileFormat) -> bool:
+        return file_format in [MangaFileFormat.CBZ, MangaFileFormat.ZIP]
+
+    def open_volume(
+            self, destination: Path, series: MangaSeries, volume: MangaVolume, file_format: MangaFileFormat
+    ) -> VolumeArchive:
+        if not self.is_applicable(file_format):
+            raise ValueError(f"Volumes can't be bundled as {file_format.value}")
+        comicrack = self.comicrack if file_format == MangaFileFormat.CBZ else None
+        return VolumeArchive(destination, series, volume, comicrack)
@@ -23,15 +23,20 @@ class CBZBundler(ZipBundler, MangaBundler):
     def get_file_format(self) -> MangaFileFormat:
         return MangaFileFormat.CBZ
 
+    def requires_cover(self) -> bool:
+        return True
+
     def bundle(self, images: List[DownloadedFile], destination: Path, series: MangaSeries, chapter: MangaChapter):
         cbz_file = self._add_images_to_zipfile(images, destination)
 
         cover_file = None
-        if chapter.cover is not None:
-            extension = f".{chapter.cover.filename}".split(".")[-1]
+        cover = chapter.resolve_cover()
+        if cover is not None:
+            extension = f".{cover.filename}".split(".")[-1]
             cover_file = f"0-cover.{extension}"
-            cover_data = self.cover_manipulator.add_chapter_box(chapter.cover.data, f"Ch. {chapter.number}")
+            cover_data = self.cover_manipulator.add_chapter_box(cover.data, f"Ch. {chapter.number}")
             cbz_file.writestr(cover_file, cover_data)
 
-        cbz_file.writestr("ComicInfo.xml", self.comicrack.create_metadata(series, chapter, cover_file))
+        page_files = [image.filename for image in images]
+        cbz_file.writestr("ComicInfo.xml", self.comicrack.create_metadata(series, chapter, cover_file, page_files))
         cbz_file.close()
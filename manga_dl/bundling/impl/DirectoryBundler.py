@@ -1,3 +1,4 @@
+import shutil
 from pathlib import Path
 from typing import List
 
@@ -9,6 +10,7 @@ from manga_dl.model.MangaSeries import MangaSeries
 
 
 class DirectoryBundler(MangaBundler):
+    COPY_CHUNK_SIZE = 64 * 1024
 
     def get_file_format(self) -> MangaFileFormat:
         return MangaFileFormat.DIR
@@ -16,5 +18,9 @@ class DirectoryBundler(MangaBundler):
     def bundle(self, images: List[DownloadedFile], destination: Path, series: MangaSeries, chapter: MangaChapter):
         destination.mkdir(parents=True, exist_ok=True)
         for image in images:
-            with open(destination / image.filename, "wb") as imagefile:
-                imagefile.write(image.data)
+            if image.path is not None:
+                shutil.move(str(image.path), destination / image.filename)
+                continue
+
+            with image.open() as source, open(destination / image.filename, "wb") as imagefile:
+                shutil.copyfileobj(source, imagefile, self.COPY_CHUNK_SIZE)
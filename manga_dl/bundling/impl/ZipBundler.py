@@ -1,3 +1,4 @@
+import shutil
 from pathlib import Path
 from typing import List
 from zipfile import ZipFile
@@ -10,6 +11,7 @@ from manga_dl.model.MangaSeries import MangaSeries
 
 
 class ZipBundler(MangaBundler):
+    COPY_CHUNK_SIZE = 64 * 1024
 
     def get_file_format(self) -> MangaFileFormat:
         return MangaFileFormat.ZIP
@@ -18,9 +20,9 @@ class ZipBundler(MangaBundler):
         zip_file = self._add_images_to_zipfile(images, destination)
         zip_file.close()
 
-    @staticmethod
-    def _add_images_to_zipfile(images: List[DownloadedFile], destination: Path) -> ZipFile:
+    def _add_images_to_zipfile(self, images: List[DownloadedFile], destination: Path) -> ZipFile:
         zip_file = ZipFile(destination, "w")
         for image in images:
-            zip_file.writestr(image.filename, image.data)
+            with image.open() as source, zip_file.open(image.filename, "w") as entry:
+                shutil.copyfileobj(source, entry, self.COPY_CHUNK_SIZE)
         return zip_file
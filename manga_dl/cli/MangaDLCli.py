@@ -1,30 +1,62 @@
 import logging
 import sys
+from typing import List
 
 from injector import inject
 
 from manga_dl.cli.MangaDLCliOptions import MangaDLCliOptions
 from manga_dl.cli.MangaDLCliParser import MangaDLCliParser
 from manga_dl.download.MangaDownloader import MangaDownloader
+from manga_dl.download.MangaSynchronizer import MangaSynchronizer
+from manga_dl.download.MangaWatcher import MangaWatcher
 from manga_dl.model.MangaSeries import MangaSeries
 from manga_dl.scraping.ScrapingService import ScrapingService
+from manga_dl.util.NodeHealthTracker import NodeHealthTracker
+from manga_dl.util.RequestCounter import RequestCounter
+from manga_dl.util.ResponseCache import ResponseCache
 
 
 class MangaDLCli:
+    logger = logging.getLogger("MangaDLCli")
 
     @inject
-    def __init__(self, parser: MangaDLCliParser, scraper: ScrapingService, downloader: MangaDownloader):
+    def __init__(
+            self, parser: MangaDLCliParser, scraper: ScrapingService, downloader: MangaDownloader,
+            synchronizer: MangaSynchronizer, watcher: MangaWatcher, response_cache: ResponseCache,
+            request_counter: RequestCounter, node_health: NodeHealthTracker
+    ):
         self._parser = parser
         self._scraper = scraper
         self._downloader = downloader
+        self._synchronizer = synchronizer
+        self._watcher = watcher
+        self._response_cache = response_cache
+        self._request_counter = request_counter
+        self._node_health = node_health
         self._options = MangaDLCliOptions("")
 
     def run(self):
         self._options = self._parser.parse(sys.argv[1:])
         self._adjust_log_level()
-        series = self._scraper.scrape(self._options.url)
-        self._list_chapters(series)
-        self._download_chapters(series)
+        self._downloader.set_jobs(self._options.jobs)
+        self._downloader.set_bundle_processes(self._options.bundle_processes)
+        self._downloader.set_transform(self._options.transform)
+        self._downloader.set_bundle_volumes(self._options.bundle_volumes)
+        self._response_cache.set_offline(self._options.offline)
+        self._node_health.set_reporting(self._options.report_nodes)
+        self._scraper.set_image_quality(self._options.quality)
+
+        if self._options.watch and not self._options.list_chapters:
+            self._watch_chapters()
+        elif self._options.sync and not self._options.list_chapters:
+            self._sync_chapters()
+        else:
+            series_list = self._scrape_series()
+            self._list_chapters(series_list)
+            self._download_chapters(series_list)
+
+        self.logger.info(f"Image nodes: {self._node_health.format_stats()}")
+        self.logger.info(f"API calls: {self._request_counter.format_counts()}")
 
     def _adjust_log_level(self):
         if self._options.verbose:
@@ -32,12 +64,33 @@ class MangaDLCli:
         if self._options.quiet:
             logging.disable(logging.CRITICAL)
 
-    def _list_chapters(self, series: MangaSeries):
+    def _scrape_series(self) -> List[MangaSeries]:
+        series_list = []
+        for url in self._options.get_urls():
+            series = self._scraper.scrape(url, load_pages=False, selection=self._options.chapters)
+            if series is None:
+                self.logger.warning(f"No series found for {url}")
+            else:
+                series_list.append(series)
+        return series_list
+
+    def _list_chapters(self, series_list: List[MangaSeries]):
         if not self._options.list_chapters:
             return
-        print(series)
+        for series in series_list:
+            print(series)
 
-    def _download_chapters(self, series: MangaSeries):
-        if self._options.list_chapters:
+    def _download_chapters(self, series_list: List[MangaSeries]):
+        if self._options.list_chapters or len(series_list) == 0:
             return
-        self._downloader.download(series, self._options.out, self._options.file_format)
+        self._downloader.download_batch(series_list, self._options.out, self._options.file_format)
+
+    def _sync_chapters(self):
+        options = self._options
+        self._synchronizer.sync_batch(options.get_urls(), options.out, options.file_format, options.chapters)
+
+    def _watch_chapters(self):
+        options = self._options
+        self._watcher.watch(
+            options.get_urls(), options.out, options.file_format, options.watch_interval, options.chapters
+        )
@@ -1,8 +1,10 @@
 from dataclasses import dataclass, field
-from decimal import Decimal
 from pathlib import Path
 from typing import List
 
+from manga_dl.model.ChapterSelection import ChapterSelection
+from manga_dl.model.ImageQuality import ImageQuality
+from manga_dl.model.ImageTransform import ImageTransform
 from manga_dl.model.MangaFileFormat import MangaFileFormat
 
 
@@ -10,8 +12,22 @@ from manga_dl.model.MangaFileFormat import MangaFileFormat
 class MangaDLCliOptions:
     url: str
     list_chapters: bool = False
-    chapters: List[Decimal] = field(default_factory=list)
+    chapters: ChapterSelection = field(default_factory=ChapterSelection)
     out: Path = Path.home() / "Downloads/Manga"
     file_format: MangaFileFormat = MangaFileFormat.CBZ
     verbose: bool = False
     quiet: bool = False
+    jobs: int = 4
+    bundle_processes: int = 0
+    sync: bool = False
+    offline: bool = False
+    watch: bool = False
+    watch_interval: int = 3600
+    report_nodes: bool = False
+    quality: ImageQuality = ImageQuality.ORIGINAL
+    transform: ImageTransform = field(default_factory=ImageTransform)
+    bundle_volumes: bool = False
+    batch: List[str] = field(default_factory=list)
+
+    def get_urls(self) -> List[str]:
+        return [url for url in [self.url] + self.batch if url != ""]
@@ -1,9 +1,12 @@
 import argparse
-from decimal import Decimal
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from manga_dl.cli.MangaDLCliOptions import MangaDLCliOptions
+from manga_dl.model.ChapterSelection import ChapterSelection
+from manga_dl.model.ImageFormat import ImageFormat
+from manga_dl.model.ImageQuality import ImageQuality
+from manga_dl.model.ImageTransform import ImageTransform
 from manga_dl.model.MangaFileFormat import MangaFileFormat
 
 
@@ -12,17 +15,47 @@ class MangaDLCliParser:
     def __init__(self):
         defaults = MangaDLCliOptions("")
         self._parser = argparse.ArgumentParser()
-        self._parser.add_argument("url",
-                                  help="The URL from which to download the manga")
-        self._parser.add_argument("-c", "--chapters", nargs="+", default=defaults.chapters,
-                                  help="Specifies which chapters to download")
+        self._parser.add_argument("urls", nargs="*", metavar="url",
+                                  help="The URLs of the series to download")
+        self._parser.add_argument("-b", "--batch-file",
+                                  help="A file with one series URL per line to download in the same run")
+        self._parser.add_argument("-c", "--chapters", nargs="+", default=[],
+                                  help="Specifies which chapters to download, e.g. 5, 1-10, 12-, v3, v1-2, "
+                                       "latest:5 or since:2022-01-31")
         self._parser.add_argument("-l", "--list-chapters", action="store_true",
                                   help="Lists all found chapters")
         self._parser.add_argument("-f", "--file-format",
                                   choices=MangaFileFormat.options(), default=defaults.file_format.value,
                                   help="The format in which to store the chapters")
+        self._parser.add_argument("--quality",
+                                  choices=ImageQuality.options(), default=defaults.quality.value,
+                                  help="Download original images or the compressed data-saver variants")
+        self._parser.add_argument("--resize", type=int,
+                                  help="Downscale pages taller than this many pixels before bundling")
+        self._parser.add_argument("--transcode", choices=ImageFormat.options(),
+                                  help="Re-encode pages to this image format before bundling")
+        self._parser.add_argument("--transcode-quality", type=int, default=defaults.transform.quality,
+                                  help="The encoder quality used for resized or re-encoded pages")
+        self._parser.add_argument("--grayscale", action="store_true",
+                                  help="Convert pages to grayscale before bundling")
+        self._parser.add_argument("--volumes", action="store_true", dest="bundle_volumes",
+                                  help="Bundle one cbz or zip file per volume instead of per chapter")
         self._parser.add_argument("-o", "--out", default=defaults.out,
                                   help="Specifies the output path")
+        self._parser.add_argument("-j", "--jobs", type=int, default=defaults.jobs,
+                                  help="The maximum number of concurrent page downloads per host")
+        self._parser.add_argument("-p", "--bundle-processes", type=int, default=defaults.bundle_processes,
+                                  help="Bundle chapters in this many worker processes (0 bundles in-process)")
+        self._parser.add_argument("-s", "--sync", action="store_true",
+                                  help="Only download chapters that are new or were re-uploaded since the last sync")
+        self._parser.add_argument("-w", "--watch", action="store_true",
+                                  help="Keep running and sync the given series on a jittered schedule")
+        self._parser.add_argument("--watch-interval", type=int, default=defaults.watch_interval,
+                                  help="The number of seconds between checks in watch mode")
+        self._parser.add_argument("--report-nodes", action="store_true",
+                                  help="Report image download success and latency to the MangaDex@Home network")
+        self._parser.add_argument("--offline", action="store_true",
+                                  help="Answer API requests from the local response cache only")
         self._parser.add_argument("-v", "--verbose", action="store_true",
                                   help="Enable more verbose output")
         self._parser.add_argument("-q", "--quiet", action="store_true",
@@ -30,7 +63,34 @@ class MangaDLCliParser:
 
     def parse(self, cli_args: List[str]) -> MangaDLCliOptions:
         args = self._parser.parse_args(cli_args)
-        args.chapters = list(map(lambda chapter: Decimal(chapter), args.chapters))
+        urls = args.urls + self._read_batch_file(args.batch_file)
+        if len(urls) == 0:
+            self._parser.error("at least one url or a --batch-file is required")
+        args.url, args.batch = urls[0], urls[1:]
+        del args.urls, args.batch_file
+        try:
+            args.chapters = ChapterSelection.parse(args.chapters)
+        except ValueError as e:
+            self._parser.error(str(e))
         args.file_format = MangaFileFormat(args.file_format)
+        if args.bundle_volumes and (args.file_format == MangaFileFormat.DIR or args.sync or args.watch):
+            self._parser.error("--volumes requires the cbz or zip format and can't be combined with --sync or --watch")
+        if args.bundle_volumes and not args.chapters.selects_whole_volumes():
+            self._parser.error("--volumes only supports volume selections like --chapters v3 or v1-4")
+        args.quality = ImageQuality(args.quality)
+        args.transform = ImageTransform(
+            args.resize, None if args.transcode is None else ImageFormat(args.transcode), args.transcode_quality,
+            args.grayscale
+        )
+        del args.resize, args.transcode, args.transcode_quality, args.grayscale
         args.out = Path(args.out)
         return MangaDLCliOptions(**vars(args))
+
+    def _read_batch_file(self, batch_file: Optional[str]) -> List[str]:
+        if batch_file is None:
+            return []
+        try:
+            lines = Path(batch_file).read_text(encoding="utf8").splitlines()
+        except OSError as e:
+            self._parser.error(f"can't read batch file: {e}")
+        return [line.strip() for line in lines if line.strip() != "" and not line.strip().startswith("#")]
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import shutil
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+
+from injector import inject
+
+from manga_dl.bundling.MangaBundler import MangaBundler
+from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.model.MangaPage import MangaPage
+from manga_dl.model.MangaSeries import MangaSeries
+from manga_dl.util.AsyncHttpRequester import AsyncHttpRequester
+from manga_dl.util.ImageCache import ImageCache
+from manga_dl.util.PageJournal import PageJournal
+
+
+class AsyncMangaDownloader:
+    logger = logging.getLogger("AsyncMangaDownloader")
+
+    @inject
+    def __init__(self, requester: AsyncHttpRequester, bundlers: List[MangaBundler], image_cache: ImageCache):
+        self.requester = requester
+        self.bundlers = bundlers
+        self.image_cache = image_cache
+
+    def _get_bundler(self, file_format: MangaFileFormat) -> MangaBundler:
+        filtered = filter(lambda x: x.is_applicable(file_format), self.bundlers)
+        return next(filtered)
+
+    async def download_async(self, series: MangaSeries, target: Path, file_format: MangaFileFormat):
+        series_dir = target / series.name
+        series_dir.mkdir(parents=True, exist_ok=True)
+        bundler = self._get_bundler(file_format)
+        loop = asyncio.get_running_loop()
+        cover_prefetch = [
+            loop.run_in_executor(None, volume.resolve_cover)
+            for volume in series.volumes
+            if bundler.requires_cover()
+        ]
+
+        bundling: Optional[asyncio.Future] = None
+        for chapter, filename in series.get_chapter_filenames(bundler.get_file_format()):
+            chapter_file = series_dir / filename
+            self.logger.info(f"Downloading chapter {chapter.number}")
+            page_data = await self._download_chapter_pages(chapter, self._get_staging_dir(chapter_file))
+
+            if bundling is not None:
+                await bundling
+            bundling = self._bundle(bundler, page_data, chapter_file, series, chapter)
+
+        if bundling is not None:
+            await bundling
+        await asyncio.gather(*cover_prefetch)
+
+    async def download_single_chapter_async(
+            self, series: MangaSeries, chapter: MangaChapter, target: Path, file_format: MangaFileFormat
+    ):
+        bundler = self._get_bundler(file_format)
+        page_data = await self._download_chapter_pages(chapter, self._get_staging_dir(target))
+        await self._bundle(bundler, page_data, target, series, chapter)
+
+    async def close(self):
+        await self.requester.close()
+
+    def _bundle(
+            self, bundler: MangaBundler, page_data: List[DownloadedFile], target: Path, series: MangaSeries,
+            chapter: MangaChapter
+    ) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(None, self._bundle_and_clean_up, bundler, page_data, target, series, chapter)
+
+    def _bundle_and_clean_up(
+            self, bundler: MangaBundler, page_data: List[DownloadedFile], target: Path, series: MangaSeries,
+            chapter: MangaChapter
+    ):
+        bundler.bundle_atomically(page_data, target, series, chapter)
+        shutil.rmtree(self._get_staging_dir(target), ignore_errors=True)
+
+    @staticmethod
+    def _get_staging_dir(target: Path) -> Path:
+        return target.parent / f".{target.name}.part"
+
+    async def _download_chapter_pages(self, chapter: MangaChapter, staging_dir: Path) -> List[DownloadedFile]:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.image_cache.restore_pages, chapter)
+        pages = await loop.run_in_executor(None, chapter.resolve_pages)
+        page_data = await self._download_pages(pages, staging_dir, chapter)
+        await loop.run_in_executor(None, self.image_cache.evict)
+        return page_data
+
+    async def _download_pages(
+            self, pages: List[MangaPage], staging_dir: Path, chapter: Optional[MangaChapter] = None
+    ) -> List[DownloadedFile]:
+        loop = asyncio.get_running_loop()
+        ordered_pages = sorted(pages, key=lambda page: page.page_number)
+        journal = await loop.run_in_executor(None, self._open_journal, staging_dir, chapter)
+        pending = await loop.run_in_executor(
+            None, lambda: [page for page in ordered_pages if not journal.is_complete(page.get_filename())]
+        )
+        if len(pending) < len(ordered_pages):
+            self.logger.info(f"Resuming with {len(ordered_pages) - len(pending)} pages already downloaded")
+        failed = await self._stream_pages(pending, staging_dir, chapter, journal)
+
+        if len(failed) > 0 and chapter is not None and chapter.page_loader is not None:
+            self.logger.info(f"Re-resolving page URLs for {len(failed)} failed pages")
+            resolved = await loop.run_in_executor(None, lambda: chapter.resolve_pages(refresh=True))
+            refreshed = {page.page_number: page for page in resolved}
+            retried = [refreshed.get(page.page_number, page) for page in failed]
+            failed = await self._stream_pages(retried, staging_dir, chapter, journal)
+
+        await loop.run_in_executor(None, self._finish_pages, staging_dir, chapter, failed)
+
+        missing = {page.get_filename() for page in failed}
+        return [
+            DownloadedFile.from_path(
+                staging_dir / page.get_filename(), page.get_filename(), page.get_filename() in missing
+            )
+            for page in ordered_pages
+        ]
+
+    async def _stream_pages(
+            self, pages: List[MangaPage], staging_dir: Path, chapter: Optional[MangaChapter], journal: PageJournal
+    ) -> List[MangaPage]:
+        chapter_hash = None if chapter is None else chapter.content_hash
+        succeeded = await asyncio.gather(*[
+            self._download_page(page, staging_dir, chapter_hash, journal) for page in pages
+        ])
+        return [page for page, success in zip(pages, succeeded) if not success]
+
+    async def _download_page(
+            self, page: MangaPage, staging_dir: Path, chapter_hash: Optional[str], journal: PageJournal
+    ) -> bool:
+        loop = asyncio.get_running_loop()
+        page_file = staging_dir / page.get_filename()
+        if await loop.run_in_executor(None, self._fetch_cached_page, page, page_file, chapter_hash, journal):
+            return True
+
+        destination = await loop.run_in_executor(None, self._open_page_file, page_file)
+        try:
+            downloaded = await self.requester.stream_file(page.image_file, destination)
+        finally:
+            await loop.run_in_executor(None, destination.close)
+
+        if downloaded:
+            await loop.run_in_executor(None, self._store_page, page, page_file, chapter_hash, journal)
+        return downloaded
+
+    @staticmethod
+    def _open_journal(staging_dir: Path, chapter: Optional[MangaChapter]) -> PageJournal:
+        staging_dir.mkdir(parents=True, exist_ok=True)
+        return PageJournal(staging_dir, None if chapter is None else chapter.content_hash)
+
+    def _finish_pages(self, staging_dir: Path, chapter: Optional[MangaChapter], failed: List[MangaPage]):
+        for page in failed:
+            (staging_dir / page.get_filename()).write_bytes(b"Missing")
+
+        if len(failed) == 0 and chapter is not None:
+            self.image_cache.save_manifest(chapter)
+
+    def _fetch_cached_page(
+            self, page: MangaPage, page_file: Path, chapter_hash: Optional[str], journal: PageJournal
+    ) -> bool:
+        if chapter_hash is None or not self.image_cache.fetch_page(chapter_hash, page.get_filename(), page_file):
+            return False
+        journal.mark_complete(page.get_filename())
+        return True
+
+    @staticmethod
+    def _open_page_file(page_file: Path) -> BinaryIO:
+        page_file.unlink(missing_ok=True)
+        return open(page_file, "wb")
+
+    def _store_page(self, page: MangaPage, page_file: Path, chapter_hash: Optional[str], journal: PageJournal):
+        journal.mark_complete(page.get_filename())
+        if chapter_hash is not None:
+            self.image_cache.store_page(chapter_hash, page.get_filename(), page_file)
@@ -1,60 +1,276 @@
+import itertools
 import logging
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, List, Tuple, Optional
 
 from injector import inject
 
 from manga_dl.bundling.MangaBundler import MangaBundler
+from manga_dl.bundling.VolumeBundler import VolumeBundler
+from manga_dl.download.VolumeAssembler import VolumeAssembler
 from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.model.ImageTransform import ImageTransform
 from manga_dl.model.MangaChapter import MangaChapter
 from manga_dl.model.MangaFileFormat import MangaFileFormat
 from manga_dl.model.MangaPage import MangaPage
 from manga_dl.model.MangaSeries import MangaSeries
-from manga_dl.model.MangaVolume import MangaVolume
+from manga_dl.util.BundleExecutor import BundleExecutor
 from manga_dl.util.HttpRequester import HttpRequester
+from manga_dl.util.ImageCache import ImageCache
+from manga_dl.util.ImageTransformer import ImageTransformer
+from manga_dl.util.NodeHealthTracker import NodeHealthTracker
+from manga_dl.util.PageJournal import PageJournal
+from manga_dl.util.Pipeline import Pipeline
+
+ChapterTarget = Tuple[MangaSeries, MangaChapter, Path]
+DownloadedChapter = Tuple[MangaSeries, MangaChapter, Path, List[DownloadedFile]]
 
 
 class MangaDownloader:
     logger = logging.getLogger("MangaDownloader")
+    DEFAULT_JOBS = 4
+    PIPELINE_QUEUE_SIZE = 1
 
     @inject
-    def __init__(self, requester: HttpRequester, bundlers: List[MangaBundler]):
+    def __init__(
+            self, requester: HttpRequester, bundlers: List[MangaBundler], image_cache: ImageCache,
+            node_health: NodeHealthTracker, image_transformer: ImageTransformer, volume_bundler: VolumeBundler
+    ):
         self.requester = requester
         self.bundlers = bundlers
+        self.image_cache = image_cache
+        self.node_health = node_health
+        self.image_transformer = image_transformer
+        self.volume_bundler = volume_bundler
+        self.jobs = self.DEFAULT_JOBS
+        self.bundle_processes = 0
+        self.bundle_volumes = False
+
+    def set_jobs(self, jobs: int):
+        self.jobs = max(1, jobs)
+        self.requester.configure_pools(HttpRequester.DEFAULT_POOL_CONNECTIONS, self.jobs)
+
+    def set_bundle_processes(self, bundle_processes: int):
+        self.bundle_processes = max(0, bundle_processes)
+
+    def set_bundle_volumes(self, bundle_volumes: bool):
+        self.bundle_volumes = bundle_volumes
+
+    def set_transform(self, transform: ImageTransform):
+        self.image_transformer.set_transform(transform)
 
     def _get_bundler(self, file_format: MangaFileFormat) -> MangaBundler:
         filtered = filter(lambda x: x.is_applicable(file_format), self.bundlers)
         return next(filtered)
 
-    def download(self, series: MangaSeries, target: Path, file_format: MangaFileFormat):
+    def download(self, series: MangaSeries, target: Path, file_format: MangaFileFormat) -> List[MangaChapter]:
+        return self.download_batch([series], target, file_format)
+
+    def download_batch(
+            self, series_list: List[MangaSeries], target: Path, file_format: MangaFileFormat
+    ) -> List[MangaChapter]:
+        bundler = self._get_bundler(file_format)
+        if bundler.requires_cover() or self.bundle_volumes:
+            self._prefetch_covers(series_list)
+        chapter_targets = self._interleave([
+            self._get_chapter_targets(series, target, bundler) for series in series_list
+        ])
+        self.logger.info(f"Downloading {len(chapter_targets)} chapters of {len(series_list)} series")
+        if self.bundle_volumes:
+            completed = self._download_volumes_pipelined(chapter_targets, VolumeAssembler(
+                self.volume_bundler, series_list, target, bundler.get_file_format()
+            ))
+        else:
+            completed = self._download_pipelined(chapter_targets, bundler)
+        self.logger.info(
+            f"Opened {self.requester.get_opened_connection_count()} connections, "
+            f"reused connections {self.requester.get_reused_connection_count()} times"
+        )
+        return completed
+
+    @staticmethod
+    def _get_chapter_targets(series: MangaSeries, target: Path, bundler: MangaBundler) -> List[ChapterTarget]:
         series_dir = target / series.name
         series_dir.mkdir(parents=True, exist_ok=True)
-        bundler = self._get_bundler(file_format)
-        for volume in series.volumes:
-            self._download_volume(series, volume, series_dir, bundler)
+        return [
+            (series, chapter, series_dir / filename)
+            for chapter, filename in series.get_chapter_filenames(bundler.get_file_format())
+        ]
+
+    @staticmethod
+    def _interleave(queues: List[List[ChapterTarget]]) -> List[ChapterTarget]:
+        rounds = itertools.zip_longest(*queues)
+        return [chapter_target for targets in rounds for chapter_target in targets if chapter_target is not None]
+
+    def _prefetch_covers(self, series_list: List[MangaSeries]):
+        executor = ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="cover-download")
+        for series in series_list:
+            for volume in series.volumes:
+                executor.submit(volume.resolve_cover)
+        executor.shutdown(wait=False)
 
     def download_single_chapter(
             self, series: MangaSeries, chapter: MangaChapter, target: Path, file_format: MangaFileFormat
     ):
         bundler = self._get_bundler(file_format)
-        self._download_chapter(series, chapter, target, bundler)
+        with BundleExecutor(self.bundle_processes) as bundle_executor:
+            self._download_chapter(series, chapter, target, bundler, bundle_executor)
+        self.image_transformer.close()
+
+    def _download_pipelined(self, chapter_targets: List[ChapterTarget], bundler: MangaBundler) -> List[MangaChapter]:
+        completed: List[MangaChapter] = []
+        with BundleExecutor(self.bundle_processes) as bundle_executor:
+            pipeline = self._create_pipeline(
+                lambda downloaded: self._bundle_stage(downloaded, bundler, bundle_executor), completed
+            )
+            pipeline.run(chapter_targets)
+        self.image_transformer.close()
+        return completed
+
+    def _download_volumes_pipelined(
+            self, chapter_targets: List[ChapterTarget], assembler: VolumeAssembler
+    ) -> List[MangaChapter]:
+        completed: List[MangaChapter] = []
+        try:
+            self._create_pipeline(
+                lambda downloaded: self._volume_stage(downloaded, assembler), completed
+            ).run(chapter_targets)
+        finally:
+            assembler.abort()
+            self.image_transformer.close()
+        return completed
+
+    def _create_pipeline(
+            self, bundle_stage: Callable[[DownloadedChapter], None], completed: List[MangaChapter]
+    ) -> Pipeline:
+        stages: List[Callable[[Any], Any]] = [lambda chapter_target: self._download_stage(chapter_target, completed)]
+        if self.image_transformer.is_enabled():
+            stages.append(self._transform_stage)
+        stages.append(bundle_stage)
+        return Pipeline(stages, self.PIPELINE_QUEUE_SIZE)
+
+    def _download_stage(self, chapter_target: ChapterTarget, completed: List[MangaChapter]) -> DownloadedChapter:
+        series, chapter, target = chapter_target
+        self.logger.info(f"Downloading {series.name} chapter {chapter.number}")
+        page_data = self._download_chapter_pages(chapter, self._get_staging_dir(target))
+        if any(page.missing for page in page_data):
+            self.logger.warning(f"{series.name} chapter {chapter.number} is missing pages")
+        else:
+            completed.append(chapter)
+        return series, chapter, target, page_data
 
-    def _download_volume(self, series: MangaSeries, volume: MangaVolume, target: Path, bundler: MangaBundler):
-        for chapter in volume.chapters:
-            chapter_file = target / chapter.get_filename(bundler.get_file_format())
-            self._download_chapter(series, chapter, chapter_file, bundler)
+    def _transform_stage(self, downloaded: DownloadedChapter) -> DownloadedChapter:
+        series, chapter, target, page_data = downloaded
+        return series, chapter, target, self._transform(chapter, target, page_data)
 
-    def _download_chapter(self, series: MangaSeries, chapter: MangaChapter, target: Path, bundler: MangaBundler):
+    def _transform(self, chapter: MangaChapter, target: Path, page_data: List[DownloadedFile]) -> List[DownloadedFile]:
+        if not self.image_transformer.is_enabled():
+            return page_data
+        return self.image_transformer.transform_chapter(
+            page_data, self._get_staging_dir(target), f"chapter {chapter.number}"
+        )
+
+    def _bundle_stage(self, downloaded: DownloadedChapter, bundler: MangaBundler, bundle_executor: BundleExecutor):
+        series, chapter, target, page_data = downloaded
+        self.logger.info(f"Bundling {series.name} chapter {chapter.number}")
+        self._bundle(bundler, page_data, target, series, chapter, bundle_executor)
+
+    def _volume_stage(self, downloaded: DownloadedChapter, assembler: VolumeAssembler):
+        series, chapter, target, page_data = downloaded
+        self.logger.info(f"Adding {series.name} chapter {chapter.number} to its volume")
+        assembler.append(chapter, target, page_data, self._get_staging_dir(target))
+
+    def _download_chapter(
+            self, series: MangaSeries, chapter: MangaChapter, target: Path, bundler: MangaBundler,
+            bundle_executor: BundleExecutor
+    ):
         self.logger.info(f"Downloading chapter {chapter.number}")
-        page_data = self._download_pages([page for page in chapter.pages])
-        bundler.bundle(page_data, target, series, chapter)
+        page_data = self._download_chapter_pages(chapter, self._get_staging_dir(target))
+        page_data = self._transform(chapter, target, page_data)
+        self._bundle(bundler, page_data, target, series, chapter, bundle_executor)
+
+    def _bundle(
+            self, bundler: MangaBundler, page_data: List[DownloadedFile], target: Path, series: MangaSeries,
+            chapter: MangaChapter, bundle_executor: BundleExecutor
+    ):
+        staging_dir = self._get_staging_dir(target)
+        bundle_executor.submit(
+            bundler, page_data, target, series, chapter, lambda: shutil.rmtree(staging_dir, ignore_errors=True)
+        )
+
+    @staticmethod
+    def _get_staging_dir(target: Path) -> Path:
+        return target.parent / f".{target.name}.part"
+
+    def _download_chapter_pages(self, chapter: MangaChapter, staging_dir: Path) -> List[DownloadedFile]:
+        self.image_cache.restore_pages(chapter)
+        page_data = self._download_pages(chapter.resolve_pages(), staging_dir, chapter)
+        self.image_cache.evict()
+        return page_data
+
+    def _download_pages(
+            self, pages: List[MangaPage], staging_dir: Path, chapter: Optional[MangaChapter] = None
+    ) -> List[DownloadedFile]:
+        staging_dir.mkdir(parents=True, exist_ok=True)
+        ordered_pages = sorted(pages, key=lambda page: page.page_number)
+        journal = PageJournal(staging_dir, None if chapter is None else chapter.content_hash)
+        pending = [page for page in ordered_pages if not journal.is_complete(page.get_filename())]
+        if len(pending) < len(ordered_pages):
+            self.logger.info(f"Resuming with {len(ordered_pages) - len(pending)} pages already downloaded")
+        can_refresh = chapter is not None and chapter.page_loader is not None
+        failed = self._stream_pages(pending, staging_dir, chapter, journal, skip_degraded=can_refresh)
+
+        if len(failed) > 0 and chapter is not None and chapter.page_loader is not None:
+            self.logger.info(f"Re-resolving page URLs for {len(failed)} failed pages")
+            refreshed = {page.page_number: page for page in chapter.resolve_pages(refresh=True)}
+            retried = [refreshed.get(page.page_number, page) for page in failed]
+            failed = self._stream_pages(retried, staging_dir, chapter, journal, skip_degraded=True)
+
+        for page in failed:
+            (staging_dir / page.get_filename()).write_bytes(b"Missing")
+
+        if len(failed) == 0 and chapter is not None:
+            self.image_cache.save_manifest(chapter)
+
+        missing = {page.get_filename() for page in failed}
+        return [
+            DownloadedFile.from_path(
+                staging_dir / page.get_filename(), page.get_filename(), page.get_filename() in missing
+            )
+            for page in ordered_pages
+        ]
+
+    def _stream_pages(
+            self, pages: List[MangaPage], staging_dir: Path, chapter: Optional[MangaChapter], journal: PageJournal,
+            skip_degraded: bool
+    ) -> List[MangaPage]:
+        chapter_hash = None if chapter is None else chapter.content_hash
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="page-download") as executor:
+            succeeded = list(executor.map(
+                lambda page: self._download_page(page, staging_dir, chapter_hash, journal, skip_degraded), pages
+            ))
+        return [page for page, success in zip(pages, succeeded) if not success]
+
+    def _download_page(
+            self, page: MangaPage, staging_dir: Path, chapter_hash: Optional[str], journal: PageJournal,
+            skip_degraded: bool
+    ) -> bool:
+        page_file = staging_dir / page.get_filename()
+        if chapter_hash is not None and self.image_cache.fetch_page(chapter_hash, page.get_filename(), page_file):
+            journal.mark_complete(page.get_filename())
+            return True
 
-    def _download_pages(self, pages: List[MangaPage]) -> List[DownloadedFile]:
+        if skip_degraded and self.node_health.is_degraded(page.image_file):
+            return False
 
-        downloaded = []
-        for page in pages:
-            page_data = self.requester.download_file(page.image_file)
-            page_data = b"Missing" if page_data is None else page_data
-            downloaded.append(DownloadedFile(page_data, page.get_filename()))
+        page_file.unlink(missing_ok=True)
+        with open(page_file, "wb") as destination:
+            downloaded = self.requester.stream_file(page.image_file, destination)
 
+        if downloaded:
+            journal.mark_complete(page.get_filename())
+        if downloaded and chapter_hash is not None:
+            self.image_cache.store_page(chapter_hash, page.get_filename(), page_file)
         return downloaded
@@ -0,0 +1,107 @@
+import logging
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from injector import inject
+
+from manga_dl.download.MangaDownloader import MangaDownloader
+from manga_dl.model.ChapterSelection import ChapterSelection
+from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.model.MangaSeries import MangaSeries
+from manga_dl.scraping.ScrapingService import ScrapingService
+from manga_dl.util.SyncStateStore import SyncStateStore
+from manga_dl.util.Timer import Timer
+
+
+class MangaSynchronizer:
+    logger = logging.getLogger("MangaSynchronizer")
+    SYNC_OVERLAP = timedelta(minutes=5)
+
+    @inject
+    def __init__(
+            self, scraper: ScrapingService, downloader: MangaDownloader, state_store: SyncStateStore, timer: Timer
+    ):
+        self.scraper = scraper
+        self.downloader = downloader
+        self.state_store = state_store
+        self.timer = timer
+
+    def sync(
+            self, series_url: str, target: Path, file_format: MangaFileFormat,
+            selection: Optional[ChapterSelection] = None
+    ) -> Optional[MangaSeries]:
+        return self.sync_batch([series_url], target, file_format, selection)[0]
+
+    def sync_batch(
+            self, series_urls: List[str], target: Path, file_format: MangaFileFormat,
+            selection: Optional[ChapterSelection] = None
+    ) -> List[Optional[MangaSeries]]:
+        selection = ChapterSelection() if selection is None else selection
+        sync_started = datetime.utcfromtimestamp(self.timer.time())
+        planned = [self._plan(series_url, selection) for series_url in series_urls]
+
+        pending = [series for _, series in filter(None, planned) if len(series.get_chapters()) > 0]
+        completed: List[MangaChapter] = []
+        if len(pending) > 0:
+            chapter_count = sum(len(series.get_chapters()) for series in pending)
+            self.logger.info(f"Downloading {chapter_count} new or updated chapters of {len(pending)} series")
+            completed = self.downloader.download_batch(pending, target, file_format)
+
+        for series_id, series in filter(None, planned):
+            chapters = series.get_chapters()
+            succeeded = [
+                chapter for chapter in chapters if chapter in completed and chapter.content_hash is not None
+            ]
+            for chapter in succeeded:
+                self.state_store.mark_downloaded(series_id, chapter, sync_started)
+            if len(chapters) == 0:
+                self.logger.info(f"Series {series_id} is up to date")
+            if len(succeeded) < len(chapters):
+                self.logger.warning(
+                    f"{len(chapters) - len(succeeded)} chapters of series {series_id} failed and will be retried"
+                )
+            elif selection.is_empty():
+                self.state_store.set_last_sync(series_id, sync_started - self.SYNC_OVERLAP)
+
+        return [None if plan is None else plan[1] for plan in planned]
+
+    def _plan(self, series_url: str, selection: ChapterSelection) -> Optional[Tuple[str, MangaSeries]]:
+        series_id = self.scraper.get_series_id(series_url)
+        if series_id is None:
+            self.logger.warning(f"No scraping method found for {series_url}")
+            return None
+
+        sync_selection = self._get_sync_selection(series_id, selection)
+        series = self.scraper.scrape(series_url, load_pages=False, selection=sync_selection)
+        if series is None:
+            return None
+
+        for volume in series.volumes:
+            volume.chapters = [chapter for chapter in volume.chapters if self._needs_download(series_id, chapter)]
+        series.volumes = [volume for volume in series.volumes if len(volume.chapters) > 0]
+        return series_id, series
+
+    def _get_sync_selection(self, series_id: str, selection: ChapterSelection) -> ChapterSelection:
+        if not selection.is_empty():
+            return selection
+        return replace(selection, updated_since=self.state_store.get_last_sync(series_id))
+
+    def _needs_download(self, series_id: str, chapter: MangaChapter) -> bool:
+        state = None if chapter.id is None else self.state_store.get_chapter_state(series_id, chapter.id)
+
+        if state is None:
+            return True
+
+        if state.updated_at == chapter.updated_at:
+            return False
+
+        chapter.resolve_pages()
+        if chapter.content_hash is not None and chapter.content_hash == state.chapter_hash:
+            self.logger.info(f"Chapter {chapter.number} was updated without re-upload, skipping")
+            self.state_store.mark_unchanged(series_id, chapter)
+            return False
+
+        return True
@@ -0,0 +1,49 @@
+import logging
+import random
+from pathlib import Path
+from typing import List, Optional
+
+from injector import inject
+
+from manga_dl.download.MangaSynchronizer import MangaSynchronizer
+from manga_dl.model.ChapterSelection import ChapterSelection
+from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.util.Timer import Timer
+
+
+class MangaWatcher:
+    logger = logging.getLogger("MangaWatcher")
+    JITTER = 0.1
+
+    @inject
+    def __init__(self, synchronizer: MangaSynchronizer, timer: Timer):
+        self.synchronizer = synchronizer
+        self.timer = timer
+
+    def watch(
+            self, series_urls: List[str], target: Path, file_format: MangaFileFormat, interval: float,
+            selection: Optional[ChapterSelection] = None, polls: Optional[int] = None
+    ):
+        self.logger.info(f"Watching {len(series_urls)} series every {interval} seconds")
+        poll = 0
+        while polls is None or poll < polls:
+            started = self.timer.monotonic()
+            self._poll(series_urls, target, file_format, selection)
+            poll += 1
+            if polls is None or poll < polls:
+                delay = self._get_delay(interval, self.timer.monotonic() - started)
+                self.logger.info(f"Next check in {delay:.0f} seconds")
+                self.timer.sleep(delay)
+
+    def _poll(
+            self, series_urls: List[str], target: Path, file_format: MangaFileFormat,
+            selection: Optional[ChapterSelection]
+    ):
+        try:
+            self.synchronizer.sync_batch(series_urls, target, file_format, selection)
+        except Exception:
+            self.logger.exception("Checking followed series failed, retrying next interval")
+
+    def _get_delay(self, interval: float, elapsed: float) -> float:
+        jitter = random.uniform(-self.JITTER, self.JITTER) * interval
+        return max(0.0, interval + jitter - elapsed)
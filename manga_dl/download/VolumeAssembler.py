@@ -0,0 +1,59 @@
+import itertools
+import logging
+import shutil
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from manga_dl.bundling.VolumeArchive import VolumeArchive
+from manga_dl.bundling.VolumeBundler import VolumeBundler
+from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.model.MangaSeries import MangaSeries
+from manga_dl.model.MangaVolume import MangaVolume
+
+
+class VolumeAssembler:
+    logger = logging.getLogger("VolumeAssembler")
+
+    def __init__(
+            self, volume_bundler: VolumeBundler, series_list: List[MangaSeries], target: Path,
+            file_format: MangaFileFormat
+    ):
+        self.volume_bundler = volume_bundler
+        self.file_format = file_format
+        self._volumes: Dict[Path, Tuple[MangaSeries, MangaVolume, Path]] = {}
+        self._remaining: Dict[Path, int] = {}
+        self._archives: Dict[Path, VolumeArchive] = {}
+        self._staging_dirs: Dict[Path, List[Path]] = {}
+
+        for series in series_list:
+            series_dir = target / series.name
+            chapter_filenames = iter(series.get_chapter_filenames(file_format))
+            for volume in series.volumes:
+                volume_target = series_dir / volume.get_filename(file_format)
+                self._remaining[volume_target] = len(volume.chapters)
+                for _, filename in itertools.islice(chapter_filenames, len(volume.chapters)):
+                    self._volumes[series_dir / filename] = (series, volume, volume_target)
+
+    def append(self, chapter: MangaChapter, chapter_target: Path, images: List[DownloadedFile], staging_dir: Path):
+        series, volume, volume_target = self._volumes[chapter_target]
+        archive = self._archives.get(volume_target)
+        if archive is None:
+            archive = self.volume_bundler.open_volume(volume_target, series, volume, self.file_format)
+            self._archives[volume_target] = archive
+
+        archive.append_chapter(images, chapter)
+        self._staging_dirs.setdefault(volume_target, []).append(staging_dir)
+        self._remaining[volume_target] -= 1
+
+        if self._remaining[volume_target] == 0:
+            self.logger.info(f"Finishing volume {volume_target.name} of {series.name}")
+            self._archives.pop(volume_target).close()
+            for chapter_staging_dir in self._staging_dirs.pop(volume_target):
+                shutil.rmtree(chapter_staging_dir, ignore_errors=True)
+
+    def abort(self):
+        for archive in self._archives.values():
+            archive.abort()
+        self._archives = {}
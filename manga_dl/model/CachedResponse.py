@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import Optional, Dict
+
+
+@dataclass
+class CachedResponse:
+    body: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = 0.0
+
+    def is_fresh(self, now: float, ttl: float) -> bool:
+        return now - self.stored_at < ttl
+
+    def get_validation_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
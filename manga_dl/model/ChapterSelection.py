@@ -0,0 +1,112 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import List, Optional, Tuple
+
+from manga_dl.model.MangaChapter import MangaChapter
+
+NumberRange = Tuple[Optional[Decimal], Optional[Decimal]]
+
+
+@dataclass
+class ChapterSelection:
+    chapter_ranges: List[NumberRange] = field(default_factory=list)
+    volume_ranges: List[NumberRange] = field(default_factory=list)
+    latest: Optional[int] = None
+    since: Optional[datetime] = None
+    updated_since: Optional[datetime] = None
+
+    @staticmethod
+    def parse(expressions: List[str]) -> "ChapterSelection":
+        selection = ChapterSelection()
+
+        for expression in expressions:
+            expression = expression.strip().lower()
+            if expression.startswith("latest:"):
+                selection.latest = ChapterSelection._parse_latest(expression[len("latest:"):])
+            elif expression.startswith("since:"):
+                selection.since = ChapterSelection._parse_since(expression[len("since:"):])
+            elif expression.startswith("v"):
+                selection.volume_ranges.append(ChapterSelection._parse_range(expression[1:]))
+            else:
+                selection.chapter_ranges.append(ChapterSelection._parse_range(expression))
+
+        return selection
+
+    @staticmethod
+    def _parse_latest(value: str) -> int:
+        if not value.isdigit() or int(value) < 1:
+            raise ValueError(f"Invalid chapter count: {value}")
+        return int(value)
+
+    @staticmethod
+    def _parse_since(value: str) -> datetime:
+        try:
+            return datetime.strptime(value, "%Y-%m-%d")
+        except ValueError:
+            raise ValueError(f"Invalid date (expected YYYY-MM-DD): {value}")
+
+    @staticmethod
+    def _parse_range(value: str) -> NumberRange:
+        start, separator, end = value.partition("-")
+        try:
+            lower = None if start == "" else Decimal(start)
+            upper = lower if separator == "" else (None if end == "" else Decimal(end))
+        except InvalidOperation:
+            raise ValueError(f"Invalid chapter or volume range: {value}")
+
+        if lower is None and upper is None:
+            raise ValueError(f"Invalid chapter or volume range: {value}")
+
+        return lower, upper
+
+    @staticmethod
+    def _in_range(number: Decimal, number_range: NumberRange) -> bool:
+        lower, upper = number_range
+        return (lower is None or number >= lower) and (upper is None or number <= upper)
+
+    @staticmethod
+    def _get_exact_numbers(ranges: List[NumberRange]) -> Optional[List[Decimal]]:
+        if any(lower is None or lower != upper for lower, upper in ranges):
+            return None
+        return [lower for lower, _ in ranges if lower is not None]
+
+    def is_empty(self) -> bool:
+        return self == ChapterSelection()
+
+    def selects_whole_volumes(self) -> bool:
+        return self == ChapterSelection(volume_ranges=self.volume_ranges)
+
+    def get_exact_chapters(self) -> Optional[List[Decimal]]:
+        if len(self.chapter_ranges) == 0 or len(self.volume_ranges) > 0:
+            return None
+        return self._get_exact_numbers(self.chapter_ranges)
+
+    def get_exact_volumes(self) -> Optional[List[Decimal]]:
+        if len(self.volume_ranges) == 0 or len(self.chapter_ranges) > 0:
+            return None
+        return self._get_exact_numbers(self.volume_ranges)
+
+    def matches(self, chapter: MangaChapter) -> bool:
+        if self.since is not None and chapter.published_at < self.since:
+            return False
+
+        updated_at = chapter.updated_at
+        if self.updated_since is not None and updated_at is not None and updated_at < self.updated_since:
+            return False
+
+        if len(self.chapter_ranges) == 0 and len(self.volume_ranges) == 0:
+            return True
+
+        in_chapters = any(self._in_range(chapter.number, x) for x in self.chapter_ranges)
+        in_volumes = chapter.volume is not None and any(self._in_range(chapter.volume, x) for x in self.volume_ranges)
+        return in_chapters or in_volumes
+
+    def apply(self, chapters: List[MangaChapter]) -> List[MangaChapter]:
+        selected = [chapter for chapter in chapters if self.matches(chapter)]
+
+        if self.latest is not None:
+            latest_numbers = set(sorted({chapter.number for chapter in selected})[-self.latest:])
+            selected = [chapter for chapter in selected if chapter.number in latest_numbers]
+
+        return selected
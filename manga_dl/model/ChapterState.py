@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class ChapterState:
+    chapter_id: str
+    chapter_hash: Optional[str]
+    updated_at: Optional[datetime]
+    downloaded_at: datetime
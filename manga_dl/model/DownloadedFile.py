@@ -1,10 +1,30 @@
+import mmap
+import os
 from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, BinaryIO, cast
 
 
 @dataclass
 class DownloadedFile:
     data: bytes
     filename: str
+    path: Optional[Path] = None
+    missing: bool = False
+
+    @classmethod
+    def from_path(cls, path: Path, filename: str, missing: bool = False) -> "DownloadedFile":
+        return cls(b"", filename, path, missing)
+
+    def open(self) -> BinaryIO:
+        if self.path is None:
+            return BytesIO(self.data)
+
+        with open(self.path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return BytesIO(b"")
+            return cast(BinaryIO, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
 
     def get_extension(self) -> str:
         if "." not in self.filename:
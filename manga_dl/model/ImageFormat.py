@@ -0,0 +1,14 @@
+from collections.abc import Set
+from enum import Enum
+
+
+class ImageFormat(Enum):
+    JPEG = "jpeg"
+    WEBP = "webp"
+
+    @staticmethod
+    def options() -> Set[str]:
+        return {x.value for x in ImageFormat}
+
+    def get_extension(self) -> str:
+        return "jpg" if self == ImageFormat.JPEG else self.value
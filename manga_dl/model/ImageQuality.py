@@ -0,0 +1,11 @@
+from collections.abc import Set
+from enum import Enum
+
+
+class ImageQuality(Enum):
+    ORIGINAL = "original"
+    DATA_SAVER = "data-saver"
+
+    @staticmethod
+    def options() -> Set[str]:
+        return {x.value for x in ImageQuality}
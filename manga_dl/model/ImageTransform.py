@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from manga_dl.model.ImageFormat import ImageFormat
+
+
+@dataclass(frozen=True)
+class ImageTransform:
+    max_height: Optional[int] = None
+    image_format: Optional[ImageFormat] = None
+    quality: int = 85
+    grayscale: bool = False
+
+    def is_enabled(self) -> bool:
+        return self.max_height is not None or self.image_format is not None or self.grayscale
@@ -1,9 +1,10 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Callable
 
 from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.model.ImageQuality import ImageQuality
 from manga_dl.model.MangaFileFormat import MangaFileFormat
 from manga_dl.model.MangaPage import MangaPage
 
@@ -16,10 +17,29 @@ class MangaChapter:
     published_at: datetime = datetime.utcfromtimestamp(0)
     pages: List[MangaPage] = field(default_factory=list)
     cover: Optional[DownloadedFile] = None
-
-    def get_filename(self, file_format: MangaFileFormat) -> str:
+    id: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    content_hash: Optional[str] = None
+    image_quality: ImageQuality = ImageQuality.ORIGINAL
+    page_loader: Optional[Callable[[], List[MangaPage]]] = field(default=None, repr=False, compare=False)
+    cover_loader: Optional[Callable[[], Optional[DownloadedFile]]] = field(default=None, repr=False, compare=False)
+
+    def resolve_pages(self, refresh: bool = False) -> List[MangaPage]:
+        if self.page_loader is not None and (refresh or len(self.pages) == 0):
+            self.pages = self.page_loader()
+        return self.pages
+
+    def resolve_cover(self) -> Optional[DownloadedFile]:
+        if self.cover is None and self.cover_loader is not None:
+            self.cover = self.cover_loader()
+        return self.cover
+
+    def get_filename(self, file_format: MangaFileFormat, discriminator: Optional[str] = None) -> str:
         filename = f"c{self.number}-{self.title}"
 
+        if discriminator is not None:
+            filename = f"{filename}-{discriminator}"
+
         if self.volume is not None:
             filename = f"v{self.volume}{filename}"
 
@@ -1,8 +1,9 @@
 import itertools
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List, Optional, Set, Tuple
 
 from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaFileFormat import MangaFileFormat
 from manga_dl.model.MangaVolume import MangaVolume
 
 
@@ -16,3 +17,18 @@ class MangaSeries:
 
     def get_chapters(self) -> List[MangaChapter]:
         return list(itertools.chain(*[volume.chapters for volume in self.volumes]))
+
+    def get_chapter_filenames(self, file_format: MangaFileFormat) -> List[Tuple[MangaChapter, str]]:
+        taken: Set[str] = set()
+        filenames = []
+        for chapter in self.get_chapters():
+            filename = chapter.get_filename(file_format)
+            if filename in taken and chapter.id is not None:
+                filename = chapter.get_filename(file_format, chapter.id[:8])
+            duplicate = 2
+            while filename in taken:
+                filename = chapter.get_filename(file_format, str(duplicate))
+                duplicate += 1
+            taken.add(filename)
+            filenames.append((chapter, filename))
+        return filenames
@@ -1,9 +1,10 @@
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Optional, Callable
 
 from manga_dl.model.DownloadedFile import DownloadedFile
 from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaFileFormat import MangaFileFormat
 
 
 @dataclass
@@ -11,3 +12,17 @@ class MangaVolume:
     volume_number: Optional[Decimal] = None
     chapters: List[MangaChapter] = field(default_factory=list)
     cover: Optional[DownloadedFile] = None
+    cover_loader: Optional[Callable[[], Optional[DownloadedFile]]] = field(default=None, repr=False, compare=False)
+
+    def resolve_cover(self) -> Optional[DownloadedFile]:
+        if self.cover is None and self.cover_loader is not None:
+            self.cover = self.cover_loader()
+        return self.cover
+
+    def get_filename(self, file_format: MangaFileFormat) -> str:
+        filename = "no-volume" if self.volume_number is None else f"v{self.volume_number}"
+
+        if file_format != MangaFileFormat.DIR:
+            filename = f"{filename}.{file_format.value}"
+
+        return filename
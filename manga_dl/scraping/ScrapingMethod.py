@@ -1,11 +1,12 @@
-import importlib
-import pkgutil
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
 from injector import Injector
 
+from manga_dl.model.ChapterSelection import ChapterSelection
+from manga_dl.model.ImageQuality import ImageQuality
 from manga_dl.model.MangaSeries import MangaSeries
+from manga_dl.util.PluginRegistry import PluginRegistry
 
 
 class ScrapingMethod(ABC):
@@ -19,15 +20,17 @@ class ScrapingMethod(ABC):
         pass
 
     @abstractmethod  # pragma: no cover
-    def get_series(self, series_id: str, load_pages: bool = True) -> Optional[MangaSeries]:
+    def get_series(
+            self, series_id: str, load_pages: bool = True, selection: Optional[ChapterSelection] = None
+    ) -> Optional[MangaSeries]:
+        pass
+
+    def set_image_quality(self, image_quality: ImageQuality):
         pass
 
     @staticmethod
     def get_scraping_methods(injector: Injector) -> List["ScrapingMethod"]:
-        import manga_dl.scraping.methods as methods_module
-        modules = pkgutil.iter_modules(methods_module.__path__)
-
-        for module in modules:
-            importlib.import_module("manga_dl.scraping.methods." + module.name)
-
-        return list(map(lambda subclass: injector.get(subclass), ScrapingMethod.__subclasses__()))  # type: ignore
+        plugins = PluginRegistry.get_plugins(
+            ScrapingMethod, "manga_dl.scraping.methods", PluginRegistry.SCRAPING_METHODS_GROUP
+        )
+        return list(map(lambda subclass: injector.get(subclass), plugins))  # type: ignore
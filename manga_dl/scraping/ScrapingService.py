@@ -2,6 +2,8 @@ from typing import List, Optional
 
 from injector import inject
 
+from manga_dl.model.ChapterSelection import ChapterSelection
+from manga_dl.model.ImageQuality import ImageQuality
 from manga_dl.model.MangaSeries import MangaSeries
 from manga_dl.scraping.ScrapingMethod import ScrapingMethod
 
@@ -12,7 +14,9 @@ class ScrapingService:
     def __init__(self, scraping_methods: List[ScrapingMethod]):
         self.scraping_methods = scraping_methods
 
-    def scrape(self, series_url: str, load_pages: bool = True) -> Optional[MangaSeries]:
+    def scrape(
+            self, series_url: str, load_pages: bool = True, selection: Optional[ChapterSelection] = None
+    ) -> Optional[MangaSeries]:
         scraping_method = self._find_applicable_scraping_method(series_url)
 
         if scraping_method is None:
@@ -23,7 +27,15 @@ class ScrapingService:
         if series_id is None:
             return None
 
-        return scraping_method.get_series(series_id, load_pages)
+        return scraping_method.get_series(series_id, load_pages, selection)
+
+    def set_image_quality(self, image_quality: ImageQuality):
+        for scraping_method in self.scraping_methods:
+            scraping_method.set_image_quality(image_quality)
+
+    def get_series_id(self, series_url: str) -> Optional[str]:
+        scraping_method = self._find_applicable_scraping_method(series_url)
+        return None if scraping_method is None else scraping_method.parse_id(series_url)
 
     def _find_applicable_scraping_method(self, series_url: str) -> Optional[ScrapingMethod]:
         filtered = filter(lambda x: x.is_applicable(series_url), self.scraping_methods)
@@ -2,6 +2,8 @@ from typing import Optional
 
 from injector import inject
 
+from manga_dl.model.ChapterSelection import ChapterSelection
+from manga_dl.model.ImageQuality import ImageQuality
 from manga_dl.model.MangaSeries import MangaSeries
 from manga_dl.scraping.ScrapingMethod import ScrapingMethod
 from manga_dl.scraping.methods.api.MangadexApi import MangadexApi
@@ -22,5 +24,10 @@ class MangadexScraping(ScrapingMethod):
         except IndexError:
             return None
 
-    def get_series(self, series_id: str, load_pages: bool = True) -> Optional[MangaSeries]:
-        return self.mangadex_api.get_series(series_id, load_pages)
+    def set_image_quality(self, image_quality: ImageQuality):
+        self.mangadex_api.set_image_quality(image_quality)
+
+    def get_series(
+            self, series_id: str, load_pages: bool = True, selection: Optional[ChapterSelection] = None
+    ) -> Optional[MangaSeries]:
+        return self.mangadex_api.get_series(series_id, load_pages, selection)
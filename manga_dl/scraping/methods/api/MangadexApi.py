@@ -1,44 +1,90 @@
+import functools
 import itertools
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlparse
 
-from injector import inject
+from injector import inject, singleton
 
+from manga_dl.model.ChapterSelection import ChapterSelection
 from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.model.ImageQuality import ImageQuality
 from manga_dl.model.MangaChapter import MangaChapter
 from manga_dl.model.MangaPage import MangaPage
 from manga_dl.model.MangaSeries import MangaSeries
 from manga_dl.model.MangaVolume import MangaVolume
 from manga_dl.util.DateConverter import DateConverter
 from manga_dl.util.HttpRequester import HttpRequester
-from manga_dl.util.Timer import Timer
+from manga_dl.util.ImageCache import ImageCache
+from manga_dl.util.Lazy import Lazy
+from manga_dl.util.NodeHealthTracker import NodeHealthTracker
+from manga_dl.util.RateLimiter import RateLimiter
 
 
+@singleton
 class MangadexApi:
     base_url = "https://api.mangadex.org"
     logger = logging.getLogger("MangadexApi")
+    API_BUCKET = "mangadex-api"
+    AT_HOME_BUCKET = "mangadex-at-home"
+    SERIES_CACHE_TTL = 24 * 60 * 60
+    FEED_CACHE_TTL = 10 * 60
+    COVER_PAGE_SIZE = 100
+    FEED_PAGE_SIZE = 500
+    CHAPTER_PAGE_SIZE = 100
+    FEED_WORKERS = 5
+    ID_PATTERN = re.compile(r"^(?=.*[0-9])[0-9a-f-]+$")
+    SERIES_INCLUDES = ["author", "artist", "cover_art"]
+    REPORT_URL = "https://api.mangadex.network/report"
+    UPLOADS_URL = "https://uploads.mangadex.org"
+    AT_HOME_FILES = {ImageQuality.ORIGINAL: ("data", "data"), ImageQuality.DATA_SAVER: ("data-saver", "dataSaver")}
 
     @inject
-    def __init__(self, http_requester: HttpRequester, date_converter: DateConverter, timer: Timer):
-        self.timer = timer
+    def __init__(
+            self, http_requester: HttpRequester, date_converter: DateConverter, rate_limiter: RateLimiter,
+            image_cache: ImageCache, node_health: NodeHealthTracker
+    ):
         self.http_requester = http_requester
         self.date_converter = date_converter
-
-    def get_series(self, series_id: str, load_pages: bool = True) -> Optional[MangaSeries]:
+        self.image_cache = image_cache
+        self.node_health = node_health
+        self.image_quality = ImageQuality.ORIGINAL
+        self._report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="node-report")
+        node_health.add_reporter(self._report_image)
+        rate_limiter.configure_bucket(self.API_BUCKET, rate=5, capacity=5)
+        rate_limiter.configure_bucket(self.AT_HOME_BUCKET, rate=40 / 60, capacity=40)
+
+    def set_image_quality(self, image_quality: ImageQuality):
+        self.image_quality = image_quality
+
+    def get_series(
+            self, series_id: str, load_pages: bool = True, selection: Optional[ChapterSelection] = None
+    ) -> Optional[MangaSeries]:
         self.logger.info(f"Loading data for series {series_id}")
         try:
-            title, author, artist = self._load_series_info(series_id)
+            selection = ChapterSelection() if selection is None else selection
+            chapters = self._load_chapters(series_id, load_pages, selection)
+
+            if len(chapters) == 0 and selection.updated_since is not None:
+                self.logger.info(f"No chapters updated since {selection.updated_since}")
+                return MangaSeries(series_id, "")
+
+            title, author, artist, main_cover = self._load_series_info(series_id)
             self.logger.info(f"Found info: title={title}, author={author}, artist={artist}")
-            volumes = self._load_volumes(series_id, load_pages)
+            volumes = self._load_volumes(series_id, chapters, main_cover)
             return MangaSeries(series_id, title, author, artist, volumes)
         except ValueError as e:
             self.logger.warning(f"Failed to load series: {e}")
             return None
 
     def _call_api(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        self.timer.sleep(0.5)
-        response = self.http_requester.get_json(f"{self.base_url}/{endpoint}", params)
+        response = self.http_requester.get_json(
+            f"{self.base_url}/{endpoint}", params, self._get_rate_limit_bucket(endpoint), self._get_cache_ttl(endpoint),
+            self._get_endpoint_name(endpoint)
+        )
 
         if response is None or response["result"] == "error":
             self.logger.warning(response)
@@ -46,82 +92,143 @@ class MangadexApi:
 
         return response
 
-    def _call_api_ignore_errors(self, endpoint: str) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _get_endpoint_name(endpoint: str) -> str:
+        return "/".join(
+            "{id}" if MangadexApi.ID_PATTERN.match(part) else part
+            for part in endpoint.split("/")
+        )
+
+    def _get_rate_limit_bucket(self, endpoint: str) -> str:
+        return self.AT_HOME_BUCKET if endpoint.startswith("at-home/") else self.API_BUCKET
+
+    def _get_cache_ttl(self, endpoint: str) -> Optional[float]:
+        if endpoint.startswith("at-home/"):
+            return None
+        if endpoint.endswith("/feed") or endpoint == "chapter":
+            return self.FEED_CACHE_TTL
+        return self.SERIES_CACHE_TTL
+
+    def _call_api_ignore_errors(
+            self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
         try:
-            return self._call_api(endpoint)
+            return self._call_api(endpoint, params)
         except ValueError:
             return None
 
-    def _load_volumes(self, series_id: str, load_pages: bool) -> List[MangaVolume]:
-        chapters = self._load_chapters(series_id, load_pages)
+    def _load_volumes(
+            self, series_id: str, chapters: List[MangaChapter], main_cover: Optional[str] = None
+    ) -> List[MangaVolume]:
         grouped_by_volume = itertools.groupby(chapters, lambda chapter: chapter.volume)
 
         volumes = [
             MangaVolume(volume_number=volume_number, chapters=list(chapters))
             for volume_number, chapters in grouped_by_volume
         ]
-        self._apply_covers(series_id, volumes)
+        self._apply_covers(series_id, volumes, main_cover)
         return volumes
 
-    def _apply_covers(self, series_id: str, volumes: List[MangaVolume]):
-        volume_covers = self._load_volume_covers(series_id)
+    def _apply_covers(self, series_id: str, volumes: List[MangaVolume], main_cover: Optional[str]):
+        volume_covers = Lazy(lambda: self._load_volume_covers(series_id, main_cover))
 
         for volume in volumes:
-            volume.cover = self._find_cover(volume, volume_covers)
+            volume.cover_loader = Lazy(functools.partial(self._get_volume_cover, volume, volume_covers)).get
             for chapter in volume.chapters:
-                chapter.cover = volume.cover
+                chapter.cover_loader = volume.resolve_cover
 
-    @staticmethod
-    def _find_cover(
-            volume: MangaVolume, volume_covers: Dict[Optional[Decimal], DownloadedFile]
+    def _get_volume_cover(
+            self, volume: MangaVolume, volume_covers: Lazy[Dict[Optional[Decimal], Lazy[Optional[DownloadedFile]]]]
     ) -> Optional[DownloadedFile]:
-        cover = volume_covers.get(volume.volume_number, None)
+        covers = volume_covers.get()
+        for key in self._get_cover_candidates(volume, covers):
+            cover = covers[key].get()
+            if cover is not None:
+                return cover
+        return None
 
-        if cover is None:
-            cover = volume_covers.get(None)
+    @staticmethod
+    def _get_cover_candidates(
+            volume: MangaVolume, volume_covers: Dict[Optional[Decimal], Any]
+    ) -> List[Optional[Decimal]]:
+        candidates = [volume.volume_number, None, *sorted(key for key in volume_covers.keys() if key is not None)]
+        return list(dict.fromkeys(key for key in candidates if key in volume_covers))
+
+    def _load_chapters(self, series_id: str, load_pages: bool, selection: ChapterSelection) -> List[MangaChapter]:
+        page_size = self._get_chapter_page_size(selection)
+        first_page = self._load_chapter_page(series_id, 0, selection)
+        chapters_data = first_page.get("data", [])
+        total = first_page.get("total")
+
+        if total is not None:
+            offsets = list(range(page_size, total, page_size))
+            with ThreadPoolExecutor(max_workers=self.FEED_WORKERS, thread_name_prefix="feed-page") as executor:
+                pages = executor.map(lambda offset: self._load_chapter_page(series_id, offset, selection), offsets)
+                for page in pages:
+                    chapters_data += page.get("data", [])
+        else:
+            page_data = chapters_data
+            while len(page_data) == page_size:
+                page_data = self._load_chapter_page(series_id, len(chapters_data), selection).get("data", [])
+                chapters_data += page_data
+
+        chapters = selection.apply(self._parse_chapters(chapters_data))
+        if load_pages:
+            for chapter in chapters:
+                chapter.resolve_pages()
 
-        if cover is None and len(volume_covers) >= 1:
-            cover_keys = [key for key in volume_covers.keys() if key is not None]
-            cover = volume_covers.get(min(cover_keys))
+        return chapters
 
-        return cover
+    def _load_chapter_page(self, series_id: str, offset: int, selection: ChapterSelection) -> Dict[str, Any]:
+        self.logger.info(f"Loading chapters {offset}-{offset + self._get_chapter_page_size(selection)}")
+        params = self._build_chapter_page_params(offset, selection)
 
-    def _load_chapters(self, series_id: str, load_pages: bool) -> List[MangaChapter]:
-        chapters = []
+        # The feed endpoint does not filter by chapter or volume number, the chapter list endpoint does
+        if self._has_exact_filter(selection):
+            return self._call_api("chapter", params | {"manga": series_id})
+        return self._call_api(f"manga/{series_id}/feed", params)
 
-        offset = 0
-        end_reached = False
-        while not end_reached:
-            params = self._build_chapter_page_params(series_id, offset)
-            self.logger.info(f"Loading chapters {offset}-{offset + params['limit']}")
+    @staticmethod
+    def _has_exact_filter(selection: ChapterSelection) -> bool:
+        return selection.get_exact_chapters() is not None or selection.get_exact_volumes() is not None
 
-            chapters_data = self._call_api("chapter", params).get("data", [])
-            chapter_count = len(chapters_data)
+    def _get_chapter_page_size(self, selection: ChapterSelection) -> int:
+        return self.CHAPTER_PAGE_SIZE if self._has_exact_filter(selection) else self.FEED_PAGE_SIZE
 
-            chapters += self._parse_chapters(chapters_data, load_pages)
+    def _build_chapter_page_params(self, offset: int, selection: ChapterSelection) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
+            "translatedLanguage[]": "en",
+            "order[volume]": "asc",
+            "order[chapter]": "asc",
+            "offset": offset,
+            "limit": self._get_chapter_page_size(selection)
+        }
 
-            offset += chapter_count
-            end_reached = chapter_count == 0
+        exact_chapters = selection.get_exact_chapters()
+        exact_volumes = selection.get_exact_volumes()
+        if exact_chapters is not None:
+            params["chapter[]"] = [self._format_number(number) for number in exact_chapters]
+        if exact_volumes is not None:
+            params["volume[]"] = [self._format_number(number) for number in exact_volumes]
+        if selection.since is not None:
+            params["createdAtSince"] = self.date_converter.convert_to_string(selection.since)
+        if selection.updated_since is not None:
+            params["updatedAtSince"] = self.date_converter.convert_to_string(selection.updated_since)
 
-        return chapters
+        return params
 
     @staticmethod
-    def _build_chapter_page_params(series_id: str, offset: int) -> Dict[str, Any]:
-        return {
-            "translatedLanguage[]": "en",
-            "manga": series_id,
-            "offset": offset,
-            "limit": 100
-        }
+    def _format_number(number: Decimal) -> str:
+        return f"{number.normalize():f}"
 
-    def _parse_chapters(self, chapters_data: List[Dict[str, Any]], load_pages: bool, ) -> List[MangaChapter]:
+    def _parse_chapters(self, chapters_data: List[Dict[str, Any]]) -> List[MangaChapter]:
         all_chapters = [
-            self._parse_chapter(chapter_data, load_pages)
+            self._parse_chapter(chapter_data)
             for chapter_data in chapters_data
         ]
         return [x for x in all_chapters if x is not None]
 
-    def _parse_chapter(self, chapter_data: Dict[str, Any], load_pages: bool) -> Optional[MangaChapter]:
+    def _parse_chapter(self, chapter_data: Dict[str, Any]) -> Optional[MangaChapter]:
         attributes = chapter_data["attributes"]
         is_external = attributes["externalUrl"] is not None
 
@@ -135,72 +242,128 @@ class MangadexApi:
         chapter_number = Decimal("0" if raw_chapter_number is None else raw_chapter_number)
         volume_number = None if raw_volume_number is None else Decimal(raw_volume_number)
         created_at = self.date_converter.convert_to_datetime(attributes["createdAt"])
-        pages = [] if not load_pages else self._load_pages(chapter_data["id"])
+        updated_at = None if attributes.get("updatedAt") is None \
+            else self.date_converter.convert_to_datetime(attributes["updatedAt"])
 
         self.logger.info(f"Parsed chapter {raw_chapter_number}")
 
-        return MangaChapter(
+        chapter = MangaChapter(
             title=title,
             number=chapter_number,
             volume=volume_number,
             published_at=created_at,
-            pages=pages,
+            id=chapter_data["id"],
+            updated_at=updated_at,
+            image_quality=self.image_quality,
         )
+        chapter.page_loader = functools.partial(self._load_pages, chapter)
+        return chapter
 
-    def _load_pages(self, chapter_id: str) -> List[MangaPage]:
-        at_home_endpoint = f"at-home/server/{chapter_id}"
+    def _load_pages(self, chapter: MangaChapter) -> List[MangaPage]:
+        at_home_endpoint = f"at-home/server/{chapter.id}"
         at_home_info = self._call_api_ignore_errors(at_home_endpoint)
 
         if at_home_info is None:
             return []
 
+        if self.node_health.is_degraded(at_home_info["baseUrl"]):
+            self.logger.info(f"Node {at_home_info['baseUrl']} is degraded, requesting a port 443 node instead")
+            at_home_info = self._call_api_ignore_errors(at_home_endpoint, {"forcePort443": "true"}) or at_home_info
+
         server_url = at_home_info["baseUrl"]
+        if self.node_health.is_degraded(server_url):
+            self.logger.info(f"Node {server_url} is still degraded, falling back to {self.UPLOADS_URL}")
+            server_url = self.UPLOADS_URL
+
+        if self.node_health.is_degraded(server_url):
+            self.logger.warning(f"No healthy image server available for chapter {chapter.id}")
+            return []
+
         chapter_hash = at_home_info["chapter"]["hash"]
+        url_path, files_key = self.AT_HOME_FILES[chapter.image_quality]
+        chapter.content_hash = chapter_hash
+        if chapter.image_quality != ImageQuality.ORIGINAL:
+            chapter.content_hash = f"{chapter_hash}-{chapter.image_quality.value}"
 
         urls = [
-            MangaPage(image_file=f"{server_url}/data/{chapter_hash}/{page}", page_number=i + 1)
-            for i, page in enumerate(at_home_info["chapter"]["data"])
+            MangaPage(image_file=f"{server_url}/{url_path}/{chapter_hash}/{page}", page_number=i + 1)
+            for i, page in enumerate(at_home_info["chapter"][files_key])
         ]
         return urls
 
-    def _load_series_info(self, series_id: str) -> Tuple[str, Optional[str], Optional[str]]:
-        title_info = self._call_api(f"manga/{series_id}")
+    def _report_image(self, url: str, success: bool, duration: float, size: int, cached: bool):
+        if urlparse(url).netloc.endswith("mangadex.org"):
+            return
+        self._report_executor.submit(self.http_requester.post_json, self.REPORT_URL, {
+            "url": url,
+            "success": success,
+            "bytes": size,
+            "duration": int(duration * 1000),
+            "cached": cached
+        })
+
+    def _load_series_info(self, series_id: str) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+        title_info = self._call_api(f"manga/{series_id}", {"includes[]": self.SERIES_INCLUDES})
         title = list(title_info["data"]["attributes"]["title"].values())[0]
         relations = title_info["data"]["relationships"]
-        author = self._load_author_name(self.get_first_id_with_type_from_relations(relations, "author"))
-        artist = self._load_author_name(self.get_first_id_with_type_from_relations(relations, "artist"))
+        author = self._load_author_name(self.get_first_with_type_from_relations(relations, "author"))
+        artist = self._load_author_name(self.get_first_with_type_from_relations(relations, "artist"))
+        cover_relation = self.get_first_with_type_from_relations(relations, "cover_art")
+        main_cover = None if cover_relation is None else cover_relation.get("attributes", {}).get("fileName")
 
-        return title, author, artist
+        return title, author, artist, main_cover
 
-    def _load_author_name(self, author_id: Optional[str]) -> Optional[str]:
+    def _load_author_name(self, author_relation: Optional[Dict[str, Any]]) -> Optional[str]:
 
-        if author_id is None:
+        if author_relation is None:
             return None
 
-        author_info = self._call_api(f"author/{author_id}")
+        if "attributes" in author_relation:
+            return author_relation["attributes"]["name"]
+
+        author_info = self._call_api(f"author/{author_relation['id']}")
         return author_info["data"]["attributes"]["name"]
 
     @staticmethod
-    def get_first_id_with_type_from_relations(relations: List[Dict[str, str]], key: str) -> Optional[str]:
-        return next(filter(lambda x: x["type"] == key, relations), {"id": None})["id"]
-
-    def _load_volume_covers(self, series_id: str) -> Dict[Optional[Decimal], DownloadedFile]:
-        cover_data = self._call_api("cover", {"manga[]": series_id})
-        cover_filenames = {
-            cover_info["attributes"]["volume"]: cover_info["attributes"]["fileName"]
-            for cover_info in cover_data["data"]
-        }
-        cover_bytes = {
-            (key, filename): self.http_requester.download_file(
-                f"https://uploads.mangadex.org/covers/{series_id}/{filename}"
-            )
-            for key, filename in cover_filenames.items()
-        }
+    def get_first_with_type_from_relations(relations: List[Dict[str, Any]], key: str) -> Optional[Dict[str, Any]]:
+        return next(filter(lambda x: x["type"] == key and x.get("id") is not None, relations), None)
+
+    def _load_volume_covers(
+            self, series_id: str, main_cover: Optional[str] = None
+    ) -> Dict[Optional[Decimal], Lazy[Optional[DownloadedFile]]]:
+        cover_filenames: Dict[Optional[str], str] = {}
+
+        offset = 0
+        end_reached = False
+        while not end_reached:
+            params = {"manga[]": series_id, "offset": offset, "limit": self.COVER_PAGE_SIZE}
+            try:
+                covers_data = self._call_api("cover", params).get("data", [])
+            except ValueError:
+                self.logger.warning(f"Failed to load covers for series {series_id}")
+                break
+
+            for cover_info in covers_data:
+                cover_filenames[cover_info["attributes"]["volume"]] = cover_info["attributes"]["fileName"]
+
+            offset += len(covers_data)
+            end_reached = len(covers_data) < self.COVER_PAGE_SIZE
+
+        if len(cover_filenames) == 0 and main_cover is not None:
+            cover_filenames[None] = main_cover
+
         return {
-            None if key is None else Decimal(key): DownloadedFile(
-                data=file_bytes,
-                filename=filename
-            )
-            for (key, filename), file_bytes in cover_bytes.items()
-            if file_bytes is not None
+            None if key is None else Decimal(key): Lazy(functools.partial(self._load_cover, series_id, filename))
+            for key, filename in cover_filenames.items()
         }
+
+    def _load_cover(self, series_id: str, filename: str) -> Optional[DownloadedFile]:
+        data = self.image_cache.load_cover(series_id, filename)
+
+        if data is None:
+            self.logger.info(f"Downloading cover {filename}")
+            data = self.http_requester.download_file(f"https://uploads.mangadex.org/covers/{series_id}/{filename}")
+            if data is not None:
+                self.image_cache.store_cover(series_id, filename, data)
+
+        return None if data is None else DownloadedFile(data=data, filename=filename)
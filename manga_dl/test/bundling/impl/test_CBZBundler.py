@@ -30,6 +30,9 @@ class TestCBZBundler:
     def test_get_file_format(self):
         assert self.under_test.get_file_format() == MangaFileFormat.CBZ
 
+    def test_requires_cover(self):
+        assert self.under_test.requires_cover() is True
+
     def test_bundle(self):
         series = TestDataFactory.build_series()
         chapter = series.get_chapters()[0]
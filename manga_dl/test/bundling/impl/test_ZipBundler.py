@@ -23,6 +23,9 @@ class TestZipBundler:
     def test_get_file_format(self):
         assert self.under_test.get_file_format() == MangaFileFormat.ZIP
 
+    def test_requires_cover(self):
+        assert self.under_test.requires_cover() is False
+
     def test_bundle(self):
         series = TestDataFactory.build_series()
         chapter = series.get_chapters()[0]
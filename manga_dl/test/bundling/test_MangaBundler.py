@@ -1,6 +1,9 @@
+import tempfile
 from pathlib import Path
 from typing import List
+from unittest.mock import Mock, ANY
 
+import pytest
 from injector import Injector
 
 from manga_dl.bundling.MangaBundler import MangaBundler
@@ -33,3 +36,45 @@ class TestMangaBundler:
         injector = Injector()
         bundlers = self.under_test.get_bundlers(injector)
         assert len(bundlers) == len(MangaFileFormat) + 1  # because of test bundler
+
+    def test_bundle_atomically(self):
+        destination = Path(tempfile.gettempdir()) / "atomicbundle.zip"
+        destination.write_bytes(b"Old")
+        self.under_test.bundle = Mock(side_effect=lambda _, path, __, ___: path.write_bytes(b"New"))
+
+        self.under_test.bundle_atomically([], destination, Mock(MangaSeries), Mock(MangaChapter))
+
+        self.under_test.bundle.assert_called_once_with([], MangaBundler.get_partial_path(destination), ANY, ANY)
+        assert destination.read_bytes() == b"New"
+        assert not MangaBundler.get_partial_path(destination).exists()
+
+    def test_bundle_atomically_directory(self):
+        destination = Path(tempfile.gettempdir()) / "atomicbundle"
+        destination.mkdir(exist_ok=True)
+        (destination / "old.png").write_bytes(b"Old")
+
+        def bundle(_, path: Path, __, ___):
+            path.mkdir()
+            (path / "new.png").write_bytes(b"New")
+
+        self.under_test.bundle = Mock(side_effect=bundle)
+
+        self.under_test.bundle_atomically([], destination, Mock(MangaSeries), Mock(MangaChapter))
+
+        assert [path.name for path in destination.iterdir()] == ["new.png"]
+
+    def test_bundle_atomically_error(self):
+        destination = Path(tempfile.gettempdir()) / "atomicbundle_error.zip"
+        destination.unlink(missing_ok=True)
+
+        def bundle(_, path: Path, __, ___):
+            path.write_bytes(b"Half")
+            raise OSError("Disk full")
+
+        self.under_test.bundle = Mock(side_effect=bundle)
+
+        with pytest.raises(OSError):
+            self.under_test.bundle_atomically([], destination, Mock(MangaSeries), Mock(MangaChapter))
+
+        assert not destination.exists()
+        assert not MangaBundler.get_partial_path(destination).exists()
@@ -0,0 +1,74 @@
+import tempfile
+from pathlib import Path
+from zipfile import ZipFile
+
+import pytest
+from lxml.etree import fromstring
+
+from manga_dl.bundling.VolumeBundler import VolumeBundler
+from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.test.testutils.TestDataFactory import TestDataFactory
+from manga_dl.util.ComicRackMetadataGenerator import ComicRackMetadataGenerator
+
+
+class TestVolumeBundler:
+
+    def setup_method(self):
+        self.target = Path(tempfile.gettempdir()) / "volumebundler.cbz"
+        self.under_test = VolumeBundler(ComicRackMetadataGenerator())
+        self.series = TestDataFactory.build_series()
+        self.volume = self.series.volumes[0]
+        if self.target.exists():
+            self.target.unlink()
+
+    def test_is_applicable(self):
+        assert self.under_test.is_applicable(MangaFileFormat.CBZ) is True
+        assert self.under_test.is_applicable(MangaFileFormat.ZIP) is True
+        assert self.under_test.is_applicable(MangaFileFormat.DIR) is False
+
+    def test_open_volume_directory(self):
+        with pytest.raises(ValueError):
+            self.under_test.open_volume(self.target, self.series, self.volume, MangaFileFormat.DIR)
+
+    def test_bundle_volume(self):
+        archive = self.under_test.open_volume(self.target, self.series, self.volume, MangaFileFormat.CBZ)
+        for chapter in self.volume.chapters:
+            archive.append_chapter(TestDataFactory.build_downloaded_files(chapter), chapter)
+
+        assert not self.target.exists()
+
+        archive.close()
+
+        first, second = self.volume.chapters
+        with ZipFile(self.target) as zip_file:
+            assert zip_file.read("0-cover.png") == b"CoverImage"
+            assert zip_file.read("v1c2-B/0.png") == bytes(second.pages[0].image_file, "utf8")
+            metadata = fromstring(zip_file.read("ComicInfo.xml"))
+
+        assert metadata.find("Title").text == "Volume 1"
+        assert metadata.find("Volume").text == "1"
+        pages = metadata.find("Pages")
+        assert len(pages) == 1 + len(first.pages) + len(second.pages)
+        assert pages[0].get("Type") == "FrontCover"
+        assert pages[1].get("Image") == "v1c1-A/0.png"
+        assert pages[1].get("Bookmark") == "Chapter 1"
+        assert pages[2].get("Bookmark") is None
+        assert pages[1 + len(first.pages)].get("Bookmark") == "Chapter 2"
+
+    def test_bundle_volume_zip(self):
+        archive = self.under_test.open_volume(self.target, self.series, self.volume, MangaFileFormat.ZIP)
+        chapter = self.volume.chapters[0]
+        archive.append_chapter(TestDataFactory.build_downloaded_files(chapter), chapter)
+        archive.close()
+
+        with ZipFile(self.target) as zip_file:
+            assert "ComicInfo.xml" not in zip_file.namelist()
+            assert len(zip_file.namelist()) == 1 + len(chapter.pages)
+
+    def test_abort(self):
+        archive = self.under_test.open_volume(self.target, self.series, self.volume, MangaFileFormat.CBZ)
+
+        archive.abort()
+
+        assert not self.target.exists()
+        assert not self.target.with_name(f"{self.target.name}.part").exists()
@@ -1,14 +1,20 @@
 import logging
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, patch, call
 
 from manga_dl.cli.MangaDLCli import MangaDLCli
 from manga_dl.cli.MangaDLCliOptions import MangaDLCliOptions
 from manga_dl.cli.MangaDLCliParser import MangaDLCliParser
 from manga_dl.download.MangaDownloader import MangaDownloader
+from manga_dl.download.MangaSynchronizer import MangaSynchronizer
+from manga_dl.download.MangaWatcher import MangaWatcher
+from manga_dl.model.ImageQuality import ImageQuality
 from manga_dl.model.MangaSeries import MangaSeries
 from manga_dl.scraping.ScrapingService import ScrapingService
+from manga_dl.util.NodeHealthTracker import NodeHealthTracker
+from manga_dl.util.RequestCounter import RequestCounter
+from manga_dl.util.ResponseCache import ResponseCache
 
 
 class TestMangaDLCli:
@@ -24,21 +30,106 @@ class TestMangaDLCli:
         self.scraper = Mock(ScrapingService)
         self.scraper.scrape.return_value = self.series
         self.downloader = Mock(MangaDownloader)
+        self.synchronizer = Mock(MangaSynchronizer)
+        self.watcher = Mock(MangaWatcher)
+        self.response_cache = Mock(ResponseCache)
+        self.request_counter = RequestCounter()
+        self.node_health = Mock(NodeHealthTracker)
 
-        self.under_test = MangaDLCli(self.parser, self.scraper, self.downloader)
+        self.under_test = MangaDLCli(
+            self.parser, self.scraper, self.downloader, self.synchronizer, self.watcher, self.response_cache,
+            self.request_counter, self.node_health
+        )
 
     def test_run_download(self):
         self.under_test.run()
 
-        self.scraper.scrape.assert_called_with(self.url)
-        self.downloader.download.assert_called_with(self.series, self.target, self.options.file_format)
+        self.scraper.scrape.assert_called_with(self.url, load_pages=False, selection=self.options.chapters)
+        self.downloader.set_jobs.assert_called_with(self.options.jobs)
+        self.downloader.set_bundle_processes.assert_called_with(self.options.bundle_processes)
+        self.downloader.set_transform.assert_called_with(self.options.transform)
+        self.downloader.set_bundle_volumes.assert_called_with(False)
+        self.downloader.download_batch.assert_called_with([self.series], self.target, self.options.file_format)
 
     def test_run_list(self):
         self.options.list_chapters = True
         self.under_test.run()
 
-        self.scraper.scrape.assert_called_with(self.url)
-        self.downloader.download.assert_not_called()
+        self.scraper.scrape.assert_called_with(self.url, load_pages=False, selection=self.options.chapters)
+        self.downloader.download_batch.assert_not_called()
+
+    def test_run_batch(self):
+        other_series = Mock(MangaSeries)
+        self.options.batch = ["example.com", "example.net"]
+        self.scraper.scrape.side_effect = [self.series, None, other_series]
+
+        self.under_test.run()
+
+        self.scraper.scrape.assert_has_calls([
+            call(url, load_pages=False, selection=self.options.chapters)
+            for url in [self.url, "example.com", "example.net"]
+        ])
+        self.downloader.download_batch.assert_called_once_with(
+            [self.series, other_series], self.target, self.options.file_format
+        )
+
+    def test_run_sync_batch(self):
+        self.options.sync = True
+        self.options.batch = ["example.com"]
+        self.under_test.run()
+
+        self.synchronizer.sync_batch.assert_called_with(
+            [self.url, "example.com"], self.target, self.options.file_format, self.options.chapters
+        )
+
+    def test_run_sync(self):
+        self.options.sync = True
+        self.under_test.run()
+
+        self.scraper.scrape.assert_not_called()
+        self.downloader.download_batch.assert_not_called()
+        self.synchronizer.sync_batch.assert_called_with(
+            [self.url], self.target, self.options.file_format, self.options.chapters
+        )
+
+    def test_run_watch(self):
+        self.options.watch = True
+        self.options.batch = ["example.com"]
+        self.under_test.run()
+
+        self.scraper.scrape.assert_not_called()
+        self.synchronizer.sync_batch.assert_not_called()
+        self.watcher.watch.assert_called_with(
+            [self.url, "example.com"], self.target, self.options.file_format, self.options.watch_interval,
+            self.options.chapters
+        )
+
+    def test_run_offline(self):
+        self.options.offline = True
+        self.under_test.run()
+
+        self.response_cache.set_offline.assert_called_with(True)
+
+    def test_run_report_nodes(self):
+        self.options.report_nodes = True
+        self.under_test.run()
+
+        self.node_health.set_reporting.assert_called_with(True)
+
+    def test_run_data_saver(self):
+        self.options.quality = ImageQuality.DATA_SAVER
+        self.under_test.run()
+
+        self.scraper.set_image_quality.assert_called_with(ImageQuality.DATA_SAVER)
+
+    def test_run_logs_api_calls(self):
+        self.request_counter.increment("manga")
+        self.request_counter.increment("chapter")
+        self.request_counter.increment("chapter")
+
+        with patch.object(MangaDLCli.logger, "info") as info:
+            self.under_test.run()
+            info.assert_called_with("API calls: chapter=2, manga=1")
 
     def test_verbose(self):
         self.options.verbose = True
@@ -1,3 +1,5 @@
+import tempfile
+from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
 
@@ -5,6 +7,10 @@ import pytest
 
 from manga_dl.cli.MangaDLCliOptions import MangaDLCliOptions
 from manga_dl.cli.MangaDLCliParser import MangaDLCliParser
+from manga_dl.model.ChapterSelection import ChapterSelection
+from manga_dl.model.ImageFormat import ImageFormat
+from manga_dl.model.ImageQuality import ImageQuality
+from manga_dl.model.ImageTransform import ImageTransform
 from manga_dl.model.MangaFileFormat import MangaFileFormat
 
 
@@ -29,18 +35,77 @@ class TestMangaDLCliParser:
 
         assert error.value.code > 0
 
+    def test_parse_multiple_urls(self):
+        result = self.under_test.parse([self.url, "https://example.com/456"])
+
+        assert result == MangaDLCliOptions(self.url, batch=["https://example.com/456"])
+        assert result.get_urls() == [self.url, "https://example.com/456"]
+
+    def test_parse_batch_file(self):
+        batch_file = Path(tempfile.gettempdir()) / "manga_dl_batch.txt"
+        batch_file.write_text("# Followed series\nhttps://example.com/456\n\n  https://example.com/789  \n")
+
+        result = self.under_test.parse([self.url, "--batch-file", str(batch_file)])
+
+        assert result.get_urls() == [self.url, "https://example.com/456", "https://example.com/789"]
+
+    def test_parse_only_batch_file(self):
+        batch_file = Path(tempfile.gettempdir()) / "manga_dl_batch.txt"
+        batch_file.write_text("https://example.com/456\n")
+
+        result = self.under_test.parse(["-b", str(batch_file)])
+
+        assert result.get_urls() == ["https://example.com/456"]
+
+    def test_parse_missing_batch_file(self):
+        with pytest.raises(SystemExit) as error:
+            self.under_test.parse(["-b", str(Path(tempfile.gettempdir()) / "manga_dl_missing_batch.txt")])
+
+        assert error.value.code > 0
+
+    def test_parse_volumes(self):
+        assert self.under_test.parse([self.url, "--volumes"]).bundle_volumes is True
+        assert self.under_test.parse([self.url, "--volumes", "--chapters", "v2", "v4-5"]).bundle_volumes is True
+
+        for args in [["-f", "dir"], ["--sync"], ["--watch"], ["--chapters", "3"], ["--chapters", "v2", "latest:1"]]:
+            with pytest.raises(SystemExit) as error:
+                self.under_test.parse([self.url, "--volumes"] + args)
+            assert error.value.code > 0
+
     def test_parse_with_options(self):
         expected = MangaDLCliOptions(
             self.url,
             True,
-            [Decimal("1"), Decimal("1.5")],
+            ChapterSelection(
+                [(Decimal("1"), Decimal("1")), (Decimal("1.5"), Decimal("1.5"))], latest=3, since=datetime(2022, 1, 31)
+            ),
             Path("/tmp/mymanga.zip"),
             MangaFileFormat.ZIP,
             True,
-            False
+            False,
+            8,
+            2,
+            True,
+            True,
+            True,
+            600,
+            True,
+            ImageQuality.DATA_SAVER,
+            ImageTransform(1600, ImageFormat.WEBP, 70, True)
         )
 
-        args = [self.url, "-l", "--chapters", "1", "1.5", "-o", "/tmp/mymanga.zip", "--file-format", "zip", "-v"]
+        args = [self.url, "-l", "--chapters", "1", "1.5", "latest:3", "since:2022-01-31",
+                "-o", "/tmp/mymanga.zip", "--file-format", "zip", "-v",
+                "--jobs", "8", "--bundle-processes", "2", "--sync", "--offline",
+                "--watch", "--watch-interval", "600", "--report-nodes",
+                "--quality", "data-saver", "--resize", "1600", "--transcode", "webp", "--transcode-quality", "70",
+                "--grayscale"]
         result = self.under_test.parse(args)
 
         assert result == expected
+
+    def test_parse_invalid_chapters(self):
+        with pytest.raises(SystemExit) as error:
+            self.under_test.parse([self.url, "--chapters", "abc"])
+
+        assert error.value.code > 0
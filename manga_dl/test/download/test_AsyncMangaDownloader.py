@@ -0,0 +1,124 @@
+import asyncio
+import itertools
+import shutil
+import tempfile
+from pathlib import Path
+from decimal import Decimal
+from typing import BinaryIO, List
+from unittest.mock import Mock, AsyncMock, call, ANY
+
+from manga_dl.bundling.MangaBundler import MangaBundler
+from manga_dl.download.AsyncMangaDownloader import AsyncMangaDownloader
+from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaPage import MangaPage
+from manga_dl.test.testutils.TestDataFactory import TestDataFactory
+from manga_dl.util.ImageCache import ImageCache
+from manga_dl.util.AsyncHttpRequester import AsyncHttpRequester
+
+
+class TestAsyncMangaDownloader:
+
+    def setup_method(self):
+        self.dummy_bytes = bytes("Hello World", "utf8")
+        self.file_type = MangaFileFormat.CBZ
+        self.testing_path = Path(tempfile.gettempdir()) / "testing_async_download"
+        self.requester = Mock(AsyncHttpRequester)
+        self.requester.stream_file = AsyncMock(side_effect=self._stream_file)
+        self.bundler = Mock(MangaBundler)
+        self.bundler.is_applicable.return_value = True
+        self.bundler.get_file_format.return_value = self.file_type
+        self.image_cache = ImageCache()
+        self.image_cache.set_path(Path(tempfile.gettempdir()) / "testing_async_download_cache")
+        self.under_test = AsyncMangaDownloader(self.requester, [self.bundler], self.image_cache)
+
+        for path in [self.testing_path, self.image_cache.path]:
+            if path.exists():
+                shutil.rmtree(path)
+
+    async def _stream_file(self, _: str, destination: BinaryIO) -> bool:
+        destination.write(self.dummy_bytes)
+        return True
+
+    def test_download_async(self):
+        series = TestDataFactory.build_series()
+        chapters = series.get_chapters()
+        pages = list(itertools.chain(*[chapter.pages for chapter in chapters]))
+        last_chapter = chapters[-1]
+        last_chapter_dest = self.testing_path / series.name / last_chapter.get_filename(self.file_type)
+        staging_dir = last_chapter_dest.parent / f".{last_chapter_dest.name}.part"
+        last_chapter_image_files = [
+            DownloadedFile.from_path(staging_dir / page.get_filename(), page.get_filename())
+            for page in last_chapter.pages
+        ]
+
+        asyncio.run(self.under_test.download_async(series, self.testing_path, self.file_type))
+
+        self.requester.stream_file.assert_has_awaits([call(page.image_file, ANY) for page in pages], any_order=True)
+        assert self.bundler.bundle_atomically.call_count == len(chapters)
+        self.requester.close.assert_not_awaited()
+        self.bundler.bundle_atomically.assert_called_with(
+            last_chapter_image_files, last_chapter_dest, series, last_chapter
+        )
+        assert not staging_dir.exists()
+
+    def test_download_single_chapter_async(self):
+        series = TestDataFactory.build_series()
+        chapter = series.get_chapters()[0]
+
+        asyncio.run(self.under_test.download_single_chapter_async(
+            series, chapter, self.testing_path, self.file_type
+        ))
+
+        self.bundler.bundle_atomically.assert_called_once()
+
+    def test_close(self):
+        asyncio.run(self.under_test.close())
+
+        self.requester.close.assert_awaited_once()
+
+    def test_download_pages_in_order(self):
+        async def stream_file(url: str, destination: BinaryIO) -> bool:
+            await asyncio.sleep(0.05 if url.endswith("1.png") else 0)
+            destination.write(bytes(url, "utf8"))
+            return True
+
+        self.requester.stream_file.side_effect = stream_file
+        pages = [MangaPage(f"example.com/{i}.png", i) for i in [2, 1, 3]]
+
+        result = asyncio.run(self.under_test._download_pages(pages, self.testing_path))
+
+        assert [image.filename for image in result] == ["1.png", "2.png", "3.png"]
+        assert (self.testing_path / "1.png").read_bytes() == b"example.com/1.png"
+
+    def test_download_missing_page(self):
+        self.requester.stream_file.side_effect = None
+        self.requester.stream_file.return_value = False
+
+        result = asyncio.run(self.under_test._download_pages([MangaPage("example.com/1.png", 1)], self.testing_path))
+
+        assert result == [DownloadedFile.from_path(self.testing_path / "1.png", "1.png", missing=True)]
+        assert (self.testing_path / "1.png").read_bytes() == b"Missing"
+
+    def test_download_re_resolves_expired_pages(self):
+        resolved = []
+
+        def load_pages() -> List[MangaPage]:
+            resolved.append(len(resolved))
+            return [MangaPage(f"node{len(resolved)}.com/{i}.png", i) for i in [1, 2]]
+
+        async def stream_file(url: str, destination: BinaryIO) -> bool:
+            if url == "node1.com/2.png":
+                return False
+            return await self._stream_file(url, destination)
+
+        self.requester.stream_file.side_effect = stream_file
+        chapter = MangaChapter("A", Decimal(1), page_loader=load_pages)
+
+        result = asyncio.run(self.under_test._download_chapter_pages(chapter, self.testing_path))
+
+        assert len(resolved) == 2
+        assert [image.filename for image in result] == ["1.png", "2.png"]
+        assert (self.testing_path / "2.png").read_bytes() == self.dummy_bytes
+        self.requester.stream_file.assert_any_await("node2.com/2.png", ANY)
@@ -1,15 +1,39 @@
 import itertools
+from dataclasses import replace
 import shutil
 import tempfile
+import threading
+import time
+from io import BytesIO
 from pathlib import Path
-from unittest.mock import Mock, call
+from decimal import Decimal
+from typing import BinaryIO, List
+from unittest.mock import Mock, call, ANY
+from zipfile import ZipFile
+
+import pytest
+from PIL import Image
 
 from manga_dl.bundling.MangaBundler import MangaBundler
+from manga_dl.bundling.VolumeBundler import VolumeBundler
+from manga_dl.bundling.impl.ZipBundler import ZipBundler
 from manga_dl.download.MangaDownloader import MangaDownloader
 from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.model.ImageFormat import ImageFormat
+from manga_dl.model.ImageTransform import ImageTransform
 from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaPage import MangaPage
+from manga_dl.model.MangaSeries import MangaSeries
+from manga_dl.model.MangaVolume import MangaVolume
 from manga_dl.test.testutils.TestDataFactory import TestDataFactory
+from manga_dl.util.ImageCache import ImageCache
+from manga_dl.util.ImageTransformer import ImageTransformer
+from manga_dl.util.ComicRackMetadataGenerator import ComicRackMetadataGenerator
 from manga_dl.util.HttpRequester import HttpRequester
+from manga_dl.util.NodeHealthTracker import NodeHealthTracker
+from manga_dl.util.PageJournal import PageJournal
+from manga_dl.util.Timer import Timer
 
 
 class TestMangaDownloader:
@@ -19,14 +43,29 @@ class TestMangaDownloader:
         self.file_type = MangaFileFormat.CBZ
         self.testing_path = Path(tempfile.gettempdir()) / "testing_download"
         self.requester = Mock(HttpRequester)
-        self.requester.download_file.return_value = self.dummy_bytes
+        self.requester.stream_file.side_effect = self._stream_file
         self.bundler = Mock(MangaBundler)
         self.bundler.is_applicable.return_value = True
         self.bundler.get_file_format.return_value = self.file_type
-        self.under_test = MangaDownloader(self.requester, [self.bundler])
+        self.image_cache = ImageCache()
+        self.image_cache.set_path(Path(tempfile.gettempdir()) / "testing_download_cache")
+        self.timer = Mock(Timer)
+        self.timer.monotonic.return_value = 0
+        self.node_health = NodeHealthTracker(self.timer)
+        self.image_transformer = ImageTransformer(self.timer)
+        self.image_transformer.set_processes(0)
+        self.under_test = MangaDownloader(
+            self.requester, [self.bundler], self.image_cache, self.node_health, self.image_transformer,
+            VolumeBundler(ComicRackMetadataGenerator())
+        )
+
+        for path in [self.testing_path, self.image_cache.path]:
+            if path.exists():
+                shutil.rmtree(path)
 
-        if self.testing_path.exists():
-            shutil.rmtree(self.testing_path)
+    def _stream_file(self, _: str, destination: BinaryIO) -> bool:
+        destination.write(self.dummy_bytes)
+        return True
 
     def test_download(self):
         series = TestDataFactory.build_series()
@@ -34,26 +73,353 @@ class TestMangaDownloader:
         pages = list(itertools.chain(*[chapter.pages for chapter in chapters]))
         last_chapter = series.get_chapters()[-1]
         last_chapter_dest = self.testing_path / series.name / last_chapter.get_filename(self.file_type)
+        staging_dir = last_chapter_dest.parent / f".{last_chapter_dest.name}.part"
         last_chapter_image_files = [
-            DownloadedFile(self.dummy_bytes, page.get_filename())
+            DownloadedFile.from_path(staging_dir / page.get_filename(), page.get_filename())
             for page in last_chapter.pages
         ]
 
         self.under_test.download(series, self.testing_path, self.file_type)
 
-        self.requester.download_file.assert_has_calls([call(page.image_file) for page in pages])
-        self.bundler.bundle.assert_called_with(last_chapter_image_files, last_chapter_dest, series, last_chapter)
+        self.requester.stream_file.assert_has_calls([call(page.image_file, ANY) for page in pages], any_order=True)
+        self.bundler.bundle_atomically.assert_called_with(
+            last_chapter_image_files, last_chapter_dest, series, last_chapter
+        )
         assert (self.testing_path / series.name).is_dir()
+        assert not staging_dir.exists()
+
+    def test_download_overlaps_download_and_bundling(self):
+        series = TestDataFactory.build_series()
+        chapters = series.get_chapters()
+        events = []
+        first_bundle_started = threading.Event()
+
+        def stream_file(url: str, destination: BinaryIO) -> bool:
+            if url == chapters[1].pages[0].image_file:
+                first_bundle_started.wait(1)
+                events.append("download-second")
+            return self._stream_file(url, destination)
+
+        def bundle(*_):
+            first_bundle_started.set()
+            time.sleep(0.05)
+            events.append("bundle")
+
+        self.requester.stream_file.side_effect = stream_file
+        self.bundler.bundle_atomically.side_effect = bundle
+
+        self.under_test.download(series, self.testing_path, self.file_type)
+
+        assert events[0] == "download-second"
+        assert self.bundler.bundle_atomically.call_count == len(chapters)
+
+    def test_download_batch_interleaves_series(self):
+        small_series = replace(TestDataFactory.build_series(), name="Small")
+        small_series.volumes = small_series.volumes[:1]
+        large_series = replace(TestDataFactory.build_series(), name="Large")
+        bundled = []
+        self.bundler.bundle_atomically.side_effect = lambda _, __, series, chapter: bundled.append(series.name)
+
+        self.under_test.download_batch([large_series, small_series], self.testing_path, self.file_type)
+
+        assert bundled == ["Large", "Small", "Large", "Small", "Large"]
+        assert (self.testing_path / "Small").is_dir()
+        assert (self.testing_path / "Large").is_dir()
+
+    def test_download_batch_reports_completed_chapters(self):
+        series = TestDataFactory.build_series()
+        failed, *completed = series.get_chapters()
+        failed_urls = {page.image_file for page in failed.pages}
+        self.requester.stream_file.side_effect = lambda url, destination: (
+            url not in failed_urls and self._stream_file(url, destination)
+        )
+
+        result = self.under_test.download_batch([series], self.testing_path, self.file_type)
+
+        assert result == completed
+
+    def test_download_volumes(self):
+        series = TestDataFactory.build_series()
+        self.under_test.set_bundle_volumes(True)
+
+        self.under_test.download(series, self.testing_path, self.file_type)
+
+        self.bundler.bundle_atomically.assert_not_called()
+        series_dir = self.testing_path / series.name
+        assert sorted(path.name for path in series_dir.iterdir()) == ["no-volume.cbz", "v1.cbz"]
+        with ZipFile(series_dir / "v1.cbz") as zip_file:
+            first, second = series.volumes[0].chapters
+            assert zip_file.namelist() == ["0-cover.png"] + [
+                f"{chapter.get_filename(MangaFileFormat.DIR)}/{page.get_filename()}"
+                for chapter in [first, second]
+                for page in chapter.pages
+            ] + ["ComicInfo.xml"]
+            assert b'Bookmark="Chapter 2"' in zip_file.read("ComicInfo.xml")
+
+    def test_download_volumes_error(self):
+        series = TestDataFactory.build_series()
+        self.under_test.set_bundle_volumes(True)
+        self.requester.stream_file.side_effect = [True] * 3 + [OSError("Disk full")] * 10
+
+        with pytest.raises(OSError):
+            self.under_test.download(series, self.testing_path, self.file_type)
+
+        assert not any(path.is_file() for path in (self.testing_path / series.name).iterdir())
+
+    def test_download_prefetches_covers(self):
+        series = TestDataFactory.build_series()
+        loaded = threading.Event()
+        series.volumes[0].cover = None
+        series.volumes[0].cover_loader = lambda: loaded.set()
+
+        self.under_test.download(series, self.testing_path, self.file_type)
+
+        assert loaded.wait(5)
+
+    def test_download_skips_covers_when_not_required(self):
+        series = TestDataFactory.build_series()
+        series.volumes[0].cover = None
+        series.volumes[0].cover_loader = Mock()
+        self.bundler.requires_cover.return_value = False
+
+        self.under_test.download(series, self.testing_path, self.file_type)
+
+        series.volumes[0].cover_loader.assert_not_called()
+
+    def test_download_bundling_error(self):
+        series = TestDataFactory.build_series()
+        self.bundler.bundle_atomically.side_effect = OSError("Disk full")
+
+        with pytest.raises(OSError):
+            self.under_test.download(series, self.testing_path, self.file_type)
+
+        self.bundler.bundle_atomically.assert_called_once()
+        chapter = series.get_chapters()[0]
+        staging_dir = self.testing_path / series.name / f".{chapter.get_filename(self.file_type)}.part"
+        assert sorted(path.name for path in staging_dir.iterdir()) == sorted(
+            [PageJournal.FILENAME] + [page.get_filename() for page in chapter.pages]
+        )
+
+    def test_download_transforms_pages(self):
+        series = TestDataFactory.build_series()
+        chapter = series.get_chapters()[0]
+        self.image_transformer.set_transform(ImageTransform(image_format=ImageFormat.JPEG))
+        encoded = BytesIO()
+        Image.new("RGB", (10, 20)).save(encoded, format="PNG")
+        self.dummy_bytes = encoded.getvalue()
+
+        self.under_test.download(series, self.testing_path, self.file_type)
+
+        images = self.bundler.bundle_atomically.call_args_list[0][0][0]
+        assert [image.filename for image in images] == [f"{i}.jpg" for i in range(len(chapter.pages))]
 
     def test_download_single_chapter(self):
         series = TestDataFactory.build_series()
         last_chapter = series.get_chapters()[-1]
+        staging_dir = self.testing_path.parent / f".{self.testing_path.name}.part"
         last_chapter_image_files = [
-            DownloadedFile(self.dummy_bytes, page.get_filename())
+            DownloadedFile.from_path(staging_dir / page.get_filename(), page.get_filename())
             for page in last_chapter.pages
         ]
 
         self.under_test.download_single_chapter(series, last_chapter, self.testing_path, self.file_type)
 
-        self.requester.download_file.assert_has_calls([call(page.image_file) for page in last_chapter.pages])
-        self.bundler.bundle.assert_called_with(last_chapter_image_files, self.testing_path, series, last_chapter)
+        self.requester.stream_file.assert_has_calls(
+            [call(page.image_file, ANY) for page in last_chapter.pages], any_order=True
+        )
+        self.bundler.bundle_atomically.assert_called_with(
+            last_chapter_image_files, self.testing_path, series, last_chapter
+        )
+
+    def test_set_jobs(self):
+        self.under_test.set_jobs(8)
+
+        assert self.under_test.jobs == 8
+        self.requester.configure_pools.assert_called_with(HttpRequester.DEFAULT_POOL_CONNECTIONS, 8)
+
+        self.under_test.set_jobs(0)
+        assert self.under_test.jobs == 1
+
+    def test_set_bundle_processes(self):
+        self.under_test.set_bundle_processes(2)
+        assert self.under_test.bundle_processes == 2
+
+        self.under_test.set_bundle_processes(-1)
+        assert self.under_test.bundle_processes == 0
+
+    def test_download_same_numbered_chapters(self):
+        chapters = [
+            MangaChapter("T", Decimal(1), pages=[MangaPage(f"example.com/{group}/1.png", 1)])
+            for group in ["a", "b"]
+        ]
+        series = MangaSeries("1", "Groups", volumes=[MangaVolume(None, chapters)])
+        zip_bundler = ZipBundler()
+
+        def slow_bundle(*args):
+            time.sleep(0.05)
+            ZipBundler.bundle_atomically(zip_bundler, *args)
+
+        self.bundler.bundle_atomically.side_effect = slow_bundle
+
+        self.under_test.download(series, self.testing_path, self.file_type)
+
+        series_dir = self.testing_path / series.name
+        assert sorted(path.name for path in series_dir.iterdir()) == ["c1-T-2.cbz", "c1-T.cbz"]
+
+    def test_download_bundles_in_processes(self):
+        series = TestDataFactory.build_series()
+        self.under_test = MangaDownloader(
+            self.requester, [ZipBundler()], self.image_cache, self.node_health, self.image_transformer,
+            VolumeBundler(ComicRackMetadataGenerator())
+        )
+        self.under_test.set_bundle_processes(2)
+
+        self.under_test.download(series, self.testing_path, MangaFileFormat.ZIP)
+
+        for chapter in series.get_chapters():
+            target = self.testing_path / series.name / chapter.get_filename(MangaFileFormat.ZIP)
+            with ZipFile(target) as zip_file:
+                assert zip_file.namelist() == [page.get_filename() for page in chapter.pages]
+            assert not (target.parent / f".{target.name}.part").exists()
+
+    def test_download_pages_concurrently_in_order(self):
+        pages = [MangaPage(f"example.com/{i}.png", i) for i in [3, 1, 4, 2, 5]]
+        active = {"current": 0, "max": 0}
+        lock = threading.Lock()
+
+        def stream_file(url: str, destination: BinaryIO) -> bool:
+            with lock:
+                active["current"] += 1
+                active["max"] = max(active["max"], active["current"])
+            time.sleep(0.05 if url.endswith("1.png") else 0.01)
+            with lock:
+                active["current"] -= 1
+            destination.write(bytes(url, "utf8"))
+            return True
+
+        self.requester.stream_file.side_effect = stream_file
+        self.under_test.set_jobs(3)
+
+        result = self.under_test._download_pages(pages, self.testing_path)
+
+        assert [image.filename for image in result] == ["1.png", "2.png", "3.png", "4.png", "5.png"]
+        assert (self.testing_path / "1.png").read_bytes() == b"example.com/1.png"
+        assert 1 < active["max"] <= 3
+
+    def test_download_missing_page(self):
+        def stream_file(_: str, destination: BinaryIO) -> bool:
+            destination.write(b"Partial")
+            return False
+
+        self.requester.stream_file.side_effect = stream_file
+
+        result = self.under_test._download_pages([MangaPage("example.com/1.png", 1)], self.testing_path)
+
+        assert result == [DownloadedFile.from_path(self.testing_path / "1.png", "1.png", missing=True)]
+        assert (self.testing_path / "1.png").read_bytes() == b"Missing"
+
+    def test_download_resolves_pages_lazily(self):
+        series = TestDataFactory.build_series()
+        chapter = MangaChapter("A", Decimal(1), page_loader=lambda: [MangaPage("example.com/1.png", 1)])
+
+        self.under_test.download_single_chapter(series, chapter, self.testing_path, self.file_type)
+
+        self.requester.stream_file.assert_called_once_with("example.com/1.png", ANY)
+
+    def test_download_re_resolves_expired_pages(self):
+        resolved = []
+
+        def load_pages() -> List[MangaPage]:
+            resolved.append(len(resolved))
+            return [MangaPage(f"node{len(resolved)}.com/{i}.png", i) for i in [1, 2]]
+
+        def stream_file(url: str, destination: BinaryIO) -> bool:
+            if url == "node1.com/2.png":
+                return False
+            return self._stream_file(url, destination)
+
+        self.requester.stream_file.side_effect = stream_file
+        chapter = MangaChapter("A", Decimal(1), page_loader=load_pages)
+
+        result = self.under_test._download_chapter_pages(chapter, self.testing_path)
+
+        assert len(resolved) == 2
+        assert [image.filename for image in result] == ["1.png", "2.png"]
+        assert (self.testing_path / "2.png").read_bytes() == self.dummy_bytes
+        self.requester.stream_file.assert_any_call("node2.com/2.png", ANY)
+
+    def test_download_fails_over_from_degraded_node(self):
+        for _ in range(NodeHealthTracker.FAILURE_THRESHOLD):
+            self.node_health.record("https://slow.example.com/data/1.png", False, 1, 0, False)
+        resolved = []
+
+        def load_pages() -> List[MangaPage]:
+            node = "slow.example.com" if len(resolved) == 0 else "fast.example.com"
+            resolved.append(node)
+            return [MangaPage(f"https://{node}/data/{i}.png", i) for i in [1, 2]]
+
+        chapter = MangaChapter("A", Decimal(1), page_loader=load_pages)
+
+        result = self.under_test._download_chapter_pages(chapter, self.testing_path)
+
+        assert resolved == ["slow.example.com", "fast.example.com"]
+        assert [image.filename for image in result] == ["1.png", "2.png"]
+        self.requester.stream_file.assert_has_calls(
+            [call("https://fast.example.com/data/1.png", ANY), call("https://fast.example.com/data/2.png", ANY)],
+            any_order=True
+        )
+        assert self.requester.stream_file.call_count == 2
+
+    def test_download_skips_node_still_degraded_after_refresh(self):
+        for _ in range(NodeHealthTracker.FAILURE_THRESHOLD):
+            self.node_health.record("https://slow.example.com/data/1.png", False, 1, 0, False)
+        chapter = MangaChapter(
+            "A", Decimal(1),
+            page_loader=lambda: [MangaPage(f"https://slow.example.com/data/{i}.png", i) for i in [1, 2]]
+        )
+
+        self.under_test._download_chapter_pages(chapter, self.testing_path)
+
+        self.requester.stream_file.assert_not_called()
+        assert (self.testing_path / "1.png").read_bytes() == b"Missing"
+
+    def test_download_uses_image_cache(self):
+        series = TestDataFactory.build_series()
+        chapter = series.get_chapters()[0]
+        self.under_test.download_single_chapter(series, chapter, self.testing_path, self.file_type)
+        self.requester.stream_file.reset_mock()
+
+        loaded = []
+        lazy_chapter = replace(chapter, pages=[], content_hash=None, page_loader=lambda: loaded.append(1) or [])
+        staging_dir = self.testing_path / "staging"
+        result = self.under_test._download_chapter_pages(lazy_chapter, staging_dir)
+
+        self.requester.stream_file.assert_not_called()
+        assert loaded == []
+        assert [image.filename for image in result] == [page.get_filename() for page in chapter.pages]
+        assert (staging_dir / "0.png").read_bytes() == self.dummy_bytes
+
+    def test_download_resumes_from_journal(self):
+        pages = [MangaPage("example.com/1.png", 1), MangaPage("example.com/2.png", 2)]
+        chapter = MangaChapter("A", Decimal(1), pages=pages, content_hash="resume")
+        PageJournal(self.testing_path, "resume").mark_complete(pages[0].get_filename())
+        (self.testing_path / pages[0].get_filename()).write_bytes(b"Earlier")
+
+        result = self.under_test._download_pages(pages, self.testing_path, chapter)
+
+        self.requester.stream_file.assert_called_once_with("example.com/2.png", ANY)
+        with result[0].open() as opened:
+            assert opened.read() == b"Earlier"
+
+    def test_download_page_from_image_cache(self):
+        page = MangaPage("example.com/1.png", 1)
+        cached = Path(tempfile.gettempdir()) / "cached_page.png"
+        cached.write_bytes(b"Cached")
+        self.image_cache.store_page("hash", "1.png", cached)
+        chapter = MangaChapter("A", Decimal(1), pages=[page], content_hash="hash")
+
+        result = self.under_test._download_pages([page], self.testing_path, chapter)
+
+        self.requester.stream_file.assert_not_called()
+        with result[0].open() as opened:
+            assert opened.read() == b"Cached"
@@ -0,0 +1,144 @@
+import tempfile
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+from manga_dl.download.MangaDownloader import MangaDownloader
+from manga_dl.download.MangaSynchronizer import MangaSynchronizer
+from manga_dl.model.ChapterSelection import ChapterSelection
+from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.model.MangaSeries import MangaSeries
+from manga_dl.scraping.ScrapingService import ScrapingService
+from manga_dl.test.testutils.TestDataFactory import TestDataFactory
+from manga_dl.util.SyncStateStore import SyncStateStore
+from manga_dl.util.Timer import Timer
+
+
+class TestMangaSynchronizer:
+
+    def setup_method(self):
+        self.url = "https://example.com/123"
+        self.target = Path(tempfile.gettempdir())
+        self.series = TestDataFactory.build_series()
+        self.now = datetime(2022, 6, 1)
+
+        self.path = Path(tempfile.gettempdir()) / "mangasynchronizer" / "state.db"
+        if self.path.exists():
+            self.path.unlink()
+        self.state_store = SyncStateStore()
+        self.state_store.set_path(self.path)
+
+        self.scraper = Mock(ScrapingService)
+        self.scraper.get_series_id.return_value = self.series.id
+        self.scraper.scrape.side_effect = lambda *_, **__: replace(self.series, volumes=[
+            replace(volume, chapters=list(volume.chapters)) for volume in self.series.volumes
+        ])
+        self.downloader = Mock(MangaDownloader)
+        self.downloader.download_batch.side_effect = lambda series_list, *_: [
+            chapter for series in series_list for chapter in series.get_chapters()
+        ]
+        self.timer = Mock(Timer)
+        self.timer.time.return_value = (self.now - datetime(1970, 1, 1)).total_seconds()
+        self.under_test = MangaSynchronizer(self.scraper, self.downloader, self.state_store, self.timer)
+
+    def teardown_method(self):
+        self.state_store.close()
+
+    def test_first_sync_downloads_everything(self):
+        result = self.under_test.sync(self.url, self.target, MangaFileFormat.CBZ)
+
+        assert result.get_chapters() == self.series.get_chapters()
+        self.downloader.download_batch.assert_called_once()
+        self.scraper.scrape.assert_called_with(self.url, load_pages=False, selection=ChapterSelection())
+        assert self.state_store.get_last_sync(self.series.id) == self.now - MangaSynchronizer.SYNC_OVERLAP
+        for chapter in self.series.get_chapters():
+            assert self.state_store.get_chapter_state(self.series.id, chapter.id) is not None
+
+    def test_second_sync_uses_last_sync(self):
+        self.under_test.sync(self.url, self.target, MangaFileFormat.CBZ)
+        self.downloader.download_batch.reset_mock()
+
+        result = self.under_test.sync(self.url, self.target, MangaFileFormat.CBZ)
+
+        assert result.get_chapters() == []
+        self.downloader.download_batch.assert_not_called()
+        self.scraper.scrape.assert_called_with(
+            self.url, load_pages=False,
+            selection=ChapterSelection(updated_since=self.now - MangaSynchronizer.SYNC_OVERLAP)
+        )
+
+    def test_sync_updated_chapters(self):
+        self.under_test.sync(self.url, self.target, MangaFileFormat.CBZ)
+        reuploaded, edited = self.series.volumes[0].chapters
+        reuploaded.updated_at = datetime(2022, 7, 1)
+        reuploaded.content_hash = "new-hash"
+        edited.updated_at = datetime(2022, 7, 1)
+
+        result = self.under_test.sync(self.url, self.target, MangaFileFormat.CBZ)
+
+        assert result.get_chapters() == [reuploaded]
+        assert self.state_store.get_chapter_state(self.series.id, edited.id).updated_at == datetime(2022, 7, 1)
+
+    def test_sync_marks_only_completed_chapters(self):
+        failed = self.series.get_chapters()[0]
+        self.downloader.download_batch.side_effect = lambda series_list, *_: [
+            chapter for series in series_list for chapter in series.get_chapters() if chapter.id != failed.id
+        ]
+
+        self.under_test.sync(self.url, self.target, MangaFileFormat.CBZ)
+
+        assert self.state_store.get_chapter_state(self.series.id, failed.id) is None
+        assert self.state_store.get_chapter_state(self.series.id, self.series.get_chapters()[1].id) is not None
+        assert self.state_store.get_last_sync(self.series.id) is None
+
+    def test_sync_skips_chapters_without_content_hash(self):
+        chapter = self.series.get_chapters()[0]
+        chapter.content_hash = None
+
+        self.under_test.sync(self.url, self.target, MangaFileFormat.CBZ)
+
+        assert self.state_store.get_chapter_state(self.series.id, chapter.id) is None
+
+    def test_sync_with_selection_keeps_last_sync(self):
+        selection = ChapterSelection.parse(["1"])
+
+        self.under_test.sync(self.url, self.target, MangaFileFormat.CBZ, selection)
+
+        self.scraper.scrape.assert_called_with(self.url, load_pages=False, selection=selection)
+        assert self.state_store.get_last_sync(self.series.id) is None
+
+    def test_sync_unsupported_url(self):
+        self.scraper.get_series_id.return_value = None
+
+        assert self.under_test.sync(self.url, self.target, MangaFileFormat.CBZ) is None
+        self.scraper.scrape.assert_not_called()
+
+    def test_sync_series_not_found(self):
+        self.scraper.scrape.side_effect = lambda *_, **__: None
+
+        assert self.under_test.sync(self.url, self.target, MangaFileFormat.CBZ) is None
+        assert self.state_store.get_last_sync(self.series.id) is None
+
+    def test_sync_empty_series(self):
+        self.scraper.scrape.side_effect = lambda *_, **__: MangaSeries(self.series.id, "")
+
+        self.under_test.sync(self.url, self.target, MangaFileFormat.CBZ)
+
+        self.downloader.download_batch.assert_not_called()
+
+    def test_sync_batch(self):
+        other_url = "https://example.com/456"
+        other_series = replace(self.series, id="456", name="Other")
+        self.scraper.get_series_id.side_effect = lambda url: "456" if url == other_url else self.series.id
+        self.scraper.scrape.side_effect = lambda url, **__: replace(
+            other_series if url == other_url else self.series,
+            volumes=[replace(volume, chapters=list(volume.chapters)) for volume in self.series.volumes]
+        )
+
+        result = self.under_test.sync_batch([self.url, other_url], self.target, MangaFileFormat.CBZ)
+
+        assert [series.id for series in result] == [self.series.id, "456"]
+        self.downloader.download_batch.assert_called_once_with(result, self.target, MangaFileFormat.CBZ)
+        for series_id in [self.series.id, "456"]:
+            assert self.state_store.get_last_sync(series_id) == self.now - MangaSynchronizer.SYNC_OVERLAP
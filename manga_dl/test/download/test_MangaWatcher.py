@@ -0,0 +1,64 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from manga_dl.download.MangaSynchronizer import MangaSynchronizer
+from manga_dl.download.MangaWatcher import MangaWatcher
+from manga_dl.model.ChapterSelection import ChapterSelection
+from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.util.Timer import Timer
+
+
+class TestMangaWatcher:
+
+    def setup_method(self):
+        self.urls = ["https://example.com/123", "https://example.com/456"]
+        self.target = Path(tempfile.gettempdir())
+        self.synchronizer = Mock(MangaSynchronizer)
+        self.timer = Mock(Timer)
+        self.timer.monotonic.side_effect = [0, 5, 100, 110, 200, 205]
+        self.under_test = MangaWatcher(self.synchronizer, self.timer)
+
+    def test_watch(self):
+        selection = ChapterSelection(latest=1)
+
+        with patch("random.uniform", return_value=0):
+            self.under_test.watch(self.urls, self.target, MangaFileFormat.CBZ, 60, selection, polls=3)
+
+        assert self.synchronizer.sync_batch.call_count == 3
+        self.synchronizer.sync_batch.assert_called_with(self.urls, self.target, MangaFileFormat.CBZ, selection)
+        assert [args[0][0] for args in self.timer.sleep.call_args_list] == [55, 50]
+
+    def test_watch_jitters_interval(self):
+        with patch("random.uniform", return_value=0.1):
+            self.under_test.watch(self.urls, self.target, MangaFileFormat.CBZ, 60, polls=2)
+
+        self.timer.sleep.assert_called_once_with(61)
+
+    def test_watch_survives_failed_poll(self):
+        self.synchronizer.sync_batch.side_effect = [ConnectionError("Offline"), ValueError("API error"), []]
+
+        self.under_test.watch(self.urls, self.target, MangaFileFormat.CBZ, 60, polls=3)
+
+        assert self.synchronizer.sync_batch.call_count == 3
+        assert self.timer.sleep.call_count == 2
+
+    def test_watch_survives_unexpected_error(self):
+        self.synchronizer.sync_batch.side_effect = [KeyError("id"), RuntimeError("Database locked"), []]
+
+        with patch.object(MangaWatcher.logger, "exception") as log_exception:
+            self.under_test.watch(self.urls, self.target, MangaFileFormat.CBZ, 60, polls=3)
+
+        assert self.synchronizer.sync_batch.call_count == 3
+        assert self.timer.sleep.call_count == 2
+        assert log_exception.call_count == 2
+
+    def test_watch_stops_on_interrupt(self):
+        self.synchronizer.sync_batch.side_effect = KeyboardInterrupt()
+
+        with pytest.raises(KeyboardInterrupt):
+            self.under_test.watch(self.urls, self.target, MangaFileFormat.CBZ, 60, polls=3)
+
+        self.timer.sleep.assert_not_called()
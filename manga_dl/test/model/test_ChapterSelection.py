@@ -0,0 +1,69 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from manga_dl.model.ChapterSelection import ChapterSelection
+from manga_dl.model.MangaChapter import MangaChapter
+
+
+class TestChapterSelection:
+
+    def setup_method(self):
+        self.chapters = [
+            MangaChapter("A", Decimal("1"), Decimal("1"), datetime(2022, 1, 1)),
+            MangaChapter("B", Decimal("1.5"), Decimal("1"), datetime(2022, 2, 1)),
+            MangaChapter("C", Decimal("2"), Decimal("2"), datetime(2022, 3, 1)),
+            MangaChapter("C", Decimal("2"), Decimal("2"), datetime(2022, 3, 2)),
+            MangaChapter("D", Decimal("3"), None, datetime(2022, 4, 1)),
+        ]
+
+    def _select(self, *expressions: str):
+        return [chapter.title for chapter in ChapterSelection.parse(list(expressions)).apply(self.chapters)]
+
+    def test_parse(self):
+        assert ChapterSelection.parse(["1", "2-3", "4-", "-5", "v1", "latest:2", "since:2022-01-31"]) == \
+            ChapterSelection(
+                chapter_ranges=[
+                    (Decimal(1), Decimal(1)), (Decimal(2), Decimal(3)), (Decimal(4), None), (None, Decimal(5))
+                ],
+                volume_ranges=[(Decimal(1), Decimal(1))],
+                latest=2,
+                since=datetime(2022, 1, 31)
+            )
+
+    def test_parse_invalid(self):
+        for expression in ["abc", "-", "v", "latest:0", "latest:x", "since:yesterday"]:
+            with pytest.raises(ValueError):
+                ChapterSelection.parse([expression])
+
+    def test_empty_selection(self):
+        assert ChapterSelection().is_empty() is True
+        assert ChapterSelection.parse(["1"]).is_empty() is False
+        assert self._select() == ["A", "B", "C", "C", "D"]
+
+    def test_apply_chapters_and_volumes(self):
+        assert self._select("1") == ["A"]
+        assert self._select("1-2") == ["A", "B", "C", "C"]
+        assert self._select("2-") == ["C", "C", "D"]
+        assert self._select("v1") == ["A", "B"]
+        assert self._select("v2-", "3") == ["C", "C", "D"]
+
+    def test_apply_latest_and_since(self):
+        assert self._select("latest:2") == ["C", "C", "D"]
+        assert self._select("since:2022-02-01") == ["B", "C", "C", "D"]
+        assert self._select("v1", "latest:1") == ["B"]
+
+    def test_get_exact_numbers(self):
+        assert ChapterSelection.parse(["1", "2"]).get_exact_chapters() == [Decimal(1), Decimal(2)]
+        assert ChapterSelection.parse(["1", "2-3"]).get_exact_chapters() is None
+        assert ChapterSelection.parse(["1", "v2"]).get_exact_chapters() is None
+        assert ChapterSelection.parse(["v1", "v2"]).get_exact_volumes() == [Decimal(1), Decimal(2)]
+        assert ChapterSelection.parse(["latest:3"]).get_exact_volumes() is None
+
+    def test_selects_whole_volumes(self):
+        assert ChapterSelection().selects_whole_volumes() is True
+        assert ChapterSelection.parse(["v1", "v3-"]).selects_whole_volumes() is True
+        assert ChapterSelection.parse(["v1", "2"]).selects_whole_volumes() is False
+        assert ChapterSelection.parse(["v1", "latest:1"]).selects_whole_volumes() is False
+        assert ChapterSelection.parse(["since:2022-02-01"]).selects_whole_volumes() is False
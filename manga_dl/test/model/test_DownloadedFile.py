@@ -1,3 +1,6 @@
+import tempfile
+from pathlib import Path
+
 from manga_dl.model.DownloadedFile import DownloadedFile
 
 
@@ -6,3 +9,17 @@ class TestDownloadedFile:
         assert DownloadedFile(bytes("A", "utf8"), "file.png").get_extension() == "png"
         assert DownloadedFile(bytes("A", "utf8"), "my.file.jpg").get_extension() == "jpg"
         assert DownloadedFile(bytes("A", "utf8"), "myfile").get_extension() == ""
+
+    def test_open_in_memory(self):
+        with DownloadedFile(b"Hello", "file.png").open() as opened:
+            assert opened.read() == b"Hello"
+
+    def test_open_from_path(self):
+        path = Path(tempfile.gettempdir()) / "downloadedfile.png"
+        path.write_bytes(b"Hello")
+
+        downloaded = DownloadedFile.from_path(path, "page.png")
+
+        assert downloaded.filename == "page.png"
+        with downloaded.open() as opened:
+            assert opened.read() == b"Hello"
@@ -2,6 +2,7 @@ from decimal import Decimal
 
 from manga_dl.model.MangaChapter import MangaChapter
 from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.model.MangaPage import MangaPage
 
 
 class TestMangaChapter:
@@ -22,3 +23,22 @@ class TestMangaChapter:
         assert MangaChapter("C", Decimal("30.1")).is_special_chapter() is True
         assert MangaChapter("D", Decimal("0.2")).is_special_chapter() is True
         assert MangaChapter("E", Decimal("0")).is_special_chapter() is True
+
+    def test_resolve_pages(self):
+        loads = []
+
+        def load_pages():
+            loads.append(1)
+            return [MangaPage(f"example.com/{len(loads)}/1.png", 1)]
+
+        chapter = MangaChapter("A", Decimal(1), page_loader=load_pages)
+
+        assert chapter.resolve_pages() == [MangaPage("example.com/1/1.png", 1)]
+        assert chapter.resolve_pages() == [MangaPage("example.com/1/1.png", 1)]
+        assert chapter.resolve_pages(refresh=True) == [MangaPage("example.com/2/1.png", 1)]
+        assert chapter.pages == [MangaPage("example.com/2/1.png", 1)]
+
+    def test_resolve_pages_without_loader(self):
+        chapter = MangaChapter("A", Decimal(1), pages=[MangaPage("example.com/1.png", 1)])
+
+        assert chapter.resolve_pages(refresh=True) == [MangaPage("example.com/1.png", 1)]
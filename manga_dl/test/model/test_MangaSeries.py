@@ -3,6 +3,7 @@ from decimal import Decimal
 from pytest_unordered import unordered
 
 from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaFileFormat import MangaFileFormat
 from manga_dl.model.MangaSeries import MangaSeries
 from manga_dl.model.MangaVolume import MangaVolume
 
@@ -22,3 +23,19 @@ class TestMangaSeries:
         ])
 
         assert series.get_chapters() == unordered(chapters)
+
+    def test_get_chapter_filenames_unique(self):
+        chapters = [
+            MangaChapter(title="x", number=Decimal(1), id="aaaaaaaa-1"),
+            MangaChapter(title="x", number=Decimal(1), id="bbbbbbbb-2"),
+            MangaChapter(title="x", number=Decimal(1)),
+            MangaChapter(title="x", number=Decimal(1)),
+        ]
+        series = MangaSeries(id="1", name="a", volumes=[MangaVolume(volume_number=None, chapters=chapters)])
+
+        assert series.get_chapter_filenames(MangaFileFormat.ZIP) == [
+            (chapters[0], "c1-x.zip"),
+            (chapters[1], "c1-x-bbbbbbbb.zip"),
+            (chapters[2], "c1-x-2.zip"),
+            (chapters[3], "c1-x-3.zip"),
+        ]
@@ -1,2 +1,12 @@
+from decimal import Decimal
+
+from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.model.MangaVolume import MangaVolume
+
+
 class TestMangaVolume:
-    pass
+
+    def test_get_filename(self):
+        assert MangaVolume(Decimal(1)).get_filename(MangaFileFormat.CBZ) == "v1.cbz"
+        assert MangaVolume(Decimal("2.5")).get_filename(MangaFileFormat.DIR) == "v2.5"
+        assert MangaVolume().get_filename(MangaFileFormat.ZIP) == "no-volume.zip"
@@ -1,24 +1,40 @@
 import itertools
-from typing import Optional, Dict, Any, Union, List
+from datetime import datetime
+from typing import Optional, Dict, Any, Union, List, Tuple
 
 from manga_dl.model.DownloadedFile import DownloadedFile
 from manga_dl.model.MangaChapter import MangaChapter
 from manga_dl.model.MangaSeries import MangaSeries
 from manga_dl.test.testutils.TestIdCreator import TestIdCreator
 from manga_dl.util.HttpRequester import HttpRequester
+from manga_dl.util.NodeHealthTracker import NodeHealthTracker
+from manga_dl.util.RateLimiter import RateLimiter
+from manga_dl.util.RequestCounter import RequestCounter
+from manga_dl.util.ResponseCache import ResponseCache
 from manga_dl.util.Timer import Timer
 
 
 class MockedMangadexHttpRequester(HttpRequester):
 
-    def __init__(self, timer: Timer):
-        super().__init__(timer)
+    def __init__(
+            self, timer: Timer, rate_limiter: RateLimiter, response_cache: ResponseCache,
+            node_health: NodeHealthTracker, request_counter: RequestCounter
+    ):
+        super().__init__(timer, rate_limiter, response_cache, node_health, request_counter)
         self._series: List[MangaSeries] = []
         self._external_chapters = False
         self._create_http_error = False
         self._create_api_error = False
+        self._include_total = True
         self._endpoint_overrides: Dict[str, Any] = {}
         self._file_cache: Dict[str, DownloadedFile] = {}
+        self.rate_limit_buckets: Dict[str, Optional[str]] = {}
+        self.chapter_params: List[Dict[str, Any]] = []
+        self.chapter_endpoints: List[str] = []
+        self.cache_ttls: Dict[str, Optional[float]] = {}
+        self.cover_offsets: List[int] = []
+        self.at_home_params: List[Dict[str, Any]] = []
+        self.posted: List[Tuple[str, Dict[str, Any]]] = []
 
     def add_series(self, series: MangaSeries):
         self._series.append(series)
@@ -30,12 +46,22 @@ class MockedMangadexHttpRequester(HttpRequester):
         self._create_http_error = http
         self._create_api_error = api
 
+    def set_include_total(self, include_total: bool):
+        self._include_total = include_total
+
     def add_endpoint_override(self, endpoint: str, response: Optional[Dict[str, Any]]):
         self._endpoint_overrides[endpoint] = response
 
-    def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    def get_json(
+            self, url: str, params: Optional[Dict[str, Any]] = None, rate_limit_bucket: Optional[str] = None,
+            cache_ttl: Optional[float] = None, request_name: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
 
         params = {} if params is None else params
+        if request_name is not None:
+            self.request_counter.increment(request_name)
+        self.rate_limit_buckets[url.replace("https://api.mangadex.org/", "")] = rate_limit_bucket
+        self.cache_ttls[url.replace("https://api.mangadex.org/", "")] = cache_ttl
 
         if self._create_http_error:
             return None
@@ -48,8 +74,14 @@ class MockedMangadexHttpRequester(HttpRequester):
         if endpoint in self._endpoint_overrides:
             return self._endpoint_overrides[endpoint]
 
-        if endpoint == "chapter":
-            return self._build_response(self._get_chapter_data(params))
+        if endpoint.startswith("at-home/"):
+            self.at_home_params.append(params)
+
+        if endpoint.endswith("/feed") or endpoint == "chapter":
+            self.chapter_params.append(params)
+            self.chapter_endpoints.append(endpoint)
+            series_id = params["manga"] if endpoint == "chapter" else endpoint.split("/")[1]
+            return self._build_response(self._get_chapter_data(series_id, params))
 
         else:
             static_responses: Dict[str, Any] = {}
@@ -60,8 +92,17 @@ class MockedMangadexHttpRequester(HttpRequester):
                 static_responses |= self._create_chapter_page_endpoint_responses(series)
                 static_responses |= self._create_volume_cover_endpoint_responses(series)
 
+            if endpoint == "cover":
+                self.cover_offsets.append(params["offset"])
+                covers = static_responses[endpoint]["data"][params["offset"]:params["offset"] + params["limit"]]
+                return self._build_response(self._wrap_in_data(covers))
+
             return self._build_response(static_responses[endpoint])
 
+    def post_json(self, url: str, payload: Dict[str, Any]) -> bool:
+        self.posted.append((url, payload))
+        return True
+
     def download_file(self, url: str) -> Optional[bytes]:
         return self._file_cache.get(url.split("/")[-1], DownloadedFile(b"", "")).data
 
@@ -73,21 +114,28 @@ class MockedMangadexHttpRequester(HttpRequester):
     def _wrap_in_data(data: Union[List[Any], Dict[str, Any]]) -> Dict[str, Any]:
         return {"data": data}
 
-    def _get_chapter_data(self, params: Dict[str, Any]) -> Dict[str, Any]:
-
-        if params["offset"] != 0:
-            return self._wrap_in_data([])
+    def _get_chapter_data(self, series_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
 
         all_chapters = itertools.chain(*[
             series.get_chapters()
             for series in self._series
-            if series.id == params["manga"]
+            if series.id == series_id
         ])
 
-        return self._wrap_in_data([
+        updated_since = params.get("updatedAtSince")
+        chapters_data = [
             self._create_chapter_response(chapter, "somegroup")
             for chapter in all_chapters
-        ])
+            if updated_since is None or self._get_updated_at(chapter).strftime("%Y-%m-%dT%H:%M:%S") >= updated_since
+        ]
+        response = self._wrap_in_data(chapters_data[params["offset"]:params["offset"] + params["limit"]])
+        if self._include_total:
+            response["total"] = len(chapters_data)
+        return response
+
+    @staticmethod
+    def _get_updated_at(chapter: MangaChapter) -> datetime:
+        return chapter.published_at if chapter.updated_at is None else chapter.updated_at
 
     def _create_chapter_response(self, chapter: MangaChapter, group: str) -> Dict[str, Any]:
         return {
@@ -98,6 +146,7 @@ class MockedMangadexHttpRequester(HttpRequester):
                 "chapter": str(chapter.number),
                 "title": chapter.title,
                 "createdAt": chapter.published_at.strftime("%Y-%m-%dT%H:%M:%S"),
+                "updatedAt": None if chapter.updated_at is None else chapter.updated_at.strftime("%Y-%m-%dT%H:%M:%S"),
                 "externalUrl": "External" if self._external_chapters else None
             }
         }
@@ -107,12 +156,25 @@ class MockedMangadexHttpRequester(HttpRequester):
             f"manga/{series.id}": self._wrap_in_data({
                 "attributes": {"title": {"en": series.name}},
                 "relationships": [
-                    {"type": "author", "id": TestIdCreator.create_author_id(series.author)},
-                    {"type": "artist", "id": TestIdCreator.create_author_id(series.artist)}
+                    self._create_author_relation("author", series.author),
+                    self._create_author_relation("artist", series.artist),
+                    *[
+                        {"type": "cover_art", "id": volume.cover.filename,
+                         "attributes": {"fileName": volume.cover.filename}}
+                        for volume in series.volumes[-1:]
+                        if volume.cover is not None
+                    ]
                 ]
             })
         }
 
+    @staticmethod
+    def _create_author_relation(relation_type: str, author: Optional[str]) -> Dict[str, Any]:
+        relation: Dict[str, Any] = {"type": relation_type, "id": TestIdCreator.create_author_id(author)}
+        if author is not None:
+            relation["attributes"] = {"name": author}
+        return relation
+
     def _create_author_endpoint_responses(self, author: Optional[str]) -> Dict[str, Any]:
 
         if author is None:
@@ -131,7 +193,8 @@ class MockedMangadexHttpRequester(HttpRequester):
                 "baseUrl": "example.com",
                 "chapter": {
                     "hash": TestIdCreator.create_chapter_id(chapter),
-                    "data": [f"{pagenumber}.png" for pagenumber in range(0, len(chapter.pages))]
+                    "data": [f"{pagenumber}.png" for pagenumber in range(0, len(chapter.pages))],
+                    "dataSaver": [f"{pagenumber}.jpg" for pagenumber in range(0, len(chapter.pages))]
                 }
             } for chapter in series.get_chapters()
         }
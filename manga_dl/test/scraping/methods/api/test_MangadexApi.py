@@ -1,11 +1,20 @@
-from unittest.mock import Mock
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import Mock, patch
 
+from manga_dl.model.ChapterSelection import ChapterSelection
+from manga_dl.model.ImageQuality import ImageQuality
 from manga_dl.model.MangaSeries import MangaSeries
 from manga_dl.scraping.methods.api.MangadexApi import MangadexApi
 from manga_dl.test.scraping.methods.api.MockedMangadexHttpRequester import MockedMangadexHttpRequester
 from manga_dl.test.testutils.TestDataFactory import TestDataFactory
 from manga_dl.test.testutils.TestIdCreator import TestIdCreator
 from manga_dl.util.DateConverter import DateConverter
+from manga_dl.util.ImageCache import ImageCache
+from manga_dl.util.NodeHealthTracker import NodeHealthTracker
+from manga_dl.util.RateLimiter import RateLimiter
+from manga_dl.util.RequestCounter import RequestCounter
+from manga_dl.util.ResponseCache import ResponseCache
 from manga_dl.util.Timer import Timer
 
 
@@ -14,23 +23,235 @@ class TestMangadexApi:
     def setup_method(self):
         self.dateconverter = DateConverter()
         self.timer = Mock(Timer)
-        self.requester = MockedMangadexHttpRequester(self.timer)
-        self.under_test = MangadexApi(self.requester, self.dateconverter, self.timer)
+        self.timer.monotonic.return_value = 0
+        self.rate_limiter = Mock(RateLimiter)
+        self.request_counter = RequestCounter()
+        self.requester = MockedMangadexHttpRequester(
+            self.timer, self.rate_limiter, Mock(ResponseCache), Mock(NodeHealthTracker), self.request_counter
+        )
+        self.image_cache = Mock(ImageCache)
+        self.image_cache.load_cover.return_value = None
+        self.node_health = NodeHealthTracker(self.timer)
+        self.under_test = MangadexApi(
+            self.requester, self.dateconverter, self.rate_limiter, self.image_cache, self.node_health
+        )
 
         self.series = TestDataFactory.build_series()
         self.requester.add_series(self.series)
 
     def test_get_series(self):
-        result = self.under_test.get_series(self.series.id)
+        result = self._resolve_covers(self.under_test.get_series(self.series.id))
 
         assert result == self.series
 
+    def test_get_series_uses_reference_expansion(self):
+        self.under_test.get_series(self.series.id, load_pages=False)
+
+        assert not any(endpoint.startswith("author/") for endpoint in self.requester.rate_limit_buckets)
+        assert self.request_counter.get_counts() == {"manga/{id}/feed": 1, "manga/{id}": 1}
+
+    def test_get_series_feed_paginated_by_total(self):
+        with patch.object(MangadexApi, "FEED_PAGE_SIZE", 1):
+            result = self.under_test.get_series(self.series.id, load_pages=False)
+
+        assert sorted(params["offset"] for params in self.requester.chapter_params) == [0, 1, 2]
+        assert [chapter.id for chapter in result.get_chapters()] == [
+            chapter.id for chapter in self.series.get_chapters()
+        ]
+
+    def test_get_series_feed_paginated_without_total(self):
+        self.requester.set_include_total(False)
+
+        with patch.object(MangadexApi, "FEED_PAGE_SIZE", 1):
+            result = self.under_test.get_series(self.series.id, load_pages=False)
+
+        assert [params["offset"] for params in self.requester.chapter_params] == [0, 1, 2, 3]
+        assert len(result.get_chapters()) == 3
+
+    def test_get_series_feed_single_page(self):
+        self.under_test.get_series(self.series.id, load_pages=False)
+
+        assert len(self.requester.chapter_params) == 1
+        assert self.requester.chapter_params[0]["limit"] == MangadexApi.FEED_PAGE_SIZE
+
+    def test_get_series_without_reference_expansion(self):
+        self.requester.add_endpoint_override(f"manga/{self.series.id}", {"result": "ok", "data": {
+            "attributes": {"title": {"en": self.series.name}},
+            "relationships": [
+                {"type": "author", "id": TestIdCreator.create_author_id(self.series.author)},
+                {"type": "artist", "id": TestIdCreator.create_author_id(self.series.artist)}
+            ]
+        }})
+
+        result = self.under_test.get_series(self.series.id, load_pages=False)
+
+        assert result.author == self.series.author
+        assert result.artist == self.series.artist
+        assert self.request_counter.get_counts() == {"author/{id}": 2, "manga/{id}/feed": 1, "manga/{id}": 1}
+
+    def test_get_series_main_cover_fallback(self):
+        self.requester.add_endpoint_override("cover", {"result": "ok", "data": []})
+
+        result = self.under_test.get_series(self.series.id)
+
+        assert result.volumes[0].resolve_cover() == self.series.volumes[-1].cover
+
+    def test_get_series_covers_loaded_lazily(self):
+        result = self.under_test.get_series(self.series.id)
+
+        assert "cover" not in self.requester.rate_limit_buckets
+        assert all(volume.cover is None for volume in result.volumes)
+
+        cover = result.get_chapters()[0].resolve_cover()
+
+        assert cover == self.series.volumes[0].cover
+        assert self.requester.chapter_params is not None
+        self.image_cache.store_cover.assert_called_once_with(self.series.id, cover.filename, cover.data)
+
+    def test_get_series_cover_from_image_cache(self):
+        self.image_cache.load_cover.return_value = b"Cached"
+
+        result = self.under_test.get_series(self.series.id)
+
+        assert result.volumes[0].resolve_cover().data == b"Cached"
+        self.image_cache.store_cover.assert_not_called()
+
+    def test_get_series_covers_paginated(self):
+        MangadexApi.COVER_PAGE_SIZE = 1
+        try:
+            result = self.under_test.get_series(self.series.id)
+            result.volumes[0].resolve_cover()
+        finally:
+            MangadexApi.COVER_PAGE_SIZE = 100
+
+        assert self.requester.cover_offsets == [0, 1, 2]
+
     def test_get_series_no_pages(self):
         result = self.under_test.get_series(self.series.id, False)
 
         for chapter in result.get_chapters():
             assert chapter.pages == []
 
+    def test_get_series_resolve_pages_lazily(self):
+        result = self.under_test.get_series(self.series.id, False)
+
+        assert not any(endpoint.startswith("at-home/") for endpoint in self.requester.rate_limit_buckets)
+        for chapter, expected in zip(result.get_chapters(), self.series.get_chapters()):
+            assert chapter.resolve_pages() == expected.pages
+
+    def test_get_series_data_saver(self):
+        self.under_test.set_image_quality(ImageQuality.DATA_SAVER)
+        result = self.under_test.get_series(self.series.id, False)
+        chapter = result.get_chapters()[0]
+        chapter_id = TestIdCreator.create_chapter_id(self.series.get_chapters()[0])
+
+        pages = chapter.resolve_pages()
+
+        assert chapter.image_quality == ImageQuality.DATA_SAVER
+        assert chapter.content_hash == f"{chapter_id}-data-saver"
+        assert [page.image_file for page in pages] == [
+            f"example.com/data-saver/{chapter_id}/{i}.jpg" for i in range(len(pages))
+        ]
+
+    def test_get_series_resolve_pages_avoids_degraded_node(self):
+        result = self.under_test.get_series(self.series.id, False)
+        for _ in range(NodeHealthTracker.FAILURE_THRESHOLD):
+            self.node_health.record("example.com/data/1.png", False, 1, 0, False)
+
+        result.get_chapters()[0].resolve_pages()
+
+        assert self.requester.at_home_params == [{}, {"forcePort443": "true"}]
+
+    def test_get_series_resolve_pages_falls_back_to_uploads(self):
+        result = self.under_test.get_series(self.series.id, False)
+        chapter = result.get_chapters()[0]
+        for _ in range(NodeHealthTracker.FAILURE_THRESHOLD):
+            self.node_health.record("example.com/data/1.png", False, 1, 0, False)
+
+        pages = chapter.resolve_pages()
+
+        assert all(page.image_file.startswith(f"{MangadexApi.UPLOADS_URL}/data/") for page in pages)
+
+        for _ in range(NodeHealthTracker.FAILURE_THRESHOLD):
+            self.node_health.record(f"{MangadexApi.UPLOADS_URL}/data/1.png", False, 1, 0, False)
+
+        assert chapter.resolve_pages(refresh=True) == []
+
+    def test_report_images(self):
+        self.node_health.set_reporting(True)
+
+        self.node_health.record("https://node.mangadex.network/token/data/hash/1.png", True, 0.25, 100, True)
+        self.node_health.record("https://uploads.mangadex.org/data/hash/1.png", True, 0.25, 100, False)
+        self.under_test._report_executor.shutdown(wait=True)
+
+        assert self.requester.posted == [(MangadexApi.REPORT_URL, {
+            "url": "https://node.mangadex.network/token/data/hash/1.png",
+            "success": True,
+            "bytes": 100,
+            "duration": 250,
+            "cached": True
+        })]
+
+    def test_get_series_with_selection(self):
+        selection = ChapterSelection.parse(["1.5", "2"])
+
+        result = self.under_test.get_series(self.series.id, False, selection)
+
+        assert [chapter.number for chapter in result.get_chapters()] == [Decimal("2"), Decimal("1.5")]
+        assert self.requester.chapter_endpoints == ["chapter"]
+        assert self.requester.chapter_params[0]["manga"] == self.series.id
+        assert self.requester.chapter_params[0]["limit"] == MangadexApi.CHAPTER_PAGE_SIZE
+        assert self.requester.chapter_params[0]["chapter[]"] == ["1.5", "2"]
+        assert "volume[]" not in self.requester.chapter_params[0]
+        assert not any(endpoint.startswith("at-home/") for endpoint in self.requester.rate_limit_buckets)
+
+    def test_get_series_with_volume_and_date_selection(self):
+        selection = ChapterSelection.parse(["v1", "since:1970-01-01"])
+
+        result = self._resolve_covers(self.under_test.get_series(self.series.id, True, selection))
+
+        assert result.get_chapters() == self.series.volumes[0].chapters
+        assert self.requester.chapter_endpoints == ["chapter"]
+        assert self.requester.chapter_params[0]["volume[]"] == ["1"]
+        assert self.requester.chapter_params[0]["createdAtSince"] == "1970-01-01T00:00:00"
+
+    def test_get_series_with_range_selection_not_pushed_down(self):
+        self.under_test.get_series(self.series.id, False, ChapterSelection.parse(["1-2"]))
+
+        assert self.requester.chapter_endpoints == [f"manga/{self.series.id}/feed"]
+        assert "chapter[]" not in self.requester.chapter_params[0]
+        assert "manga" not in self.requester.chapter_params[0]
+
+    def test_get_series_with_selection_paginated(self):
+        with patch.object(MangadexApi, "CHAPTER_PAGE_SIZE", 1):
+            result = self.under_test.get_series(self.series.id, False, ChapterSelection.parse(["v1"]))
+
+        assert [chapter.id for chapter in result.get_chapters()] == [
+            chapter.id for chapter in self.series.volumes[0].chapters
+        ]
+        assert set(self.requester.chapter_endpoints) == {"chapter"}
+        assert all(params["limit"] == 1 for params in self.requester.chapter_params)
+        assert sorted(params["offset"] for params in self.requester.chapter_params) == [0, 1, 2]
+
+    def test_get_series_updated_since(self):
+        updated_chapter = self.series.volumes[0].chapters[1]
+        updated_chapter.updated_at = datetime(2022, 5, 1)
+        selection = ChapterSelection(updated_since=datetime(2022, 4, 1))
+
+        result = self.under_test.get_series(self.series.id, False, selection)
+
+        assert [chapter.id for chapter in result.get_chapters()] == [updated_chapter.id]
+        assert result.get_chapters()[0].updated_at == datetime(2022, 5, 1)
+        assert self.requester.chapter_params[0]["updatedAtSince"] == "2022-04-01T00:00:00"
+
+    def test_get_series_nothing_updated_since(self):
+        selection = ChapterSelection(updated_since=datetime(2022, 4, 1))
+
+        result = self.under_test.get_series(self.series.id, True, selection)
+
+        assert result.get_chapters() == []
+        assert list(self.requester.rate_limit_buckets) == [f"manga/{self.series.id}/feed"]
+
     def test_get_series_only_external_links(self):
         self.requester.set_external_chapters(True)
 
@@ -78,8 +299,8 @@ class TestMangadexApi:
 
         result = self.under_test.get_series(series.id)
 
-        assert result.volumes[0].cover == result.volumes[1].cover
-        assert result.volumes[0].cover.filename == "Default.png"
+        assert result.volumes[0].resolve_cover() == result.volumes[1].resolve_cover()
+        assert result.volumes[0].resolve_cover().filename == "Default.png"
 
     def test_get_series_use_minimal_cover(self):
         series = MangaSeries(id="1000", name="100", volumes=[
@@ -91,5 +312,53 @@ class TestMangadexApi:
 
         result = self.under_test.get_series(series.id)
 
-        assert result.volumes[2].cover == result.volumes[0].cover
-        assert result.volumes[2].cover.filename == "one.png"
+        assert result.volumes[2].resolve_cover() == result.volumes[0].resolve_cover()
+        assert result.volumes[2].resolve_cover().filename == "one.png"
+
+    def test_get_series_falls_back_when_cover_download_fails(self):
+        series = MangaSeries(id="1001", name="100", volumes=[
+            TestDataFactory.build_minimal_volume("1", cover="one"),
+            TestDataFactory.build_minimal_volume("2", cover="two"),
+            TestDataFactory.build_minimal_volume("3", cover="three"),
+        ])
+        self.requester.add_series(series)
+        download_file = self.requester.download_file
+        self.requester.download_file = lambda url: None if url.endswith("one.png") else download_file(url)
+
+        result = self.under_test.get_series(series.id)
+
+        assert result.volumes[0].resolve_cover().filename == "two.png"
+        assert result.volumes[2].resolve_cover().filename == "three.png"
+
+    def test_rate_limit_buckets(self):
+        self.rate_limiter.configure_bucket.assert_any_call(MangadexApi.API_BUCKET, rate=5, capacity=5)
+        self.rate_limiter.configure_bucket.assert_any_call(MangadexApi.AT_HOME_BUCKET, rate=40 / 60, capacity=40)
+
+        self.under_test.get_series(self.series.id)
+
+        assert self.requester.rate_limit_buckets["manga/123"] == MangadexApi.API_BUCKET
+        assert all(
+            bucket == MangadexApi.AT_HOME_BUCKET
+            for endpoint, bucket in self.requester.rate_limit_buckets.items()
+            if endpoint.startswith("at-home/server/")
+        )
+
+    def test_cache_ttls(self):
+        self.under_test.get_series(self.series.id).volumes[0].resolve_cover()
+
+        assert self.requester.cache_ttls["manga/123"] == MangadexApi.SERIES_CACHE_TTL
+        assert self.requester.cache_ttls["cover"] == MangadexApi.SERIES_CACHE_TTL
+        assert self.requester.cache_ttls[f"manga/{self.series.id}/feed"] == MangadexApi.FEED_CACHE_TTL
+        assert all(
+            ttl is None
+            for endpoint, ttl in self.requester.cache_ttls.items()
+            if endpoint.startswith("at-home/server/")
+        )
+
+    @staticmethod
+    def _resolve_covers(series: MangaSeries) -> MangaSeries:
+        for volume in series.volumes:
+            volume.resolve_cover()
+            for chapter in volume.chapters:
+                chapter.resolve_cover()
+        return series
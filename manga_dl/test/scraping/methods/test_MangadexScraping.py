@@ -14,7 +14,7 @@ class TestMangadexScraping:
 
         options = {"123": {True: self.manga_series, False: self.manga_series_no_pages}}
         self.mangadex_api.get_series.side_effect = \
-            lambda series_id, load_pages: options.get(series_id, {}).get(load_pages, None)
+            lambda series_id, load_pages, selection: options.get(series_id, {}).get(load_pages, None)
         self.under_test = MangadexScraping(self.mangadex_api)
 
     def test_is_applicable(self):
@@ -36,4 +36,6 @@ class TestMangadexScraping:
         assert existing == self.manga_series
         assert not_existing is None
         assert no_pages == self.manga_series_no_pages
-        self.mangadex_api.get_series.assert_has_calls([call("123", True), call("abc", True), call("123", False)])
+        self.mangadex_api.get_series.assert_has_calls(
+            [call("123", True, None), call("abc", True, None), call("123", False, None)]
+        )
@@ -1,5 +1,6 @@
 from unittest.mock import Mock
 
+from manga_dl.model.ImageQuality import ImageQuality
 from manga_dl.model.MangaSeries import MangaSeries
 from manga_dl.scraping.ScrapingMethod import ScrapingMethod
 from manga_dl.scraping.ScrapingService import ScrapingService
@@ -17,7 +18,7 @@ class TestScrapingService:
         self.scraping_method.is_applicable.side_effect = lambda series_url: "example.com" in series_url
         self.scraping_method.parse_id.side_effect = lambda series_url: series_url.rsplit("/", 1)[1]
         self.scraping_method.get_series.side_effect = \
-            lambda series_id, load_pages: self.series if load_pages else self.series_no_pages
+            lambda series_id, load_pages, selection: self.series if load_pages else self.series_no_pages
         self.under_test = ScrapingService([self.scraping_method])
 
     def test_scrape(self):
@@ -25,7 +26,7 @@ class TestScrapingService:
 
         self.scraping_method.is_applicable.assert_called_with(self.url)
         self.scraping_method.parse_id.assert_called_with(self.url)
-        self.scraping_method.get_series.assert_called_with(self.id, True)
+        self.scraping_method.get_series.assert_called_with(self.id, True, None)
 
         assert result == self.series
 
@@ -34,7 +35,7 @@ class TestScrapingService:
 
         self.scraping_method.is_applicable.assert_called_with(self.url)
         self.scraping_method.parse_id.assert_called_with(self.url)
-        self.scraping_method.get_series.assert_called_with(self.id, False)
+        self.scraping_method.get_series.assert_called_with(self.id, False, None)
 
         assert result == self.series_no_pages
 
@@ -56,8 +57,17 @@ class TestScrapingService:
         assert result is None
 
     def test_scrape_scrape_result_is_none(self):
-        self.scraping_method.get_series.side_effect = lambda x, y: None
+        self.scraping_method.get_series.side_effect = lambda x, y, z: None
 
         result = self.under_test.scrape(self.url)
 
         assert result is None
+
+    def test_get_series_id(self):
+        assert self.under_test.get_series_id(self.url) == self.id
+        assert self.under_test.get_series_id("https://notvalid.com") is None
+
+    def test_set_image_quality(self):
+        self.under_test.set_image_quality(ImageQuality.DATA_SAVER)
+
+        self.scraping_method.set_image_quality.assert_called_once_with(ImageQuality.DATA_SAVER)
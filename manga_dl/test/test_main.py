@@ -1,5 +1,9 @@
+import subprocess
+import sys
 from unittest.mock import patch, Mock
 
+import manga_dl
+
 from manga_dl.cli.MangaDLCli import MangaDLCli
 from manga_dl.main import main
 
@@ -15,3 +19,20 @@ class TestMain:
 
         inject_get_mock.assert_called_with(MangaDLCli)
         cli_mock.run.assert_called_once()
+
+    def test_startup_does_not_load_imaging_stack(self):
+        script = (
+            "import sys\n"
+            "from manga_dl.cli.MangaDLCli import MangaDLCli\n"
+            "from manga_dl.util.MangaDLDependencyInjector import MangaDLDependencyInjector\n"
+            "MangaDLDependencyInjector.get(MangaDLCli)\n"
+            "print(','.join(sorted(m for m in ['PIL', 'matplotlib', 'lxml', 'pkg_resources'] if m in sys.modules)))"
+        )
+
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == ""
+
+    def test_version(self):
+        assert isinstance(manga_dl.version, str)
+        assert manga_dl.version != ""
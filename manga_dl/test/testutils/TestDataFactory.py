@@ -37,7 +37,9 @@ class TestDataFactory:
             number=dummy_chapter.number,
             volume=dummy_chapter.volume,
             pages=pages,
-            cover=DownloadedFile(b"CoverImage", "cover.png")
+            cover=DownloadedFile(b"CoverImage", "cover.png"),
+            id=chapter_id,
+            content_hash=chapter_id
         )
 
     @staticmethod
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import threading
+from contextlib import contextmanager
+from io import BytesIO
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Iterator, List, Tuple, Any
+from unittest.mock import Mock, AsyncMock
+
+from manga_dl.util.AsyncHttpRequester import AsyncHttpRequester
+from manga_dl.util.RateLimiter import RateLimiter
+from manga_dl.util.Timer import Timer
+
+
+class TestAsyncHttpRequester:
+
+    def setup_method(self):
+        self.timer = Mock(Timer)
+        self.now = {"time": 0.0}
+        self.timer.sleep_async = AsyncMock(side_effect=self._advance)
+        self.timer.time.side_effect = lambda: self.now["time"]
+        self.timer.monotonic.side_effect = lambda: self.now["time"]
+        self.rate_limiter = RateLimiter(self.timer)
+        self.under_test = AsyncHttpRequester(self.timer, self.rate_limiter)
+
+    def _advance(self, seconds: float):
+        self.now["time"] += seconds
+
+    def test_get_json(self):
+        with self._start_server([(200, b'{"hello": "world"}')]) as url:
+            assert self._run(self.under_test.get_json(url, {"a": 1})) == {"hello": "world"}
+            self.timer.sleep_async.assert_not_called()
+
+    def test_get_json_failed(self):
+        with self._start_server([(404, b"Not Found")]) as url:
+            assert self._run(self.under_test.get_json(url)) is None
+            self.timer.sleep_async.assert_not_called()
+
+    def test_download_file_rate_limited_retry_success(self):
+        with self._start_server([(429, b""), (200, b"Hello World")]) as url:
+            assert self._run(self.under_test.download_file(url)) == b"Hello World"
+            self.timer.sleep_async.assert_called_once_with(60)
+
+    def test_get_json_rate_limited_retry_after_header(self):
+        with self._start_server([(429, b"", {"Retry-After": "3"}), (200, b"{}")]) as url:
+            assert self._run(self.under_test.get_json(url, rate_limit_bucket="api")) == {}
+            self.timer.sleep_async.assert_called_once_with(3)
+
+    def test_download_file_rate_limited_retry_failure(self):
+        with self._start_server([(429, b""), (429, b""), (200, b"Hello World")]) as url:
+            assert self._run(self.under_test.download_file(url)) is None
+            self.timer.sleep_async.assert_called_once_with(60)
+
+    def test_download_file_connection_error(self):
+        assert self._run(self.under_test.download_file("http://127.0.0.1:1/file.png")) is None
+        self.timer.sleep_async.assert_called_once_with(60)
+
+    def test_stream_file(self):
+        with self._start_server([(200, b"Hello World")]) as url:
+            destination = BytesIO(b"Stale content")
+
+            assert self._run(self.under_test.stream_file(url, destination)) is True
+            assert destination.getvalue() == b"Hello World"
+
+    def test_stream_file_rate_limited_not_retried(self):
+        with self._start_server([(429, b""), (200, b"Hello World")]) as url:
+            destination = BytesIO()
+
+            assert self._run(self.under_test.stream_file(url, destination)) is False
+            self.timer.sleep_async.assert_not_called()
+
+    def test_stream_file_connection_error_not_retried(self):
+        assert self._run(self.under_test.stream_file("http://127.0.0.1:1/file.png", BytesIO())) is False
+        self.timer.sleep_async.assert_not_called()
+
+    def test_stream_file_failed(self):
+        with self._start_server([(404, b"Not Found")]) as url:
+            destination = BytesIO()
+
+            assert self._run(self.under_test.stream_file(url, destination)) is False
+            assert destination.getvalue() == b""
+
+    def test_download_many_files_concurrently(self):
+        self.under_test.configure_pools(100, 5)
+        with self._start_server([(200, b"Hello World")] * 50) as url:
+            async def download_all():
+                return await asyncio.gather(*[self.under_test.download_file(url) for _ in range(50)])
+
+            assert self._run(download_all()) == [b"Hello World"] * 50
+
+    def test_session_timeouts(self):
+        async def get_timeout():
+            return (await self.under_test._get_session()).timeout
+
+        timeout = self._run(get_timeout())
+
+        assert timeout.sock_connect == AsyncHttpRequester.CONNECT_TIMEOUT
+        assert timeout.sock_read == AsyncHttpRequester.READ_TIMEOUT
+
+    def test_session_replaced_when_loop_changes(self):
+        with self._start_server([(200, b"Hello World")] * 2) as url:
+            async def download_and_get_session():
+                await self.under_test.download_file(url)
+                return self.under_test._session
+
+            first_session = asyncio.run(download_and_get_session())
+            second_session = self._run(download_and_get_session())
+
+            assert first_session.closed
+            assert second_session is not first_session
+
+    def _run(self, coroutine):
+        async def run_and_close():
+            try:
+                return await coroutine
+            finally:
+                await self.under_test.close()
+
+        return asyncio.run(run_and_close())
+
+    @staticmethod
+    @contextmanager
+    def _start_server(responses: List[Tuple[Any, ...]]) -> Iterator[str]:
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with lock:
+                    status, content, *headers = responses.pop(0)
+                self.send_response(status)
+                for key, value in (headers[0] if headers else {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *_):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            yield f"http://127.0.0.1:{server.server_port}/file"
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,73 @@
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock
+from zipfile import ZipFile
+
+import pytest
+
+from manga_dl.bundling.MangaBundler import MangaBundler
+from manga_dl.bundling.impl.ZipBundler import ZipBundler
+from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.test.testutils.TestDataFactory import TestDataFactory
+from manga_dl.util.BundleExecutor import BundleExecutor
+
+
+class TestBundleExecutor:
+
+    def setup_method(self):
+        self.root = Path(tempfile.gettempdir()) / "bundleexecutor"
+        if self.root.exists():
+            shutil.rmtree(self.root)
+        self.root.mkdir(parents=True)
+        self.series = TestDataFactory.build_series()
+        self.chapter = self.series.get_chapters()[0]
+        self.images = []
+        for page in self.chapter.pages:
+            page_file = self.root / page.get_filename()
+            page_file.write_bytes(b"Image")
+            self.images.append(DownloadedFile.from_path(page_file, page.get_filename()))
+
+    def test_submit_in_process(self):
+        bundler = Mock(MangaBundler)
+        on_success = Mock()
+
+        with BundleExecutor() as under_test:
+            under_test.submit(bundler, self.images, self.root / "out.zip", self.series, self.chapter, on_success)
+
+            bundler.bundle_atomically.assert_called_once_with(
+                self.images, self.root / "out.zip", self.series, self.chapter
+            )
+            on_success.assert_called_once()
+
+    def test_submit_in_process_error(self):
+        bundler = Mock(MangaBundler)
+        bundler.bundle_atomically.side_effect = ValueError()
+        on_success = Mock()
+
+        with pytest.raises(ValueError):
+            with BundleExecutor() as under_test:
+                under_test.submit(bundler, self.images, self.root / "out.zip", self.series, self.chapter, on_success)
+
+        on_success.assert_not_called()
+
+    def test_submit_to_worker_processes(self):
+        on_success = Mock()
+        self.chapter.page_loader = lambda: []
+
+        with BundleExecutor(2) as under_test:
+            for index in range(3):
+                under_test.submit(
+                    ZipBundler(), self.images, self.root / f"{index}.zip", self.series, self.chapter, on_success
+                )
+
+        assert on_success.call_count == 3
+        for index in range(3):
+            with ZipFile(self.root / f"{index}.zip") as zip_file:
+                assert zip_file.namelist() == [image.filename for image in self.images]
+
+    def test_submit_to_worker_processes_error(self):
+        with pytest.raises(FileNotFoundError):
+            with BundleExecutor(1) as under_test:
+                destination = self.root / "missing" / "out.zip"
+                under_test.submit(ZipBundler(), self.images, destination, self.series, self.chapter, Mock())
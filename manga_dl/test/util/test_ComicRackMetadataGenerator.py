@@ -41,6 +41,13 @@ class TestComicRackMetadataGenerator:
         metadata = fromstring(self.under_test.create_metadata(self.series, self.chapter, self.cover_file))
         self._assert_metadata(metadata)
 
+    def test_create_metadata_with_page_files(self):
+        page_files = [f"{i}.jpg" for i in range(len(self.chapter.pages))]
+
+        metadata = fromstring(self.under_test.create_metadata(self.series, self.chapter, None, page_files))
+
+        assert [page.get("Image") for page in metadata.find("Pages")] == page_files
+
     def _assert_metadata(self, metadata: etree):
         self._assert_series_metadata(metadata)
         self._assert_chapter_metadata(metadata)
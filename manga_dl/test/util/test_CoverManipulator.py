@@ -1,35 +1,41 @@
+import tempfile
+from io import BytesIO
+from pathlib import Path
 from unittest.mock import Mock, patch
 
-from PIL import ImageFont
+from PIL import ImageFont, Image as PILImage
 from PIL.Image import Image
 from PIL.ImageDraw import ImageDraw
 
 from manga_dl.util.CoverManipulator import CoverManipulator
+from manga_dl.util.ImageCache import ImageCache
 
 
 class TestCoverManipulator:
 
     def setup_method(self):
-        self._under_test = CoverManipulator()
+        self._image_cache = Mock(ImageCache)
+        self._image_cache.load_rendered_cover.return_value = None
+        self._under_test = CoverManipulator(self._image_cache)
 
-    @patch("manga_dl.util.CoverManipulator.ImageDraw.Draw")
-    @patch("manga_dl.util.CoverManipulator.Image.open")
+    @patch("PIL.ImageDraw.Draw")
+    @patch("PIL.Image.open")
     def test_add_chapter_box_square(self, open_image_mock: Mock, create_draw_mock: Mock):
         self._run_calculations(100, 100, "1", open_image_mock, create_draw_mock)
         self._run_calculations(100, 100, "Text", open_image_mock, create_draw_mock)
         self._run_calculations(100, 100, "Image", open_image_mock, create_draw_mock)
         self._run_calculations(100, 100, "This is a long text", open_image_mock, create_draw_mock)
 
-    @patch("manga_dl.util.CoverManipulator.ImageDraw.Draw")
-    @patch("manga_dl.util.CoverManipulator.Image.open")
+    @patch("PIL.ImageDraw.Draw")
+    @patch("PIL.Image.open")
     def test_add_chapter_box_square_horizontal_rectangle(self, open_image_mock: Mock, create_draw_mock: Mock):
         self._run_calculations(200, 100, "1", open_image_mock, create_draw_mock)
         self._run_calculations(200, 100, "Text", open_image_mock, create_draw_mock)
         self._run_calculations(200, 100, "Image", open_image_mock, create_draw_mock)
         self._run_calculations(200, 100, "This is a long text", open_image_mock, create_draw_mock)
 
-    @patch("manga_dl.util.CoverManipulator.ImageDraw.Draw")
-    @patch("manga_dl.util.CoverManipulator.Image.open")
+    @patch("PIL.ImageDraw.Draw")
+    @patch("PIL.Image.open")
     def test_add_chapter_box_square_vertical_rectangle(self, open_image_mock: Mock, create_draw_mock: Mock):
         self._run_calculations(100, 200, "1", open_image_mock, create_draw_mock)
         self._run_calculations(100, 200, "Text", open_image_mock, create_draw_mock)
@@ -43,15 +49,15 @@ class TestCoverManipulator:
         open_image_mock.return_value = image_mock
         create_draw_mock.return_value = draw_mock
 
-        self._under_test.add_chapter_box(b"", text)
+        self._under_test.add_chapter_box(text.encode(), text)
 
         max_text_width = int(width / 5)
         max_text_height = int(max_text_width / 2.5)
         box_padding = int(max_text_width / 5)
         fontsize = min(int(max_text_width / len(text)), max_text_height)
 
-        assert len(draw_mock.textsize.mock_calls) == max_text_width - fontsize + 2
-        assert draw_mock.textsize.mock_calls[-1].kwargs["font"].size == fontsize
+        assert len(draw_mock.textbbox.mock_calls) <= max_text_width.bit_length() + 1
+        assert draw_mock.textbbox.mock_calls[-1].kwargs["font"].size == fontsize
 
         expected_box_coords = (
             width - max_text_width - box_padding * 2,
@@ -69,18 +75,57 @@ class TestCoverManipulator:
         assert draw_mock.rounded_rectangle.call_args[0][0] == expected_box_coords
         assert draw_mock.text.call_args[0][0] == expected_text_coords
 
+    @patch("PIL.ImageDraw.Draw")
+    @patch("PIL.Image.open")
+    def test_add_chapter_box_reuses_decoded_cover(self, open_image_mock: Mock, create_draw_mock: Mock):
+        open_image_mock.return_value = self._create_image_mock(100, 100)
+        create_draw_mock.return_value = self._create_draw_mock()
+
+        self._under_test.add_chapter_box(b"Cover", "Ch. 1")
+        self._under_test.add_chapter_box(b"Cover", "Ch. 2")
+        self._under_test.add_chapter_box(b"Other", "Ch. 3")
+
+        assert open_image_mock.call_count == 2
+
+    @patch("PIL.Image.open")
+    def test_add_chapter_box_rendered_cache_hit(self, open_image_mock: Mock):
+        self._image_cache.load_rendered_cover.return_value = b"Rendered"
+
+        assert self._under_test.add_chapter_box(b"Cover", "Ch. 1") == b"Rendered"
+        open_image_mock.assert_not_called()
+        self._image_cache.store_rendered_cover.assert_not_called()
+
+    def test_add_chapter_box_rendered_and_cached(self):
+        image_cache = ImageCache()
+        image_cache.set_path(Path(tempfile.mkdtemp()))
+        under_test = CoverManipulator(image_cache)
+        cover = BytesIO()
+        PILImage.new("RGB", (300, 400), "white").save(cover, format="PNG")
+
+        rendered = under_test.add_chapter_box(cover.getvalue(), "Ch. 1")
+
+        assert rendered != cover.getvalue()
+        assert PILImage.open(BytesIO(rendered)).size == (300, 400)
+        assert CoverManipulator(image_cache).add_chapter_box(cover.getvalue(), "Ch. 1") == rendered
+        assert CoverManipulator(image_cache).add_chapter_box(cover.getvalue(), "Ch. 2") != rendered
+
+    def test_create_font_cached(self):
+        assert CoverManipulator._create_font(10) is CoverManipulator._create_font(10)
+        assert CoverManipulator._create_font(10).size == 10
+
     def _create_image_mock(self, width: int, height: int) -> Mock:
         image = Mock(Image)
         image.format = "jpeg"
         image.height = height
         image.width = width
         image.save.return_value = None
+        image.copy.return_value = image
         return image
 
     def _create_draw_mock(self) -> Mock:
-        def textsize(text: str, font: ImageFont):
-            return len(text) * font.size, font.size
+        def textbbox(_, text: str, font: ImageFont):
+            return 0, 0, len(text) * font.size, font.size
 
         draw = Mock(ImageDraw)
-        draw.textsize.side_effect = textsize
+        draw.textbbox.side_effect = textbbox
         return draw
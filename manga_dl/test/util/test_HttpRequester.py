@@ -1,10 +1,21 @@
 import json
-from typing import Dict, Any
+import tempfile
+import threading
+from contextlib import contextmanager
+from io import BytesIO
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
 from unittest.mock import patch, Mock
 
+import requests
 from requests import Response
 
 from manga_dl.util.HttpRequester import HttpRequester
+from manga_dl.util.NodeHealthTracker import NodeHealthTracker
+from manga_dl.util.RateLimiter import RateLimiter
+from manga_dl.util.RequestCounter import RequestCounter
+from manga_dl.util.ResponseCache import ResponseCache
 from manga_dl.util.Timer import Timer
 
 
@@ -12,11 +23,30 @@ class TestHttpRequester:
 
     def setup_method(self):
         self.timer = Mock(Timer)
-        self.timer.sleep.return_value = None
-        self.under_test = HttpRequester(self.timer)
+        self.now = {"monotonic": 0.0}
+        self.timer.sleep.side_effect = self._advance
+        self.timer.time.return_value = 1000
+        self.timer.monotonic.side_effect = lambda: self.now["monotonic"]
+        self.rate_limiter = RateLimiter(self.timer)
+        self.cache_path = Path(tempfile.gettempdir()) / "httprequester" / "responses.db"
+        if self.cache_path.exists():
+            self.cache_path.unlink()
+        self.response_cache = ResponseCache(self.timer)
+        self.response_cache.set_path(self.cache_path)
+        self.node_health = Mock(NodeHealthTracker)
+        self.request_counter = RequestCounter()
+        self.under_test = HttpRequester(
+            self.timer, self.rate_limiter, self.response_cache, self.node_health, self.request_counter
+        )
+
+    def teardown_method(self):
+        self.response_cache.close()
+
+    def _advance(self, seconds: float):
+        self.now["monotonic"] += seconds
 
     def test_get(self):
-        with patch("requests.get") as get:
+        with patch("requests.Session.get") as get:
             expected = {"hello": "world"}
             get.return_value = self._create_json_response(expected)
 
@@ -24,14 +54,14 @@ class TestHttpRequester:
             self.timer.sleep.assert_not_called()
 
     def test_get_failed(self):
-        with patch("requests.get") as get:
+        with patch("requests.Session.get") as get:
             get.return_value = self._create_json_response({}, 404)
 
             assert self.under_test.get_json("example.com") is None
             self.timer.sleep.assert_not_called()
 
     def test_get_rate_limited_retry_success(self):
-        with patch("requests.get") as get:
+        with patch("requests.Session.get") as get:
             expected = {"hello": "world"}
             get.side_effect = [self._create_json_response({}, 429), self._create_json_response(expected, 200)]
 
@@ -39,6 +69,50 @@ class TestHttpRequester:
             self.timer.sleep.called_with(60)
             self.timer.sleep.assert_called_once()
 
+    def test_get_rate_limited_retry_after_header(self):
+        with patch("requests.Session.get") as get:
+            get.side_effect = [self._create_json_response({}, 429, {"Retry-After": "2"}),
+                               self._create_json_response({}, 200)]
+
+            assert self.under_test.get_json("example.com", rate_limit_bucket="api") == {}
+            self.timer.sleep.assert_called_once_with(2)
+
+    def test_get_rate_limited_retry_after_timestamp_header(self):
+        with patch("requests.Session.get") as get:
+            get.side_effect = [self._create_json_response({}, 429, {"X-RateLimit-Retry-After": "1005"}),
+                               self._create_json_response({}, 200)]
+
+            assert self.under_test.get_json("example.com") == {}
+            self.timer.sleep.assert_called_once_with(5)
+
+    def test_get_uses_rate_limit_bucket(self):
+        self.rate_limiter = Mock(RateLimiter)
+        self.under_test = HttpRequester(
+            self.timer, self.rate_limiter, self.response_cache, self.node_health, self.request_counter
+        )
+
+        with patch("requests.Session.get") as get:
+            headers = {"X-RateLimit-Remaining": "3"}
+            get.return_value = self._create_json_response({}, 200, headers)
+
+            self.under_test.get_json("example.com", rate_limit_bucket="api")
+
+            self.rate_limiter.acquire.assert_called_once_with("api")
+            self.rate_limiter.update_from_headers.assert_called_once_with("api", headers)
+
+    def test_download_file_not_rate_limited(self):
+        self.rate_limiter = Mock(RateLimiter)
+        self.under_test = HttpRequester(
+            self.timer, self.rate_limiter, self.response_cache, self.node_health, self.request_counter
+        )
+
+        with patch("requests.Session.get") as get:
+            get.return_value = self._create_binary_response(b"")
+
+            self.under_test.download_file("example.com")
+
+            self.rate_limiter.acquire.assert_not_called()
+
     def test_get_connection_error_retry_success(self):
         counter = {"count": 0}
 
@@ -48,7 +122,7 @@ class TestHttpRequester:
                 raise ConnectionError()
             return self._create_json_response(expected, 200)
 
-        with patch("requests.get") as get:
+        with patch("requests.Session.get") as get:
             expected = {"hello": "world"}
             get.side_effect = get_mock
 
@@ -57,7 +131,7 @@ class TestHttpRequester:
             self.timer.sleep.assert_called_once()
 
     def test_get_rate_limited_retry_failure(self):
-        with patch("requests.get") as get:
+        with patch("requests.Session.get") as get:
             get.side_effect = [self._create_json_response({}, 429),
                                self._create_json_response({}, 429),
                                self._create_json_response({}, 200)]
@@ -66,8 +140,74 @@ class TestHttpRequester:
             self.timer.sleep.called_with(60)
             self.timer.sleep.called_once()
 
+    def test_get_cached(self):
+        with patch("requests.Session.get") as get:
+            get.return_value = self._create_json_response({"hello": "world"})
+
+            assert self.under_test.get_json("example.com", {"a": 1}, cache_ttl=60) == {"hello": "world"}
+            assert self.under_test.get_json("example.com", {"a": 1}, cache_ttl=60) == {"hello": "world"}
+            assert self.under_test.get_json("example.com", {"a": 2}, cache_ttl=60) == {"hello": "world"}
+
+            assert get.call_count == 2
+
+    def test_get_counts_sent_requests(self):
+        with patch("requests.Session.get") as get:
+            get.side_effect = [self._create_json_response({}, 429), self._create_json_response({"a": 1})]
+
+            self.under_test.get_json("example.com", cache_ttl=60, request_name="manga")
+            self.under_test.get_json("example.com", cache_ttl=60, request_name="manga")
+
+            assert self.request_counter.get_counts() == {"manga": 2}
+
+    def test_get_not_cached_without_ttl(self):
+        with patch("requests.Session.get") as get:
+            get.return_value = self._create_json_response({"hello": "world"})
+
+            self.under_test.get_json("example.com")
+            self.under_test.get_json("example.com")
+
+            assert get.call_count == 2
+            assert self.response_cache.get_size() == 0
+
+    def test_get_cached_revalidated(self):
+        with patch("requests.Session.get") as get:
+            get.side_effect = [
+                self._create_json_response({"hello": "world"}, 200, {"ETag": "abc", "Last-Modified": "yesterday"}),
+                self._create_json_response({}, 304)
+            ]
+
+            assert self.under_test.get_json("example.com", cache_ttl=60) == {"hello": "world"}
+            self.timer.time.return_value = 1100
+            assert self.under_test.get_json("example.com", cache_ttl=60) == {"hello": "world"}
+
+            get.assert_called_with(
+                "example.com", params={}, headers={"If-None-Match": "abc", "If-Modified-Since": "yesterday"},
+                timeout=(HttpRequester.CONNECT_TIMEOUT, HttpRequester.READ_TIMEOUT)
+            )
+            assert self.response_cache.get("example.com").stored_at == 1100
+
+    def test_get_cached_expired(self):
+        with patch("requests.Session.get") as get:
+            get.side_effect = [self._create_json_response({"a": 1}), self._create_json_response({"a": 2})]
+
+            assert self.under_test.get_json("example.com", cache_ttl=60) == {"a": 1}
+            self.timer.time.return_value = 1100
+            assert self.under_test.get_json("example.com", cache_ttl=60) == {"a": 2}
+
+    def test_get_offline(self):
+        with patch("requests.Session.get") as get:
+            get.return_value = self._create_json_response({"hello": "world"})
+            self.under_test.get_json("example.com", cache_ttl=60)
+            self.response_cache.set_offline(True)
+            self.timer.time.return_value = 100000
+
+            assert self.under_test.get_json("example.com", cache_ttl=60) == {"hello": "world"}
+            assert self.under_test.get_json("example.org", cache_ttl=60) is None
+            assert self.under_test.get_json("example.com") is None
+            get.assert_called_once()
+
     def test_download_file(self):
-        with patch("requests.get") as get:
+        with patch("requests.Session.get") as get:
             expected = b"Hello World"
             get.return_value = self._create_binary_response(expected)
 
@@ -75,14 +215,14 @@ class TestHttpRequester:
             self.timer.sleep.assert_not_called()
 
     def test_download_file_failed(self):
-        with patch("requests.get") as get:
+        with patch("requests.Session.get") as get:
             get.return_value = self._create_binary_response(b"", 404)
 
             assert self.under_test.download_file("example.com") is None
             self.timer.sleep.assert_not_called()
 
     def test_download_file_retry_success(self):
-        with patch("requests.get") as get:
+        with patch("requests.Session.get") as get:
             expected = b"Hello World"
             get.side_effect = [self._create_binary_response(b"", 429),
                                self._create_binary_response(expected, 200)]
@@ -92,7 +232,7 @@ class TestHttpRequester:
             self.timer.sleep.called_once()
 
     def test_download_file_retry_failed(self):
-        with patch("requests.get") as get:
+        with patch("requests.Session.get") as get:
             get.side_effect = [self._create_binary_response(b"", 429),
                                self._create_binary_response(b"", 429),
                                self._create_binary_response(b"", 200)]
@@ -101,10 +241,126 @@ class TestHttpRequester:
             self.timer.sleep.called_with(60)
             self.timer.sleep.called_once()
 
+    def test_stream_file(self):
+        with self._start_server() as server:
+            destination = BytesIO()
+
+            url = f"http://127.0.0.1:{server.server_port}/file.png"
+            assert self.under_test.stream_file(url, destination)
+            assert destination.getvalue() == b"Hello World"
+            self.node_health.record.assert_called_once_with(url, True, 0, len(b"Hello World"), False)
+
+    def test_stream_file_failed(self):
+        with patch("requests.Session.get") as get:
+            get.return_value = self._create_binary_response(b"", 404)
+            destination = BytesIO()
+
+            assert self.under_test.stream_file("example.com", destination) is False
+            assert destination.getvalue() == b""
+            self.node_health.record.assert_called_once_with("example.com", False, 0, 0, False)
+
+    def test_stream_file_connection_error(self):
+        with patch("requests.Session.get") as get:
+            get.side_effect = requests.ConnectTimeout("node unreachable")
+
+            assert self.under_test.stream_file("example.com", BytesIO()) is False
+            get.assert_called_once()
+            self.timer.sleep.assert_not_called()
+            self.node_health.record.assert_called_once_with("example.com", False, 0, 0, False)
+
+    def test_stream_file_interrupted(self):
+        with patch("requests.Session.get") as get:
+            response = self._create_binary_response(b"", 200)
+            response.iter_content = Mock(side_effect=requests.ReadTimeout("stalled"))
+            get.return_value = response
+
+            assert self.under_test.stream_file("example.com", BytesIO()) is False
+            self.node_health.record.assert_called_once_with("example.com", False, 0, 0, False)
+
+    def test_post_json(self):
+        with patch("requests.Session.post") as post:
+            post.return_value = self._create_json_response({}, 200)
+
+            assert self.under_test.post_json("example.com", {"hello": "world"})
+            post.assert_called_once_with(
+                "example.com", json={"hello": "world"},
+                timeout=(HttpRequester.CONNECT_TIMEOUT, HttpRequester.READ_TIMEOUT)
+            )
+
+    def test_post_json_rate_limited_not_retried(self):
+        with patch("requests.Session.post") as post:
+            post.return_value = self._create_json_response({}, 429)
+
+            assert self.under_test.post_json("example.com", {"hello": "world"}) is False
+            post.assert_called_once()
+            self.timer.sleep.assert_not_called()
+
+    def test_connections_are_reused(self):
+        with self._start_server() as server:
+            url = f"http://127.0.0.1:{server.server_port}/file.png"
+            for _ in range(5):
+                assert self.under_test.download_file(url) == b"Hello World"
+
+        assert self.under_test.get_opened_connection_count() == 1
+        assert self.under_test.get_reused_connection_count() == 4
+
+    def test_connections_are_shared_between_threads(self):
+        self.under_test.configure_pools(1, 2)
+
+        with self._start_server() as server:
+            url = f"http://127.0.0.1:{server.server_port}/file.png"
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(self.under_test.download_file(url)))
+                for _ in range(10)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert results == [b"Hello World"] * 10
+        assert self.under_test.get_opened_connection_count() <= 2
+        assert self.under_test.get_reused_connection_count() >= 8
+
+    def test_close(self):
+        with self._start_server() as server:
+            self.under_test.download_file(f"http://127.0.0.1:{server.server_port}/file.png")
+
+        self.under_test.close()
+
+        assert self.under_test.get_opened_connection_count() == 0
+
+    @staticmethod
+    @contextmanager
+    def _start_server() -> Iterator[ThreadingHTTPServer]:
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "11")
+                self.end_headers()
+                self.wfile.write(b"Hello World")
+
+            def log_message(self, *_):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            yield server
+        finally:
+            server.shutdown()
+            server.server_close()
+
     @staticmethod
-    def _create_json_response(content: Dict[str, Any], status_code: int = 200) -> Response:
+    def _create_json_response(
+            content: Dict[str, Any], status_code: int = 200, headers: Optional[Dict[str, str]] = None
+    ) -> Response:
         response = Mock(Response)
         response.status_code = status_code
+        response.headers = {} if headers is None else headers
         response.text = json.dumps(content)
         return response
 
@@ -112,5 +368,6 @@ class TestHttpRequester:
     def _create_binary_response(content: bytes, status_code: int = 200) -> Response:
         response = Mock(Response)
         response.status_code = status_code
+        response.headers = {}
         response.content = content
         return response
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import patch
+
+from manga_dl.model.ImageQuality import ImageQuality
+from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaPage import MangaPage
+from manga_dl.util.ImageCache import ImageCache
+
+
+class TestImageCache:
+
+    def setup_method(self):
+        self.root = Path(tempfile.gettempdir()) / "imagecache"
+        if self.root.exists():
+            shutil.rmtree(self.root)
+        self.source = self.root / "source.png"
+        self.source.parent.mkdir(parents=True)
+        self.source.write_bytes(b"Image")
+        self.under_test = ImageCache()
+        self.under_test.set_path(self.root / "cache")
+
+    def test_store_and_fetch_page(self):
+        destination = self.root / "destination.png"
+
+        assert self.under_test.fetch_page("hash", "1.png", destination) is False
+
+        self.under_test.store_page("hash", "1.png", self.source)
+
+        assert self.under_test.fetch_page("hash", "1.png", destination) is True
+        assert destination.read_bytes() == b"Image"
+        assert self.under_test.get_page_path("hash", "1.png").read_bytes() == b"Image"
+
+    def test_restore_pages(self):
+        pages = [MangaPage("example.com/data/hash/1.png", 1)]
+        chapter = MangaChapter("A", Decimal(1), pages=pages, id="abc", updated_at=datetime(2022, 1, 1),
+                               content_hash="hash")
+        self.under_test.save_manifest(chapter)
+        lazy_chapter = MangaChapter("A", Decimal(1), id="abc", updated_at=datetime(2022, 1, 1))
+
+        assert self.under_test.restore_pages(lazy_chapter) is False
+
+        self.under_test.store_page("hash", "1.png", self.source)
+
+        assert self.under_test.restore_pages(lazy_chapter) is True
+        assert lazy_chapter.pages == pages
+        assert lazy_chapter.content_hash == "hash"
+
+    def test_restore_pages_of_reuploaded_chapter(self):
+        chapter = MangaChapter("A", Decimal(1), pages=[MangaPage("example.com/data/hash/1.png", 1)], id="abc",
+                               updated_at=datetime(2022, 1, 1), content_hash="hash")
+        self.under_test.save_manifest(chapter)
+        self.under_test.store_page("hash", "1.png", self.source)
+
+        reuploaded = MangaChapter("A", Decimal(1), id="abc", updated_at=datetime(2022, 2, 1))
+
+        assert self.under_test.restore_pages(reuploaded) is False
+        assert reuploaded.pages == []
+
+    def test_restore_pages_per_image_quality(self):
+        chapter = MangaChapter("A", Decimal(1), pages=[MangaPage("example.com/data/hash/1.png", 1)], id="abc",
+                               updated_at=datetime(2022, 1, 1), content_hash="hash")
+        self.under_test.save_manifest(chapter)
+        self.under_test.store_page("hash", "1.png", self.source)
+
+        data_saver = MangaChapter("A", Decimal(1), id="abc", updated_at=datetime(2022, 1, 1),
+                                  image_quality=ImageQuality.DATA_SAVER)
+
+        assert self.under_test.restore_pages(data_saver) is False
+        assert data_saver.pages == []
+
+    def test_evict_least_recently_used(self):
+        self.under_test.set_max_size(10)
+        for index, filename in enumerate(["1.png", "2.png", "3.png"]):
+            source = self.root / filename
+            source.write_bytes(b"Image")
+            self.under_test.store_page("hash", filename, source)
+            os.utime(self.under_test.get_page_path("hash", filename), (index, index))
+        self.under_test.fetch_page("hash", "1.png", self.root / "destination.png")
+
+        self.under_test.evict()
+
+        assert self.under_test.get_page_path("hash", "1.png").is_file()
+        assert not self.under_test.get_page_path("hash", "2.png").exists()
+        assert self.under_test.get_page_path("hash", "3.png").is_file()
+
+    def test_evict_scans_cache_once_while_under_limit(self):
+        self.under_test.set_max_size(10)
+        self.under_test.store_page("hash", "1.png", self.source)
+        self.under_test.evict()
+
+        with patch.object(Path, "glob") as glob:
+            self.under_test.evict()
+            self.under_test.store_page("hash", "2.png", self.source)
+            self.under_test.evict()
+
+        glob.assert_not_called()
+
+    def test_evict_tracks_stored_size(self):
+        self.under_test.set_max_size(10)
+        self.under_test.evict()
+        for index, filename in enumerate(["1.png", "2.png", "3.png"]):
+            source = self.root / filename
+            source.write_bytes(b"Image")
+            self.under_test.store_page("hash", filename, source)
+            os.utime(self.under_test.get_page_path("hash", filename), (index, index))
+
+        self.under_test.evict()
+
+        assert not self.under_test.get_page_path("hash", "1.png").exists()
+        assert self.under_test.get_page_path("hash", "2.png").is_file()
+        assert self.under_test.get_page_path("hash", "3.png").is_file()
+
+    def test_store_and_load_cover(self):
+        assert self.under_test.load_cover("series", "cover.png") is None
+
+        self.under_test.store_cover("series", "cover.png", b"Cover")
+
+        assert self.under_test.load_cover("series", "cover.png") == b"Cover"
+        assert self.under_test.load_cover("other", "cover.png") is None
+
+    def test_store_and_load_rendered_cover(self):
+        assert self.under_test.load_rendered_cover("hash", "Ch. 1/2") is None
+
+        self.under_test.store_rendered_cover("hash", "Ch. 1/2", b"Rendered")
+
+        assert self.under_test.load_rendered_cover("hash", "Ch. 1/2") == b"Rendered"
+        assert self.under_test.load_rendered_cover("hash", "Ch. 1") is None
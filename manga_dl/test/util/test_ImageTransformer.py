@@ -0,0 +1,94 @@
+import shutil
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import Mock
+
+from PIL import Image
+
+from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.model.ImageFormat import ImageFormat
+from manga_dl.model.ImageTransform import ImageTransform
+from manga_dl.util.ImageTransformer import ImageTransformer
+from manga_dl.util.Timer import Timer
+
+
+class TestImageTransformer:
+
+    def setup_method(self):
+        self.staging_dir = Path(tempfile.gettempdir()) / "imagetransformer"
+        if self.staging_dir.exists():
+            shutil.rmtree(self.staging_dir)
+        self.staging_dir.mkdir(parents=True)
+        self.timer = Mock(Timer)
+        self.timer.monotonic.return_value = 0
+        self.under_test = ImageTransformer(self.timer)
+        self.under_test.set_processes(0)
+
+    def teardown_method(self):
+        self.under_test.close()
+
+    def _create_page(self, filename: str) -> DownloadedFile:
+        path = self.staging_dir / filename
+        Image.new("RGBA", (100, 200), (255, 0, 0, 255)).save(path, format="PNG")
+        return DownloadedFile.from_path(path, filename)
+
+    def test_is_enabled(self):
+        assert not self.under_test.is_enabled()
+
+        self.under_test.set_transform(ImageTransform(grayscale=True))
+
+        assert self.under_test.is_enabled()
+
+    def test_transform_chapter(self):
+        self.under_test.set_transform(ImageTransform(100, ImageFormat.JPEG, 80, True))
+
+        result = self.under_test.transform_chapter([self._create_page("1.png")], self.staging_dir, "chapter 1")
+
+        assert [image.filename for image in result] == ["1.jpg"]
+        with Image.open(result[0].path) as image:
+            assert image.format == "JPEG"
+            assert image.size == (50, 100)
+            assert image.mode == "L"
+
+    def test_transform_chapter_keeps_format(self):
+        self.under_test.set_transform(ImageTransform(max_height=400))
+
+        result = self.under_test.transform_chapter([self._create_page("1.png")], self.staging_dir, "chapter 1")
+
+        assert [image.filename for image in result] == ["1.png"]
+        with Image.open(result[0].path) as image:
+            assert image.format == "PNG"
+            assert image.size == (100, 200)
+
+    def test_transform_chapter_keeps_undecodable_pages(self):
+        self.under_test.set_transform(ImageTransform(image_format=ImageFormat.WEBP))
+        missing = self.staging_dir / "2.png"
+        missing.write_bytes(b"Missing")
+
+        result = self.under_test.transform_chapter(
+            [DownloadedFile.from_path(missing, "2.png"), DownloadedFile(self._encode_page(), "3.png")],
+            self.staging_dir, "chapter 1"
+        )
+
+        assert result[0] == DownloadedFile.from_path(missing, "2.png")
+        assert result[1].filename == "3.webp"
+
+    def test_transform_chapter_in_processes(self):
+        self.under_test.set_processes(2)
+        self.under_test.set_transform(ImageTransform(100, ImageFormat.WEBP))
+
+        result = self.under_test.transform_chapter(
+            [self._create_page(f"{i}.png") for i in range(4)], self.staging_dir, "chapter 1"
+        )
+
+        assert [image.filename for image in result] == [f"{i}.webp" for i in range(4)]
+        for image in result:
+            with Image.open(image.path) as opened:
+                assert opened.size == (50, 100)
+
+    @staticmethod
+    def _encode_page() -> bytes:
+        encoded = BytesIO()
+        Image.new("RGB", (10, 20)).save(encoded, format="PNG")
+        return encoded.getvalue()
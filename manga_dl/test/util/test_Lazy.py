@@ -0,0 +1,38 @@
+import threading
+from unittest.mock import Mock
+
+from manga_dl.util.Lazy import Lazy
+
+
+class TestLazy:
+
+    def test_get_loads_once(self):
+        loader = Mock(return_value="value")
+        under_test = Lazy(loader)
+
+        loader.assert_not_called()
+        assert under_test.get() == "value"
+        assert under_test.get() == "value"
+        loader.assert_called_once()
+
+    def test_get_caches_none(self):
+        loader = Mock(return_value=None)
+        under_test = Lazy(loader)
+
+        assert under_test.get() is None
+        assert under_test.get() is None
+        loader.assert_called_once()
+
+    def test_get_concurrently(self):
+        loader = Mock(return_value="value")
+        under_test = Lazy(loader)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(under_test.get())) for _ in range(10)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["value"] * 10
+        loader.assert_called_once()
@@ -1,8 +1,34 @@
+from typing import List
+
+from manga_dl.bundling.MangaBundler import MangaBundler
 from manga_dl.cli.MangaDLCli import MangaDLCli
+from manga_dl.download.MangaDownloader import MangaDownloader
+from manga_dl.scraping.ScrapingService import ScrapingService
+from manga_dl.util.HttpRequester import HttpRequester
 from manga_dl.util.MangaDLDependencyInjector import MangaDLDependencyInjector
+from manga_dl.util.Timer import Timer
 
 
 class TestMangaDLDependencyInjector:
+
+    def teardown_method(self):
+        MangaDLDependencyInjector.reset()
+
     def test_get(self):
         cli = MangaDLDependencyInjector.get(MangaDLCli)
         assert isinstance(cli, MangaDLCli)
+
+    def test_get_reuses_container(self):
+        assert MangaDLDependencyInjector.get_injector() is MangaDLDependencyInjector.get_injector()
+
+        MangaDLDependencyInjector.reset()
+
+        assert MangaDLDependencyInjector.get(Timer) is not None
+
+    def test_network_components_are_shared(self):
+        downloader = MangaDLDependencyInjector.get(MangaDownloader)
+        scraper = MangaDLDependencyInjector.get(ScrapingService)
+
+        assert downloader.requester is MangaDLDependencyInjector.get(HttpRequester)
+        assert scraper.scraping_methods[0].mangadex_api.http_requester is downloader.requester
+        assert MangaDLDependencyInjector.get(List[MangaBundler]) is downloader.bundlers
@@ -0,0 +1,65 @@
+from unittest.mock import Mock
+
+from manga_dl.util.NodeHealthTracker import NodeHealthTracker
+from manga_dl.util.Timer import Timer
+
+
+class TestNodeHealthTracker:
+
+    def setup_method(self):
+        self.url = "https://node.example.com:443/token/data/hash/1.png"
+        self.timer = Mock(Timer)
+        self.timer.monotonic.return_value = 100
+        self.under_test = NodeHealthTracker(self.timer)
+
+    def test_record(self):
+        self.under_test.record(self.url, True, 0.5, 100, False)
+        self.under_test.record(self.url, False, 1.5, 0, False)
+
+        stats = self.under_test.get_stats()[0]
+        assert stats.node == "node.example.com:443"
+        assert stats.requests == 2
+        assert stats.failures == 1
+        assert stats.downloaded_bytes == 100
+        assert stats.latency == 0.5 + (1.5 - 0.5) * NodeHealthTracker.LATENCY_SMOOTHING
+        assert not self.under_test.is_degraded(self.url)
+
+    def test_degrade_after_consecutive_failures(self):
+        for _ in range(NodeHealthTracker.FAILURE_THRESHOLD):
+            self.under_test.record(self.url, False, 1, 0, False)
+
+        assert self.under_test.is_degraded(self.url)
+        assert not self.under_test.is_degraded("https://other.example.com/data/hash/1.png")
+
+        self.timer.monotonic.return_value = 100 + NodeHealthTracker.COOLDOWN
+        assert not self.under_test.is_degraded(self.url)
+
+    def test_success_resets_failures(self):
+        for _ in range(NodeHealthTracker.FAILURE_THRESHOLD * 2):
+            self.under_test.record(self.url, False, 1, 0, False)
+            self.under_test.record(self.url, True, 1, 0, False)
+
+        assert not self.under_test.is_degraded(self.url)
+
+    def test_degrade_when_slow(self):
+        for _ in range(NodeHealthTracker.MIN_SAMPLES):
+            self.under_test.record(self.url, True, NodeHealthTracker.SLOW_THRESHOLD * 2, 100, False)
+
+        assert self.under_test.is_degraded(self.url)
+
+    def test_reporting(self):
+        reporter = Mock()
+        self.under_test.add_reporter(reporter)
+
+        self.under_test.record(self.url, True, 0.5, 100, True)
+        reporter.assert_not_called()
+
+        self.under_test.set_reporting(True)
+        self.under_test.record(self.url, True, 0.5, 100, True)
+        reporter.assert_called_once_with(self.url, True, 0.5, 100, True)
+
+    def test_format_stats(self):
+        self.under_test.record(self.url, True, 0.5, 100, False)
+        self.under_test.record("https://other.example.com/1.png", False, 0.25, 0, False)
+
+        assert self.under_test.format_stats() == "node.example.com:443=1/1 (500 ms), other.example.com=0/1 (250 ms)"
@@ -0,0 +1,47 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from manga_dl.util.PageJournal import PageJournal
+
+
+class TestPageJournal:
+
+    def setup_method(self):
+        self.staging_dir = Path(tempfile.gettempdir()) / "pagejournal"
+        if self.staging_dir.exists():
+            shutil.rmtree(self.staging_dir)
+
+    def test_mark_complete(self):
+        under_test = PageJournal(self.staging_dir, "hash")
+        (self.staging_dir / "1.png").write_bytes(b"Image")
+
+        assert under_test.is_complete("1.png") is False
+
+        under_test.mark_complete("1.png")
+
+        assert under_test.is_complete("1.png") is True
+
+    def test_resume(self):
+        PageJournal(self.staging_dir, "hash").mark_complete("1.png")
+        (self.staging_dir / "1.png").write_bytes(b"Image")
+
+        under_test = PageJournal(self.staging_dir, "hash")
+
+        assert under_test.is_complete("1.png") is True
+        assert under_test.get_completed_count() == 1
+
+    def test_resume_missing_file(self):
+        PageJournal(self.staging_dir, "hash").mark_complete("1.png")
+
+        assert PageJournal(self.staging_dir, "hash").is_complete("1.png") is False
+
+    def test_resume_changed_chapter(self):
+        PageJournal(self.staging_dir, "hash").mark_complete("1.png")
+        (self.staging_dir / "1.png").write_bytes(b"Image")
+
+        under_test = PageJournal(self.staging_dir, "other")
+
+        assert under_test.is_complete("1.png") is False
+        assert under_test.get_completed_count() == 0
+        assert PageJournal(self.staging_dir, "hash").get_completed_count() == 0
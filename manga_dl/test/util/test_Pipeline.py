@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from manga_dl.util.Pipeline import Pipeline
+
+
+class TestPipeline:
+
+    def test_run(self):
+        results = []
+        under_test = Pipeline([lambda x: x * 2, lambda x: x + 1, results.append])
+
+        under_test.run(range(5))
+
+        assert results == [1, 3, 5, 7, 9]
+
+    def test_run_stages_overlap(self):
+        events = []
+        second_started = threading.Event()
+
+        def first_stage(item: int) -> int:
+            if item == 1:
+                second_started.wait(1)
+            events.append(("first", item))
+            return item
+
+        def second_stage(item: int):
+            second_started.set()
+            time.sleep(0.05)
+            events.append(("second", item))
+
+        Pipeline([first_stage, second_stage]).run([0, 1])
+
+        assert events.index(("first", 1)) < events.index(("second", 0))
+
+    def test_run_bounded_queue(self):
+        produced = []
+        release = threading.Event()
+
+        def slow_stage(_: int):
+            release.wait(1)
+
+        def items():
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        thread = threading.Thread(target=lambda: Pipeline([lambda x: x, slow_stage], 1).run(items()))
+        thread.start()
+        time.sleep(0.1)
+        produced_while_blocked = len(produced)
+        release.set()
+        thread.join()
+
+        assert produced_while_blocked <= 5
+        assert len(produced) == 10
+
+    def test_run_error(self):
+        processed = []
+
+        def failing_stage(item: int):
+            if item == 2:
+                raise ValueError("Failed")
+            processed.append(item)
+
+        with pytest.raises(ValueError):
+            Pipeline([lambda x: x, failing_stage]).run(range(100))
+
+        assert 2 not in processed
+        assert len(processed) < 100
@@ -0,0 +1,51 @@
+from importlib import metadata
+from pathlib import Path
+from typing import List
+from unittest.mock import patch, Mock
+
+from manga_dl.bundling.MangaBundler import MangaBundler
+from manga_dl.bundling.impl.ZipBundler import ZipBundler
+from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaFileFormat import MangaFileFormat
+from manga_dl.model.MangaSeries import MangaSeries
+from manga_dl.util.PluginRegistry import PluginRegistry
+
+
+class PluginBundler(ZipBundler):
+
+    def get_file_format(self) -> MangaFileFormat:  # pragma: no cover
+        return MangaFileFormat.ZIP
+
+    def bundle(self, _: List[DownloadedFile], __: Path, ___: MangaSeries, ____: MangaChapter):  # pragma: no cover
+        pass
+
+
+class TestPluginRegistry:
+
+    def setup_method(self):
+        PluginRegistry.reset()
+
+    def teardown_method(self):
+        PluginRegistry.reset()
+
+    def test_get_plugins(self):
+        plugins = PluginRegistry.get_plugins(MangaBundler, "manga_dl.bundling.impl", PluginRegistry.BUNDLERS_GROUP)
+
+        assert ZipBundler in plugins
+        assert PluginBundler not in plugins
+
+    def test_get_plugins_from_entry_points(self):
+        entry_point = Mock(metadata.EntryPoint)
+        entry_point.load.return_value = PluginBundler
+        broken_entry_point = Mock(metadata.EntryPoint)
+        broken_entry_point.name = "broken"
+        broken_entry_point.load.side_effect = ImportError()
+
+        with patch("importlib.metadata.entry_points", return_value=[entry_point, broken_entry_point]) as entry_points:
+            plugins = PluginRegistry.get_plugins(MangaBundler, "manga_dl.bundling.impl", PluginRegistry.BUNDLERS_GROUP)
+            PluginRegistry.get_plugins(MangaBundler, "manga_dl.bundling.impl", PluginRegistry.BUNDLERS_GROUP)
+
+        assert PluginBundler in plugins
+        assert ZipBundler in plugins
+        entry_points.assert_called_once_with(group=PluginRegistry.BUNDLERS_GROUP)
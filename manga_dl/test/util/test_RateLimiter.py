@@ -0,0 +1,114 @@
+import asyncio
+from unittest.mock import Mock, AsyncMock
+
+from manga_dl.util.RateLimiter import RateLimiter
+from manga_dl.util.Timer import Timer
+
+
+class TestRateLimiter:
+
+    def setup_method(self):
+        self.now = {"monotonic": 0.0, "time": 1000.0}
+        self.timer = Mock(Timer)
+        self.timer.monotonic.side_effect = lambda: self.now["monotonic"]
+        self.timer.time.side_effect = lambda: self.now["time"]
+        self.timer.sleep.side_effect = self._advance
+        self.timer.sleep_async = AsyncMock(side_effect=self._advance)
+        self.under_test = RateLimiter(self.timer)
+
+    def _advance(self, seconds: float):
+        self.now["monotonic"] += seconds
+        self.now["time"] += seconds
+
+    def test_acquire_burst_then_rate(self):
+        self.under_test.configure_bucket("api", rate=2, capacity=3)
+
+        for _ in range(3):
+            self.under_test.acquire("api")
+        self.timer.sleep.assert_not_called()
+
+        self.under_test.acquire("api")
+        self.timer.sleep.assert_called_once_with(0.5)
+
+    def test_acquire_refills(self):
+        self.under_test.configure_bucket("api", rate=1, capacity=1)
+        self.under_test.acquire("api")
+        self._advance(1)
+
+        self.under_test.acquire("api")
+
+        self.timer.sleep.assert_not_called()
+
+    def test_buckets_are_separate(self):
+        self.under_test.configure_bucket("api", rate=1, capacity=1)
+        self.under_test.configure_bucket("at-home", rate=1, capacity=1)
+
+        self.under_test.acquire("api")
+        self.under_test.acquire("at-home")
+
+        self.timer.sleep.assert_not_called()
+
+    def test_unconfigured_bucket_uses_defaults(self):
+        for _ in range(int(RateLimiter.DEFAULT_CAPACITY)):
+            self.under_test.acquire("unknown")
+        self.timer.sleep.assert_not_called()
+
+        self.under_test.acquire("unknown")
+        self.timer.sleep.assert_called_once()
+
+    def test_remaining_header_limits_tokens(self):
+        self.under_test.configure_bucket("api", rate=1, capacity=5)
+        self.under_test.update_from_headers("api", {"X-RateLimit-Remaining": "1"})
+
+        self.under_test.acquire("api")
+        self.timer.sleep.assert_not_called()
+        self.under_test.acquire("api")
+        self.timer.sleep.assert_called_once_with(1)
+
+    def test_exhausted_limit_blocks_until_retry_after_timestamp(self):
+        self.under_test.configure_bucket("api", rate=5, capacity=5)
+        self.under_test.update_from_headers("api", {"X-RateLimit-Remaining": "0", "X-RateLimit-Retry-After": "1010"})
+
+        self.under_test.acquire("api")
+
+        self.timer.sleep.assert_any_call(10)
+
+    def test_retry_after_header_blocks(self):
+        self.under_test.configure_bucket("api", rate=5, capacity=5)
+        self.under_test.update_from_headers("api", {"Retry-After": "3"})
+
+        self.under_test.acquire("api")
+
+        self.timer.sleep.assert_called_once_with(3)
+
+    def test_block(self):
+        self.under_test.configure_bucket("api", rate=5, capacity=5)
+        self.under_test.block("api", 4)
+
+        self.under_test.acquire("api")
+        self.under_test.acquire("api")
+
+        self.timer.sleep.assert_called_once_with(4)
+
+    def test_retry_after_ignored_when_requests_remain(self):
+        self.under_test.configure_bucket("api", rate=5, capacity=5)
+        self.under_test.update_from_headers("api", {"X-RateLimit-Remaining": "4", "X-RateLimit-Retry-After": "1010"})
+
+        self.under_test.acquire("api")
+
+        self.timer.sleep.assert_not_called()
+
+    def test_get_retry_delay(self):
+        assert self.under_test.get_retry_delay({}) is None
+        assert self.under_test.get_retry_delay({"Retry-After": "5"}) == 5
+        assert self.under_test.get_retry_delay({"Retry-After": "invalid"}) is None
+        assert self.under_test.get_retry_delay({"X-RateLimit-Retry-After": "1002"}) == 2
+        assert self.under_test.get_retry_delay({"X-RateLimit-Retry-After": "900"}) == 0
+
+    def test_acquire_async(self):
+        self.under_test.configure_bucket("api", rate=2, capacity=1)
+
+        asyncio.run(self.under_test.acquire_async("api"))
+        asyncio.run(self.under_test.acquire_async("api"))
+
+        self.timer.sleep_async.assert_awaited_once_with(0.5)
@@ -0,0 +1,37 @@
+import threading
+
+from manga_dl.util.RequestCounter import RequestCounter
+
+
+class TestRequestCounter:
+
+    def setup_method(self):
+        self.under_test = RequestCounter()
+
+    def test_increment(self):
+        self.under_test.increment("manga")
+        self.under_test.increment("chapter")
+        self.under_test.increment("chapter")
+
+        assert self.under_test.get_counts() == {"manga": 1, "chapter": 2}
+        assert self.under_test.get_total() == 3
+        assert self.under_test.format_counts() == "chapter=2, manga=1"
+
+    def test_increment_concurrently(self):
+        threads = [
+            threading.Thread(target=lambda: [self.under_test.increment("cover") for _ in range(100)])
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert self.under_test.get_counts() == {"cover": 1000}
+
+    def test_reset(self):
+        self.under_test.increment("manga")
+        self.under_test.reset()
+
+        assert self.under_test.get_counts() == {}
+        assert self.under_test.format_counts() == ""
@@ -0,0 +1,64 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock
+
+from manga_dl.model.CachedResponse import CachedResponse
+from manga_dl.util.ResponseCache import ResponseCache
+from manga_dl.util.Timer import Timer
+
+
+class TestResponseCache:
+
+    def setup_method(self):
+        self.timer = Mock(Timer)
+        self.timer.time.return_value = 1000
+        self.path = Path(tempfile.gettempdir()) / "responsecache" / "responses.db"
+        if self.path.exists():
+            self.path.unlink()
+        self.under_test = ResponseCache(self.timer)
+        self.under_test.set_path(self.path)
+
+    def teardown_method(self):
+        self.under_test.close()
+
+    def test_get_key(self):
+        assert ResponseCache.get_key("example.com", {}) == "example.com"
+        assert ResponseCache.get_key("example.com", {"b": 1, "a[]": ["x", "y"]}) == \
+            "example.com?a%5B%5D=x&a%5B%5D=y&b=1"
+
+    def test_put_and_get(self):
+        assert self.under_test.get("key") is None
+
+        self.under_test.put("key", "{}", "etag", "yesterday")
+
+        assert self.under_test.get("key") == CachedResponse("{}", "etag", "yesterday", 1000)
+
+    def test_refresh(self):
+        self.under_test.put("key", "{}", None, None)
+        self.timer.time.return_value = 2000
+
+        self.under_test.refresh("key")
+
+        assert self.under_test.get("key").stored_at == 2000
+
+    def test_evict_least_recently_used(self):
+        self.under_test.set_max_size(10)
+        self.under_test.put("a", "1234", None, None)
+        self.timer.time.return_value = 1001
+        self.under_test.put("b", "1234", None, None)
+        self.timer.time.return_value = 1002
+        self.under_test.get("a")
+        self.timer.time.return_value = 1003
+
+        self.under_test.put("c", "1234", None, None)
+
+        assert self.under_test.get("a") is not None
+        assert self.under_test.get("b") is None
+        assert self.under_test.get("c") is not None
+        assert self.under_test.get_size() == 8
+
+    def test_cached_response(self):
+        assert CachedResponse("{}", stored_at=1000).is_fresh(1050, 60) is True
+        assert CachedResponse("{}", stored_at=1000).is_fresh(1060, 60) is False
+        assert CachedResponse("{}").get_validation_headers() == {}
+        assert CachedResponse("{}", "abc").get_validation_headers() == {"If-None-Match": "abc"}
@@ -0,0 +1,60 @@
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+from manga_dl.model.ChapterState import ChapterState
+from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.util.SyncStateStore import SyncStateStore
+
+
+class TestSyncStateStore:
+
+    def setup_method(self):
+        self.path = Path(tempfile.gettempdir()) / "syncstatestore" / "state.db"
+        if self.path.exists():
+            self.path.unlink()
+        self.under_test = SyncStateStore()
+        self.under_test.set_path(self.path)
+
+    def teardown_method(self):
+        self.under_test.close()
+
+    def test_last_sync(self):
+        assert self.under_test.get_last_sync("123") is None
+
+        self.under_test.set_last_sync("123", datetime(2022, 1, 1))
+        self.under_test.set_last_sync("123", datetime(2022, 2, 1))
+
+        assert self.under_test.get_last_sync("123") == datetime(2022, 2, 1)
+        assert self.under_test.get_last_sync("456") is None
+
+    def test_chapter_state(self):
+        chapter = MangaChapter("A", Decimal(1), id="abc", updated_at=datetime(2022, 1, 1), content_hash="hash")
+
+        assert self.under_test.get_chapter_state("123", "abc") is None
+
+        self.under_test.mark_downloaded("123", chapter, datetime(2022, 1, 2))
+
+        assert self.under_test.get_chapter_state("123", "abc") == \
+            ChapterState("abc", "hash", datetime(2022, 1, 1), datetime(2022, 1, 2))
+
+        chapter.updated_at = datetime(2022, 3, 1)
+        self.under_test.mark_unchanged("123", chapter)
+
+        assert self.under_test.get_chapter_state("123", "abc").updated_at == datetime(2022, 3, 1)
+
+    def test_state_is_persisted(self):
+        self.under_test.set_last_sync("123", datetime(2022, 1, 1))
+        self.under_test.close()
+
+        reopened = SyncStateStore()
+        reopened.set_path(self.path)
+
+        assert reopened.get_last_sync("123") == datetime(2022, 1, 1)
+        reopened.close()
+
+    def test_chapter_without_id_is_ignored(self):
+        self.under_test.mark_downloaded("123", MangaChapter("A", Decimal(1)), datetime(2022, 1, 2))
+
+        assert self.under_test.get_chapter_state("123", "None") is None
@@ -1,4 +1,5 @@
-from unittest.mock import patch
+import asyncio
+from unittest.mock import patch, AsyncMock
 
 from manga_dl.util.Timer import Timer
 
@@ -12,3 +13,18 @@ class TestTimer:
         with patch("time.sleep") as sleep:
             self.under_test.sleep(10)
             sleep.assert_called_with(10)
+
+    def test_sleep_async(self):
+        with patch("asyncio.sleep", new_callable=AsyncMock) as sleep:
+            asyncio.run(self.under_test.sleep_async(10))
+            sleep.assert_awaited_with(10)
+
+    def test_monotonic(self):
+        with patch("time.monotonic") as monotonic:
+            monotonic.return_value = 15
+            assert self.under_test.monotonic() == 15
+
+    def test_time(self):
+        with patch("time.time") as current_time:
+            current_time.return_value = 20
+            assert self.under_test.time() == 20
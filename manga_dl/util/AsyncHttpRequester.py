@@ -0,0 +1,127 @@
+import asyncio
+import json
+import logging
+from typing import Optional, Dict, Any, Tuple, Mapping, BinaryIO
+
+import aiohttp
+from injector import inject, singleton
+
+from manga_dl.util.RateLimiter import RateLimiter
+from manga_dl.util.Timer import Timer
+
+
+@singleton
+class AsyncHttpRequester:
+    logger = logging.getLogger("AsyncHttpRequester")
+    DEFAULT_CONNECTION_LIMIT = 1000
+    DEFAULT_CONNECTION_LIMIT_PER_HOST = 10
+    DEFAULT_RETRY_DELAY = 60
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    CONNECT_TIMEOUT = 10
+    READ_TIMEOUT = 30
+
+    @inject
+    def __init__(self, timer: Timer, rate_limiter: RateLimiter):
+        self.timer = timer
+        self.rate_limiter = rate_limiter
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connection_limit = self.DEFAULT_CONNECTION_LIMIT
+        self._connection_limit_per_host = self.DEFAULT_CONNECTION_LIMIT_PER_HOST
+
+    def configure_pools(self, connection_limit: int, connection_limit_per_host: int):
+        self._connection_limit = connection_limit
+        self._connection_limit_per_host = connection_limit_per_host
+
+    async def get_json(
+            self, url: str, params: Optional[Dict[str, Any]] = None, rate_limit_bucket: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        params = params if params is not None else {}
+        response = await self._handle_request(url, rate_limit_bucket, params=params)
+        return response if response is None else json.loads(response)
+
+    async def download_file(self, url: str) -> Optional[bytes]:
+        headers = {"User-Agent": "Mozilla/5.0"}
+        return await self._handle_request(url, None, headers=headers)
+
+    async def stream_file(self, url: str, destination: BinaryIO) -> bool:
+        headers = {"User-Agent": "Mozilla/5.0"}
+        return await self._handle_request(url, None, destination, retry=False, headers=headers) is not None
+
+    async def close(self):
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._session_loop is not loop:
+            stale_session, self._session = self._session, None
+            await stale_session.close()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._connection_limit,
+                limit_per_host=self._connection_limit_per_host
+            )
+            timeout = aiohttp.ClientTimeout(sock_connect=self.CONNECT_TIMEOUT, sock_read=self.READ_TIMEOUT)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._session_loop = loop
+        return self._session
+
+    async def _request(
+            self, url: str, rate_limit_bucket: Optional[str], destination: Optional[BinaryIO], **kwargs: Any
+    ) -> Tuple[int, bytes, Mapping[str, str]]:
+
+        if rate_limit_bucket is not None:
+            await self.rate_limiter.acquire_async(rate_limit_bucket)
+
+        headers: Mapping[str, str] = {}
+        try:
+            session = await self._get_session()
+            async with session.get(url, **kwargs) as response:
+                status, headers = response.status, response.headers
+                if destination is not None and status < 300:
+                    content = b""
+                    await self._stream_content(response, destination)
+                else:
+                    content = await response.read()
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError):
+            status, content = 429, b""
+
+        if rate_limit_bucket is not None:
+            self.rate_limiter.update_from_headers(rate_limit_bucket, headers)
+
+        return status, content, headers
+
+    async def _stream_content(self, response: aiohttp.ClientResponse, destination: BinaryIO):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._reset_destination, destination)
+        async for chunk in response.content.iter_chunked(self.DOWNLOAD_CHUNK_SIZE):
+            await loop.run_in_executor(None, destination.write, chunk)
+
+    @staticmethod
+    def _reset_destination(destination: BinaryIO):
+        destination.seek(0)
+        destination.truncate()
+
+    async def _handle_request(
+            self, url: str, rate_limit_bucket: Optional[str], destination: Optional[BinaryIO] = None,
+            retry: bool = True, **kwargs: Any
+    ) -> Optional[bytes]:
+        status, content, headers = await self._request(url, rate_limit_bucket, destination, **kwargs)
+
+        if status == 429 and retry:
+            retry_delay = self.rate_limiter.get_retry_delay(headers)
+            retry_delay = self.DEFAULT_RETRY_DELAY if retry_delay is None else retry_delay
+            self.logger.warning(f"Rate limited, retrying in {retry_delay:.1f} seconds")
+            if rate_limit_bucket is None:
+                await self.timer.sleep_async(retry_delay)
+            else:
+                self.rate_limiter.block(rate_limit_bucket, retry_delay)
+            status, content, _ = await self._request(url, rate_limit_bucket, destination, **kwargs)
+
+        if status >= 300:
+            self.logger.warning(f"Error {status}: {content.decode(errors='replace')}")
+            return None
+
+        return content
@@ -0,0 +1,101 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Type
+
+from manga_dl.bundling.MangaBundler import MangaBundler
+from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaSeries import MangaSeries
+
+_worker_bundlers: Dict[Type[MangaBundler], MangaBundler] = {}
+
+
+def _bundle_in_worker(
+        bundler_type: Type[MangaBundler], images: List[DownloadedFile], destination: Path, series: MangaSeries,
+        chapter: MangaChapter
+):
+    bundler = _worker_bundlers.get(bundler_type)
+    if bundler is None:
+        from manga_dl.util.MangaDLDependencyInjector import MangaDLDependencyInjector
+        bundler = MangaDLDependencyInjector.get(bundler_type)
+        _worker_bundlers[bundler_type] = bundler
+    bundler.bundle_atomically(images, destination, series, chapter)
+
+
+class BundleExecutor:
+    logger = logging.getLogger("BundleExecutor")
+    PENDING_PER_PROCESS = 2
+
+    def __init__(self, processes: int = 0):
+        self.processes = max(0, processes)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: List[Future] = []
+
+        if self.processes > 0:
+            self._executor = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+
+    def __enter__(self) -> "BundleExecutor":
+        return self
+
+    def __exit__(self, exc_type, *_):
+        if exc_type is None:
+            self.close()
+        elif self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def submit(
+            self, bundler: MangaBundler, images: List[DownloadedFile], destination: Path, series: MangaSeries,
+            chapter: MangaChapter, on_success: Callable[[], None]
+    ):
+        if self._executor is None:
+            bundler.bundle_atomically(images, destination, series, chapter)
+            on_success()
+            return
+
+        while len(self._pending) >= self.processes * self.PENDING_PER_PROCESS:
+            self._raise_if_failed(self._pending.pop(0))
+
+        cover = chapter.resolve_cover() if bundler.requires_cover() else None
+        future = self._executor.submit(
+            _bundle_in_worker, type(bundler), images, destination, self._detach_series(series),
+            self._detach_chapter(chapter, cover)
+        )
+        future.add_done_callback(lambda done: self._call_on_success(done, on_success))
+        self._pending.append(future)
+
+    def wait(self):
+        pending, self._pending = self._pending, []
+        errors = [future.exception() for future in pending]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    @staticmethod
+    def _call_on_success(future: Future, on_success: Callable[[], None]):
+        if not future.cancelled() and future.exception() is None:
+            on_success()
+
+    @staticmethod
+    def _raise_if_failed(future: Future):
+        error = future.exception()
+        if error is not None:
+            raise error
+
+    @staticmethod
+    def _detach_series(series: MangaSeries) -> MangaSeries:
+        return replace(series, volumes=[])
+
+    @staticmethod
+    def _detach_chapter(chapter: MangaChapter, cover: Optional[DownloadedFile]) -> MangaChapter:
+        return replace(chapter, cover=cover, page_loader=None, cover_loader=None)
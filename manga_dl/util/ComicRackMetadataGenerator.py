@@ -1,27 +1,45 @@
-from typing import Optional
+from typing import Optional, Any, List, Dict
 
-from lxml import etree
-from lxml.etree import Element
-
-from manga_dl import version
+import manga_dl
 from manga_dl.model.MangaChapter import MangaChapter
 from manga_dl.model.MangaSeries import MangaSeries
+from manga_dl.model.MangaVolume import MangaVolume
 
 
 class ComicRackMetadataGenerator:
 
-    def create_metadata(self, series: MangaSeries, chapter: MangaChapter, cover_file: Optional[str]) -> str:
+    def create_metadata(
+            self, series: MangaSeries, chapter: MangaChapter, cover_file: Optional[str],
+            page_files: Optional[List[str]] = None
+    ) -> str:
+        from lxml import etree
         comic_info = etree.Element("ComicInfo")
-        etree.SubElement(comic_info, "Notes").text = f"Created with manga-dl V{version}"
+        etree.SubElement(comic_info, "Notes").text = f"Created with manga-dl V{manga_dl.version}"
 
         self._add_basic_series_metadata(comic_info, series)
         self._add_basic_chapter_metadata(comic_info, chapter)
-        self._add_pages_metadata(comic_info, chapter, cover_file)
+        page_files = [page.get_filename() for page in chapter.pages] if page_files is None else page_files
+        self._add_pages_metadata(comic_info, page_files, cover_file)
+
+        return etree.tostring(comic_info, pretty_print=True)
+
+    def create_volume_metadata(
+            self, series: MangaSeries, volume: MangaVolume, cover_file: Optional[str], page_files: List[str],
+            bookmarks: Dict[str, str]
+    ) -> str:
+        from lxml import etree
+        comic_info = etree.Element("ComicInfo")
+        etree.SubElement(comic_info, "Notes").text = f"Created with manga-dl V{manga_dl.version}"
+
+        self._add_basic_series_metadata(comic_info, series)
+        self._add_basic_volume_metadata(comic_info, series, volume)
+        self._add_pages_metadata(comic_info, page_files, cover_file, bookmarks)
 
         return etree.tostring(comic_info, pretty_print=True)
 
     @staticmethod
-    def _add_basic_series_metadata(comic_info: Element, series: MangaSeries):
+    def _add_basic_series_metadata(comic_info: Any, series: MangaSeries):
+        from lxml import etree
         etree.SubElement(comic_info, "Series").text = series.name
 
         if series.author is not None:
@@ -34,7 +52,8 @@ class ComicRackMetadataGenerator:
             etree.SubElement(comic_info, "CoverArtist").text = series.artist
 
     @staticmethod
-    def _add_basic_chapter_metadata(comic_info: Element, chapter: MangaChapter):
+    def _add_basic_chapter_metadata(comic_info: Any, chapter: MangaChapter):
+        from lxml import etree
         etree.SubElement(comic_info, "Title").text = chapter.title
         etree.SubElement(comic_info, "Number").text = str(chapter.number)
         etree.SubElement(comic_info, "Year").text = str(chapter.published_at.year)
@@ -47,7 +66,30 @@ class ComicRackMetadataGenerator:
             etree.SubElement(comic_info, "Volume").text = str(chapter.volume)
 
     @staticmethod
-    def _add_pages_metadata(comic_info: Element, chapter: MangaChapter, cover_file: Optional[str]):
+    def _add_basic_volume_metadata(comic_info: Any, series: MangaSeries, volume: MangaVolume):
+        from lxml import etree
+        if volume.volume_number is None:
+            etree.SubElement(comic_info, "Title").text = series.name
+        else:
+            etree.SubElement(comic_info, "Title").text = f"Volume {volume.volume_number}"
+            etree.SubElement(comic_info, "Number").text = str(volume.volume_number)
+            etree.SubElement(comic_info, "Volume").text = str(volume.volume_number)
+
+        if len(volume.chapters) > 0:
+            published_at = min(chapter.published_at for chapter in volume.chapters)
+            etree.SubElement(comic_info, "Year").text = str(published_at.year)
+            etree.SubElement(comic_info, "Month").text = str(published_at.month)
+            etree.SubElement(comic_info, "Day").text = str(published_at.day)
+
+        etree.SubElement(comic_info, "LanguageISO").text = "en"
+        etree.SubElement(comic_info, "ScanInformation").text = "manga-dl"
+
+    @staticmethod
+    def _add_pages_metadata(
+            comic_info: Any, page_files: List[str], cover_file: Optional[str],
+            bookmarks: Optional[Dict[str, str]] = None
+    ):
+        from lxml import etree
         pages = etree.SubElement(comic_info, "Pages")
 
         if cover_file is not None:
@@ -55,6 +97,8 @@ class ComicRackMetadataGenerator:
             cover_element.set("Image", cover_file)
             cover_element.set("Type", "FrontCover")
 
-        for page in chapter.pages:
+        for page_file in page_files:
             page_element = etree.SubElement(pages, "Page")
-            page_element.set("Image", page.get_filename())
+            page_element.set("Image", page_file)
+            if bookmarks is not None and page_file in bookmarks:
+                page_element.set("Bookmark", bookmarks[page_file])
@@ -1,16 +1,38 @@
+import functools
+import hashlib
+import threading
 from io import BytesIO
-from typing import Tuple
+from typing import Tuple, Optional, Any
 
-from PIL import Image, ImageFont, ImageDraw
-from matplotlib import font_manager
+from injector import inject
+
+from manga_dl.util.ImageCache import ImageCache
 
 
 class CoverManipulator:
-    FONT_NAME = font_manager.FontProperties(family="sans-serif", weight="bold")
+    FONT_FAMILY = "sans-serif"
+    FONT_WEIGHT = "bold"
+
+    @inject
+    def __init__(self, image_cache: ImageCache):
+        self.image_cache = image_cache
+        self._lock = threading.Lock()
+        self._decoded: Optional[Tuple[str, Any]] = None
 
     def add_chapter_box(self, image_bytes: bytes, text: str) -> bytes:
-        image = Image.open(BytesIO(image_bytes))
-        image_format = image.format
+        cover_hash = hashlib.sha256(image_bytes).hexdigest()
+        rendered = self.image_cache.load_rendered_cover(cover_hash, text)
+
+        if rendered is None:
+            rendered = self._render(cover_hash, image_bytes, text)
+            self.image_cache.store_rendered_cover(cover_hash, text, rendered)
+
+        return rendered
+
+    def _render(self, cover_hash: str, image_bytes: bytes, text: str) -> bytes:
+        from PIL import ImageDraw
+        source = self._decode(cover_hash, image_bytes)
+        image = source.copy()
         drawing = ImageDraw.Draw(image)
 
         self._draw_box(image, drawing)
@@ -18,11 +40,20 @@ class CoverManipulator:
         self._draw_text(image, drawing, text, font_size)
 
         edited = BytesIO()
-        image.save(edited, format=image_format)
+        image.save(edited, format=source.format)
         return edited.getvalue()
 
+    def _decode(self, cover_hash: str, image_bytes: bytes) -> Any:
+        from PIL import Image
+        with self._lock:
+            if self._decoded is None or self._decoded[0] != cover_hash:
+                image = Image.open(BytesIO(image_bytes))
+                image.load()
+                self._decoded = (cover_hash, image)
+            return self._decoded[1]
+
     @staticmethod
-    def _calculate_dimensions(image: Image) -> Tuple[int, int, int, int, int]:
+    def _calculate_dimensions(image: Any) -> Tuple[int, int, int, int, int]:
         text_max_width = int(image.width / 5)
         text_max_height = int(text_max_width / 2.5)
         box_padding = int(text_max_width / 5)
@@ -30,29 +61,32 @@ class CoverManipulator:
         box_height = text_max_height + box_padding * 2
         return text_max_width, text_max_height, box_padding, box_width, box_height
 
-    def _calculate_font_size(self, image: Image, drawing: ImageDraw, text: str) -> int:
+    def _calculate_font_size(self, image: Any, drawing: Any, text: str) -> int:
         max_width, max_height, _, _, _ = self._calculate_dimensions(image)
-        calculated_font_size = max_width
 
-        width, height = self._calculate_text_size(drawing, text, calculated_font_size)
-        while width > max_width or height > max_height:
-            calculated_font_size -= 1
-            width, height = self._calculate_text_size(drawing, text, calculated_font_size)
+        lower, upper = 1, max(1, max_width)
+        while lower < upper:
+            font_size = (lower + upper + 1) // 2
+            width, height = self._calculate_text_size(drawing, text, font_size)
+            if width <= max_width and height <= max_height:
+                lower = font_size
+            else:
+                upper = font_size - 1
 
-        return calculated_font_size
+        return lower
 
-    def _draw_box(self, image: Image, drawing: ImageDraw):
+    def _draw_box(self, image: Any, drawing: Any):
         box_x_anchor, box_y_anchor = self._calculate_box_anchors(image)
         corner_remover = 10
 
         coordinates = (box_x_anchor, box_y_anchor, image.width + corner_remover, image.height + corner_remover)
         drawing.rounded_rectangle(coordinates, fill="gray", outline="black", width=5, radius=20)
 
-    def _calculate_box_anchors(self, image: Image) -> Tuple[int, int]:
+    def _calculate_box_anchors(self, image: Any) -> Tuple[int, int]:
         _, _, _, box_width, box_height = self._calculate_dimensions(image)
         return image.width - box_width, image.height - box_height
 
-    def _draw_text(self, image: Image, drawing: ImageDraw, text: str, font_size: int):
+    def _draw_text(self, image: Any, drawing: Any, text: str, font_size: int):
         max_width, max_height, box_padding, _, _ = self._calculate_dimensions(image)
         text_width, text_height = self._calculate_text_size(drawing, text, font_size)
         x_padding = box_padding + int((max_width - text_width) / 2)
@@ -67,9 +101,19 @@ class CoverManipulator:
         font = self._create_font(font_size)
         drawing.text(coordinates, text, fill=color, font=font)
 
-    def _create_font(self, font_size: int) -> ImageFont:
-        font_file = font_manager.findfont(self.FONT_NAME)
-        return ImageFont.truetype(font_file, font_size)
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _find_font_file() -> str:
+        from matplotlib import font_manager
+        font = font_manager.FontProperties(family=CoverManipulator.FONT_FAMILY, weight=CoverManipulator.FONT_WEIGHT)
+        return font_manager.findfont(font)
 
-    def _calculate_text_size(self, drawing: ImageDraw, text: str, font_size: int) -> Tuple[int, int]:
-        return drawing.textsize(text, font=self._create_font(font_size))
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _create_font(font_size: int) -> Any:
+        from PIL import ImageFont
+        return ImageFont.truetype(CoverManipulator._find_font_file(), font_size)
+
+    def _calculate_text_size(self, drawing: Any, text: str, font_size: int) -> Tuple[int, int]:
+        left, top, right, bottom = drawing.textbbox((0, 0), text, font=self._create_font(font_size))
+        return right - left, bottom - top
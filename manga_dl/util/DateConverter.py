@@ -1,6 +1,9 @@
 from datetime import datetime
 
+from injector import singleton
 
+
+@singleton
 class DateConverter:
 
     @staticmethod
@@ -1,47 +1,219 @@
 import json
 import logging
-from typing import Optional, Dict, Any, Callable
+import threading
+from typing import Optional, Dict, Any, Callable, List, BinaryIO, Tuple
 
 import requests
-from injector import inject
-from requests import Response
+from injector import inject, singleton
+from requests import Response, Session, RequestException
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool
 
+from manga_dl.util.NodeHealthTracker import NodeHealthTracker
+from manga_dl.util.RateLimiter import RateLimiter
+from manga_dl.util.RequestCounter import RequestCounter
+from manga_dl.util.ResponseCache import ResponseCache
 from manga_dl.util.Timer import Timer
 
 
+@singleton
 class HttpRequester:
     logger = logging.getLogger("HttpRequester")
+    DEFAULT_POOL_CONNECTIONS = 10
+    DEFAULT_POOL_MAXSIZE = 10
+    DEFAULT_RETRY_DELAY = 60
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    CONNECT_TIMEOUT = 10
+    READ_TIMEOUT = 30
 
     @inject
-    def __init__(self, timer: Timer):
+    def __init__(
+            self, timer: Timer, rate_limiter: RateLimiter, response_cache: ResponseCache,
+            node_health: NodeHealthTracker, request_counter: RequestCounter
+    ):
         self.timer = timer
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.node_health = node_health
+        self.request_counter = request_counter
+        self._session_lock = threading.Lock()
+        self._session: Optional[Session] = None
+        self._adapters: List[HTTPAdapter] = []
+        self._pool_connections = self.DEFAULT_POOL_CONNECTIONS
+        self._pool_maxsize = self.DEFAULT_POOL_MAXSIZE
 
-    def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    def configure_pools(self, pool_connections: int, pool_maxsize: int):
+        with self._session_lock:
+            self._pool_connections = pool_connections
+            self._pool_maxsize = pool_maxsize
+            if self._session is not None:
+                self._mount_adapters(self._session)
+
+    def get_json(
+            self, url: str, params: Optional[Dict[str, Any]] = None, rate_limit_bucket: Optional[str] = None,
+            cache_ttl: Optional[float] = None, request_name: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         params = params if params is not None else {}
-        response = self._handle_request(lambda: requests.get(url, params=params))
-        return response if response is None else json.loads(response.text)
+        cache_key = self.response_cache.get_key(url, params)
+        cached = None if cache_ttl is None else self.response_cache.get(cache_key)
+
+        if self.response_cache.offline:
+            if cached is None:
+                self.logger.warning(f"No cached response for {cache_key} available offline")
+            return None if cached is None else json.loads(cached.body)
+
+        if cached is not None and cache_ttl is not None and cached.is_fresh(self.timer.time(), cache_ttl):
+            return json.loads(cached.body)
+
+        headers = {} if cached is None else cached.get_validation_headers()
+        session = self._get_session()
+
+        def send_request() -> Response:
+            if request_name is not None:
+                self.request_counter.increment(request_name)
+            return session.get(url, params=params, headers=headers, timeout=self._get_timeout())
+
+        response = self._handle_request(send_request, rate_limit_bucket)
+
+        if response is None:
+            return None
+
+        if response.status_code == 304 and cached is not None:
+            self.response_cache.refresh(cache_key)
+            return json.loads(cached.body)
+
+        if cache_ttl is not None:
+            self.response_cache.put(
+                cache_key, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified")
+            )
+
+        return json.loads(response.text)
 
     def download_file(self, url: str) -> Optional[bytes]:
 
         headers = {"User-Agent": "Mozilla/5.0"}
-        response = self._handle_request(lambda: requests.get(url, headers=headers))
+        session = self._get_session()
+        response = self._handle_request(lambda: session.get(url, headers=headers, timeout=self._get_timeout()))
         return response if response is None else response.content
 
-    def _handle_request(self, request_generator: Callable[[], Response]) -> Optional[Response]:
+    def stream_file(self, url: str, destination: BinaryIO) -> bool:
+
+        headers = {"User-Agent": "Mozilla/5.0"}
+        session = self._get_session()
+        started = self.timer.monotonic()
+        response = self._handle_request(
+            lambda: session.get(url, headers=headers, stream=True, timeout=self._get_timeout()), retry=False
+        )
+        if response is None:
+            self.node_health.record(url, False, self.timer.monotonic() - started, 0, False)
+            return False
 
+        size = 0
         try:
-            response = request_generator()
-        except ConnectionError:
-            response = Response()
-            response.status_code = 429
+            for chunk in response.iter_content(self.DOWNLOAD_CHUNK_SIZE):
+                destination.write(chunk)
+                size += len(chunk)
+        except RequestException as e:
+            self.logger.warning(f"Download of {url} interrupted: {e}")
+            self.node_health.record(url, False, self.timer.monotonic() - started, size, False)
+            return False
+        finally:
+            response.close()
 
-        if response.status_code == 429:
-            self.logger.warning("Rate limited, retrying in 60 seconds")
-            self.timer.sleep(60)
-            response = request_generator()
+        cached = response.headers.get("X-Cache", "").startswith("HIT")
+        self.node_health.record(url, True, self.timer.monotonic() - started, size, cached)
+        return True
+
+    def post_json(self, url: str, payload: Dict[str, Any]) -> bool:
+        session = self._get_session()
+        response = self._handle_request(
+            lambda: session.post(url, json=payload, timeout=self._get_timeout()), retry=False
+        )
+        return response is not None
+
+    def get_opened_connection_count(self) -> int:
+        return sum(pool.num_connections for pool in self._get_connection_pools())
+
+    def get_reused_connection_count(self) -> int:
+        return sum(pool.num_requests - pool.num_connections for pool in self._get_connection_pools())
 
-        if response.status_code >= 300:
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+                self._adapters = []
+
+    def _get_session(self) -> Session:
+        with self._session_lock:
+            if self._session is None:
+                self._session = requests.Session()
+                self._mount_adapters(self._session)
+            return self._session
+
+    def _mount_adapters(self, session: Session):
+        for adapter in self._adapters:
+            adapter.close()
+
+        self._adapters = []
+        for prefix in ["http://", "https://"]:
+            adapter = HTTPAdapter(
+                pool_connections=self._pool_connections,
+                pool_maxsize=self._pool_maxsize,
+                pool_block=True
+            )
+            session.mount(prefix, adapter)
+            self._adapters.append(adapter)
+
+    def _get_connection_pools(self) -> List[HTTPConnectionPool]:
+        pools: List[HTTPConnectionPool] = []
+        for adapter in self._adapters:
+            pool_container = adapter.poolmanager.pools
+            with pool_container.lock:
+                pools += [pool_container[key] for key in pool_container.keys()]
+        return pools
+
+    def _get_timeout(self) -> Tuple[float, float]:
+        return self.CONNECT_TIMEOUT, self.READ_TIMEOUT
+
+    def _handle_request(
+            self, request_generator: Callable[[], Response], rate_limit_bucket: Optional[str] = None,
+            retry: bool = True
+    ) -> Optional[Response]:
+
+        response = self._send_request(request_generator, rate_limit_bucket)
+
+        if response.status_code == 429 and retry:
+            retry_delay = self.rate_limiter.get_retry_delay(response.headers)
+            retry_delay = self.DEFAULT_RETRY_DELAY if retry_delay is None else retry_delay
+            self.logger.warning(f"Rate limited, retrying in {retry_delay:.1f} seconds")
+            if rate_limit_bucket is None:
+                self.timer.sleep(retry_delay)
+            else:
+                self.rate_limiter.block(rate_limit_bucket, retry_delay)
+            response = self._send_request(request_generator, rate_limit_bucket)
+
+        if response.status_code >= 300 and response.status_code != 304:
             self.logger.warning(f"Error {response.status_code}: {response.text}")
             return None
 
         return response
+
+    def _send_request(
+            self, request_generator: Callable[[], Response], rate_limit_bucket: Optional[str]
+    ) -> Response:
+
+        if rate_limit_bucket is not None:
+            self.rate_limiter.acquire(rate_limit_bucket)
+
+        try:
+            response = request_generator()
+        except (ConnectionError, RequestException) as e:
+            self.logger.warning(f"Request failed: {e}")
+            response = Response()
+            response.status_code = 429
+
+        if rate_limit_bucket is not None:
+            self.rate_limiter.update_from_headers(rate_limit_bucket, response.headers)
+
+        return response
@@ -0,0 +1,165 @@
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from urllib.parse import quote
+from typing import Optional, List
+
+from injector import singleton
+
+from manga_dl.model.ImageQuality import ImageQuality
+from manga_dl.model.MangaChapter import MangaChapter
+from manga_dl.model.MangaPage import MangaPage
+
+
+@singleton
+class ImageCache:
+    logger = logging.getLogger("ImageCache")
+    DEFAULT_PATH = Path.home() / ".cache/manga-dl/images"
+    DEFAULT_MAX_SIZE = 4 * 1024 * 1024 * 1024
+
+    def __init__(self):
+        self.path = self.DEFAULT_PATH
+        self.max_size = self.DEFAULT_MAX_SIZE
+        self._lock = threading.Lock()
+        self._total_size: Optional[int] = None
+
+    def set_path(self, path: Path):
+        self.path = path
+        self._total_size = None
+
+    def set_max_size(self, max_size: int):
+        self.max_size = max_size
+
+    def get_page_path(self, chapter_hash: str, filename: str) -> Path:
+        return self.path / "pages" / chapter_hash / filename
+
+    def fetch_page(self, chapter_hash: str, filename: str, destination: Path) -> bool:
+        cached = self.get_page_path(chapter_hash, filename)
+        try:
+            os.utime(cached)
+            destination.unlink(missing_ok=True)
+            self._link_or_copy(cached, destination)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def store_page(self, chapter_hash: str, filename: str, source: Path):
+        cached = self.get_page_path(chapter_hash, filename)
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        temporary = cached.with_name(f".{cached.name}.{threading.get_ident()}.tmp")
+        temporary.unlink(missing_ok=True)
+        self._link_or_copy(source, temporary)
+        self._add_size(temporary.stat().st_size)
+        temporary.replace(cached)
+
+    def load_cover(self, series_id: str, filename: str) -> Optional[bytes]:
+        try:
+            return self._get_cover_path(series_id, filename).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def store_cover(self, series_id: str, filename: str, data: bytes):
+        cover_path = self._get_cover_path(series_id, filename)
+        cover_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = cover_path.with_name(f".{cover_path.name}.{threading.get_ident()}.tmp")
+        temporary.write_bytes(data)
+        temporary.replace(cover_path)
+
+    def load_rendered_cover(self, cover_hash: str, label: str) -> Optional[bytes]:
+        try:
+            return self._get_rendered_cover_path(cover_hash, label).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def store_rendered_cover(self, cover_hash: str, label: str, data: bytes):
+        rendered_path = self._get_rendered_cover_path(cover_hash, label)
+        rendered_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = rendered_path.with_name(f".{rendered_path.name}.{threading.get_ident()}.tmp")
+        temporary.write_bytes(data)
+        self._add_size(len(data))
+        temporary.replace(rendered_path)
+
+    def restore_pages(self, chapter: MangaChapter) -> bool:
+        if chapter.id is None or len(chapter.pages) > 0:
+            return False
+
+        try:
+            manifest = json.loads(self._get_manifest_path(chapter).read_text())
+        except (FileNotFoundError, ValueError):
+            return False
+
+        updated_at = None if chapter.updated_at is None else chapter.updated_at.isoformat()
+        pages = [MangaPage(image_file, page_number) for image_file, page_number in manifest["pages"]]
+        all_cached = all(self.get_page_path(manifest["hash"], page.get_filename()).is_file() for page in pages)
+
+        if manifest["updated_at"] != updated_at or not all_cached:
+            return False
+
+        chapter.pages = pages
+        chapter.content_hash = manifest["hash"]
+        return True
+
+    def save_manifest(self, chapter: MangaChapter):
+        if chapter.id is None or chapter.content_hash is None:
+            return
+
+        manifest_path = self._get_manifest_path(chapter)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps({
+            "hash": chapter.content_hash,
+            "updated_at": None if chapter.updated_at is None else chapter.updated_at.isoformat(),
+            "pages": [[page.image_file, page.page_number] for page in chapter.pages]
+        }))
+
+    def evict(self):
+        with self._lock:
+            if self._total_size is not None and self._total_size <= self.max_size:
+                return
+
+            files = [
+                (entry.stat().st_mtime, entry.stat().st_size, entry)
+                for directory in ["pages", "rendered"]
+                for entry in (self.path / directory).glob("*/*")
+                if entry.is_file()
+            ]
+            total_size = sum(size for _, size, _ in files)
+            self._total_size = total_size
+            if total_size <= self.max_size:
+                return
+
+            evicted = 0
+            for _, size, entry in sorted(files, key=lambda x: x[0]):
+                if total_size <= self.max_size:
+                    break
+                entry.unlink(missing_ok=True)
+                total_size -= size
+                evicted += 1
+
+            self._total_size = total_size
+            self.logger.info(f"Evicted {evicted} cached images")
+
+    def _add_size(self, size: int):
+        with self._lock:
+            if self._total_size is not None:
+                self._total_size += size
+
+    def _get_cover_path(self, series_id: str, filename: str) -> Path:
+        return self.path / "covers" / series_id / filename
+
+    def _get_rendered_cover_path(self, cover_hash: str, label: str) -> Path:
+        return self.path / "rendered" / cover_hash / quote(label, safe="")
+
+    def _get_manifest_path(self, chapter: MangaChapter) -> Path:
+        if chapter.image_quality == ImageQuality.ORIGINAL:
+            return self.path / "chapters" / f"{chapter.id}.json"
+        return self.path / "chapters" / f"{chapter.id}-{chapter.image_quality.value}.json"
+
+    @staticmethod
+    def _link_or_copy(source: Path, destination: Path):
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copyfile(source, destination)
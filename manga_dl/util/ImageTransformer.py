@@ -0,0 +1,106 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from injector import inject, singleton
+
+from manga_dl.model.DownloadedFile import DownloadedFile
+from manga_dl.model.ImageTransform import ImageTransform
+from manga_dl.util.Timer import Timer
+
+
+def _transform_image(
+        source: Path, filename: str, destination_dir: Path, transform: ImageTransform
+) -> Tuple[Path, str]:
+    from PIL import Image
+
+    try:
+        with Image.open(source) as opened:
+            image_format = opened.format if transform.image_format is None else transform.image_format.value
+            image = opened.convert("L") if transform.grayscale else opened.copy()
+    except OSError:
+        return source, filename
+
+    if image_format is None:
+        return source, filename
+
+    if transform.max_height is not None and image.height > transform.max_height:
+        width = max(1, round(image.width * transform.max_height / image.height))
+        image = image.resize((width, transform.max_height), Image.Resampling.LANCZOS)
+
+    if image_format.upper() == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    if transform.image_format is not None:
+        filename = f"{filename.rsplit('.', 1)[0]}.{transform.image_format.get_extension()}"
+
+    destination = destination_dir / filename
+    image.save(destination, format=image_format, quality=transform.quality)
+    return destination, filename
+
+
+@singleton
+class ImageTransformer:
+    logger = logging.getLogger("ImageTransformer")
+    DIRECTORY = ".transformed"
+
+    @inject
+    def __init__(self, timer: Timer):
+        self.timer = timer
+        self.transform = ImageTransform()
+        self.processes = os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def set_transform(self, transform: ImageTransform):
+        self.transform = transform
+
+    def set_processes(self, processes: int):
+        self.close()
+        self.processes = max(0, processes)
+
+    def is_enabled(self) -> bool:
+        return self.transform.is_enabled()
+
+    def transform_chapter(self, images: List[DownloadedFile], staging_dir: Path, label: str) -> List[DownloadedFile]:
+        started = self.timer.monotonic()
+        destination_dir = staging_dir / self.DIRECTORY
+        destination_dir.mkdir(parents=True, exist_ok=True)
+        sources = [self._get_path(image, destination_dir) for image in images]
+        filenames = [image.filename for image in images]
+        transforms = [self.transform] * len(images)
+        destinations = [destination_dir] * len(images)
+
+        executor = self._get_executor()
+        if executor is None:
+            results = list(map(_transform_image, sources, filenames, destinations, transforms))
+        else:
+            results = list(executor.map(_transform_image, sources, filenames, destinations, transforms))
+
+        original_size = sum(source.stat().st_size for source in sources)
+        transformed_size = sum(path.stat().st_size for path, _ in results)
+        self.logger.info(
+            f"Transformed {label}: {original_size / 1e6:.1f} MB -> {transformed_size / 1e6:.1f} MB "
+            f"in {self.timer.monotonic() - started:.1f} s"
+        )
+        return [DownloadedFile.from_path(path, filename) for path, filename in results]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.processes > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    @staticmethod
+    def _get_path(image: DownloadedFile, destination_dir: Path) -> Path:
+        if image.path is not None:
+            return image.path
+        path = destination_dir / f".source-{image.filename}"
+        path.write_bytes(image.data)
+        return path
@@ -0,0 +1,20 @@
+import threading
+from typing import Generic, TypeVar, Callable, Optional
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+
+    def __init__(self, loader: Callable[[], T]):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._value: Optional[T] = None
+
+    def get(self) -> T:
+        with self._lock:
+            if not self._loaded:
+                self._value = self._loader()
+                self._loaded = True
+            return self._value  # type: ignore
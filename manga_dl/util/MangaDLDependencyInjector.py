@@ -1,6 +1,7 @@
-from typing import List, TypeVar, Type
+import threading
+from typing import List, TypeVar, Type, Optional
 
-from injector import Injector
+from injector import Injector, singleton
 
 from manga_dl.bundling.MangaBundler import MangaBundler
 from manga_dl.scraping.ScrapingMethod import ScrapingMethod
@@ -9,10 +10,30 @@ T = TypeVar("T")
 
 
 class MangaDLDependencyInjector:
+    _lock = threading.Lock()
+    _injector: Optional[Injector] = None
 
     @staticmethod
     def get(cls: Type[T]) -> T:
+        return MangaDLDependencyInjector.get_injector().get(cls)
+
+    @staticmethod
+    def get_injector() -> Injector:
+        with MangaDLDependencyInjector._lock:
+            if MangaDLDependencyInjector._injector is None:
+                MangaDLDependencyInjector._injector = MangaDLDependencyInjector._create_injector()
+            return MangaDLDependencyInjector._injector
+
+    @staticmethod
+    def reset():
+        with MangaDLDependencyInjector._lock:
+            MangaDLDependencyInjector._injector = None
+
+    @staticmethod
+    def _create_injector() -> Injector:
         injector = Injector()
-        injector.binder.multibind(List[ScrapingMethod], ScrapingMethod.get_scraping_methods(injector))
-        injector.binder.multibind(List[MangaBundler], MangaBundler.get_bundlers(injector))
-        return injector.get(cls)
+        injector.binder.multibind(
+            List[ScrapingMethod], lambda: ScrapingMethod.get_scraping_methods(injector), scope=singleton
+        )
+        injector.binder.multibind(List[MangaBundler], lambda: MangaBundler.get_bundlers(injector), scope=singleton)
+        return injector
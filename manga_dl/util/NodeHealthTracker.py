@@ -0,0 +1,96 @@
+import logging
+import threading
+from dataclasses import replace
+from typing import Callable, Dict, List
+from urllib.parse import urlparse
+
+from injector import inject, singleton
+
+from manga_dl.util.NodeStats import NodeStats
+from manga_dl.util.Timer import Timer
+
+ImageReporter = Callable[[str, bool, float, int, bool], None]
+
+
+@singleton
+class NodeHealthTracker:
+    logger = logging.getLogger("NodeHealthTracker")
+    LATENCY_SMOOTHING = 0.2
+    FAILURE_THRESHOLD = 3
+    SLOW_THRESHOLD = 10.0
+    MIN_SAMPLES = 5
+    COOLDOWN = 5 * 60
+
+    @inject
+    def __init__(self, timer: Timer):
+        self.timer = timer
+        self._lock = threading.Lock()
+        self._stats: Dict[str, NodeStats] = {}
+        self._reporters: List[ImageReporter] = []
+        self._reporting = False
+
+    def set_reporting(self, reporting: bool):
+        self._reporting = reporting
+
+    def add_reporter(self, reporter: ImageReporter):
+        self._reporters.append(reporter)
+
+    def record(self, url: str, success: bool, duration: float, size: int, cached: bool):
+        node = self.get_node(url)
+        with self._lock:
+            stats = self._stats.setdefault(node, NodeStats(node))
+            self._update(stats, success, duration, size)
+
+        if self._reporting:
+            for reporter in self._reporters:
+                reporter(url, success, duration, size, cached)
+
+    def is_degraded(self, url: str) -> bool:
+        with self._lock:
+            stats = self._stats.get(self.get_node(url))
+            return stats is not None and stats.degraded_until > self.timer.monotonic()
+
+    def get_stats(self) -> List[NodeStats]:
+        with self._lock:
+            return [replace(stats) for stats in self._stats.values()]
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def format_stats(self) -> str:
+        return ", ".join(
+            f"{stats.node}={stats.requests - stats.failures}/{stats.requests} ({stats.latency * 1000:.0f} ms)"
+            for stats in sorted(self.get_stats(), key=lambda stats: stats.node)
+        )
+
+    @staticmethod
+    def get_node(url: str) -> str:
+        parsed = urlparse(url)
+        return parsed.netloc if parsed.netloc != "" else parsed.path.split("/")[0]
+
+    def _update(self, stats: NodeStats, success: bool, duration: float, size: int):
+        stats.requests += 1
+        if stats.requests == 1:
+            stats.latency = duration
+        else:
+            stats.latency += (duration - stats.latency) * self.LATENCY_SMOOTHING
+
+        if success:
+            stats.consecutive_failures = 0
+            stats.downloaded_bytes += size
+        else:
+            stats.failures += 1
+            stats.consecutive_failures += 1
+
+        too_many_failures = stats.consecutive_failures >= self.FAILURE_THRESHOLD
+        too_slow = stats.requests >= self.MIN_SAMPLES and stats.latency > self.SLOW_THRESHOLD
+        now = self.timer.monotonic()
+        if (too_many_failures or too_slow) and stats.degraded_until <= now:
+            self.logger.warning(
+                f"Node {stats.node} degraded ({stats.consecutive_failures} consecutive failures, "
+                f"{stats.latency:.1f} s latency), avoiding it for {self.COOLDOWN} seconds"
+            )
+            stats.degraded_until = now + self.COOLDOWN
+            stats.consecutive_failures = 0
+            stats.latency = min(stats.latency, self.SLOW_THRESHOLD)
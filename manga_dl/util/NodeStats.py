@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class NodeStats:
+    node: str
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    downloaded_bytes: int = 0
+    latency: float = 0.0
+    degraded_until: float = 0.0
@@ -0,0 +1,42 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Set
+
+
+class PageJournal:
+    logger = logging.getLogger("PageJournal")
+    FILENAME = ".journal"
+
+    def __init__(self, staging_dir: Path, chapter_hash: Optional[str]):
+        self.staging_dir = staging_dir
+        self.path = staging_dir / self.FILENAME
+        self._lock = threading.Lock()
+        self._completed = self._load(chapter_hash or "")
+
+    def is_complete(self, filename: str) -> bool:
+        with self._lock:
+            return filename in self._completed and (self.staging_dir / filename).is_file()
+
+    def mark_complete(self, filename: str):
+        with self._lock:
+            self._completed.add(filename)
+            with open(self.path, "a") as journal:
+                journal.write(f"{filename}\n")
+
+    def get_completed_count(self) -> int:
+        with self._lock:
+            return len(self._completed)
+
+    def _load(self, chapter_hash: str) -> Set[str]:
+        try:
+            header, *filenames = self.path.read_text().splitlines()
+        except (FileNotFoundError, ValueError):
+            header, filenames = None, []
+
+        if header != chapter_hash:
+            self.staging_dir.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(f"{chapter_hash}\n")
+            return set()
+
+        return set(filenames)
@@ -0,0 +1,60 @@
+import threading
+from queue import Queue
+from typing import Callable, List, Any, Iterable, Optional
+
+
+class Pipeline:
+    _END = object()
+
+    def __init__(self, stages: List[Callable[[Any], Any]], queue_size: int = 1):
+        self.stages = stages
+        self.queue_size = queue_size
+        self._errors: List[BaseException] = []
+
+    def run(self, items: Iterable[Any]):
+        self._errors = []
+        queues: List[Queue] = [Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = [
+            threading.Thread(
+                target=self._run_stage,
+                args=(stage, queues[index], queues[index + 1] if index + 1 < len(queues) else None),
+                name=f"pipeline-stage-{index}"
+            )
+            for index, stage in enumerate(self.stages)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for item in items:
+                if self._errors:
+                    break
+                queues[0].put(item)
+        finally:
+            queues[0].put(self._END)
+            for thread in threads:
+                thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+    def _run_stage(self, stage: Callable[[Any], Any], inbox: Queue, outbox: Optional[Queue]):
+        while True:
+            item = inbox.get()
+
+            if item is self._END:
+                break
+            if self._errors:
+                continue
+
+            try:
+                result = stage(item)
+            except BaseException as e:
+                self._errors.append(e)
+                continue
+
+            if outbox is not None:
+                outbox.put(result)
+
+        if outbox is not None:
+            outbox.put(self._END)
@@ -0,0 +1,54 @@
+import importlib
+import logging
+import pkgutil
+import threading
+from typing import List, Set, Any
+
+
+class PluginRegistry:
+    logger = logging.getLogger("PluginRegistry")
+    SCRAPING_METHODS_GROUP = "manga_dl.scraping_methods"
+    BUNDLERS_GROUP = "manga_dl.bundlers"
+
+    _lock = threading.Lock()
+    _loaded_groups: Set[str] = set()
+    _entry_point_classes: List[Any] = []
+
+    @classmethod
+    def get_plugins(cls, base: type, package: str, group: str) -> List[type]:
+        with cls._lock:
+            if group not in cls._loaded_groups:
+                cls._import_package(package)
+                cls._entry_point_classes += cls._load_entry_points(group)
+                cls._loaded_groups.add(group)
+
+        plugins: List[type] = list(base.__subclasses__())
+        plugins += [
+            plugin for plugin in cls._entry_point_classes
+            if issubclass(plugin, base) and plugin not in plugins
+        ]
+        return plugins
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._loaded_groups = set()
+            cls._entry_point_classes = []
+
+    @staticmethod
+    def _import_package(package: str):
+        package_module = importlib.import_module(package)
+        for module in pkgutil.iter_modules(package_module.__path__):
+            importlib.import_module(f"{package}.{module.name}")
+
+    @classmethod
+    def _load_entry_points(cls, group: str) -> List[Any]:
+        from importlib import metadata
+
+        plugins = []
+        for entry_point in metadata.entry_points(group=group):
+            try:
+                plugins.append(entry_point.load())
+            except (ImportError, AttributeError) as e:
+                cls.logger.warning(f"Failed to load plugin {entry_point.name}: {e}")
+        return plugins
@@ -0,0 +1,104 @@
+import logging
+import threading
+from typing import Dict, Optional, Mapping
+
+from injector import inject, singleton
+
+from manga_dl.util.Timer import Timer
+from manga_dl.util.TokenBucket import TokenBucket
+
+
+@singleton
+class RateLimiter:
+    logger = logging.getLogger("RateLimiter")
+    DEFAULT_BUCKET = "default"
+    DEFAULT_RATE = 5.0
+    DEFAULT_CAPACITY = 5.0
+
+    @inject
+    def __init__(self, timer: Timer):
+        self.timer = timer
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def configure_bucket(self, name: str, rate: float, capacity: float):
+        with self._lock:
+            now = self.timer.monotonic()
+            self._buckets[name] = TokenBucket(rate=rate, capacity=capacity, tokens=capacity, updated_at=now)
+
+    def acquire(self, name: str = DEFAULT_BUCKET):
+        wait_time = self._try_acquire(name)
+        while wait_time > 0:
+            self.timer.sleep(wait_time)
+            wait_time = self._try_acquire(name)
+
+    async def acquire_async(self, name: str = DEFAULT_BUCKET):
+        wait_time = self._try_acquire(name)
+        while wait_time > 0:
+            await self.timer.sleep_async(wait_time)
+            wait_time = self._try_acquire(name)
+
+    def update_from_headers(self, name: str, headers: Mapping[str, str]):
+        remaining = self._parse_float(headers.get("X-RateLimit-Remaining"))
+        retry_after = self.get_retry_delay(headers)
+
+        with self._lock:
+            bucket = self._get_bucket(name)
+            now = self.timer.monotonic()
+
+            if remaining is not None:
+                bucket.tokens = min(bucket.tokens, remaining)
+
+            if retry_after is not None and (remaining is None or remaining < 1):
+                bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+                self.logger.info(f"Rate limit for {name} exhausted, pausing for {retry_after:.1f} seconds")
+
+    def block(self, name: str, seconds: float):
+        with self._lock:
+            bucket = self._get_bucket(name)
+            bucket.blocked_until = max(bucket.blocked_until, self.timer.monotonic() + seconds)
+
+    def get_retry_delay(self, headers: Mapping[str, str]) -> Optional[float]:
+        retry_after = self._parse_float(headers.get("Retry-After"))
+        if retry_after is not None:
+            return max(0.0, retry_after)
+
+        retry_at = self._parse_float(headers.get("X-RateLimit-Retry-After"))
+        if retry_at is not None:
+            return max(0.0, retry_at - self.timer.time())
+
+        return None
+
+    def _try_acquire(self, name: str) -> float:
+        with self._lock:
+            bucket = self._get_bucket(name)
+            now = self.timer.monotonic()
+
+            if bucket.blocked_until > now:
+                return bucket.blocked_until - now
+
+            bucket.tokens = min(bucket.capacity, bucket.tokens + (now - bucket.updated_at) * bucket.rate)
+            bucket.updated_at = now
+
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+
+            return (1 - bucket.tokens) / bucket.rate
+
+    def _get_bucket(self, name: str) -> TokenBucket:
+        if name not in self._buckets:
+            self._buckets[name] = TokenBucket(
+                rate=self.DEFAULT_RATE,
+                capacity=self.DEFAULT_CAPACITY,
+                tokens=self.DEFAULT_CAPACITY,
+                updated_at=self.timer.monotonic()
+            )
+        return self._buckets[name]
+
+    @staticmethod
+    def _parse_float(value: Optional[str]) -> Optional[float]:
+        try:
+            return None if value is None else float(value)
+        except ValueError:
+            return None
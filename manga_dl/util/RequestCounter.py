@@ -0,0 +1,31 @@
+import threading
+from typing import Dict
+
+from injector import singleton
+
+
+@singleton
+class RequestCounter:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+
+    def increment(self, endpoint: str):
+        with self._lock:
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+
+    def get_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def get_total(self) -> int:
+        with self._lock:
+            return sum(self._counts.values())
+
+    def reset(self):
+        with self._lock:
+            self._counts = {}
+
+    def format_counts(self) -> str:
+        return ", ".join(f"{endpoint}={count}" for endpoint, count in sorted(self.get_counts().items()))
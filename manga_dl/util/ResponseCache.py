@@ -0,0 +1,114 @@
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+from urllib.parse import urlencode
+
+from injector import inject, singleton
+
+from manga_dl.model.CachedResponse import CachedResponse
+from manga_dl.util.Timer import Timer
+
+
+@singleton
+class ResponseCache:
+    logger = logging.getLogger("ResponseCache")
+    DEFAULT_PATH = Path.home() / ".cache/manga-dl/responses.db"
+    DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+    @inject
+    def __init__(self, timer: Timer):
+        self.timer = timer
+        self.path = self.DEFAULT_PATH
+        self.max_size = self.DEFAULT_MAX_SIZE
+        self.offline = False
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def set_path(self, path: Path):
+        self.close()
+        self.path = path
+
+    def set_max_size(self, max_size: int):
+        self.max_size = max_size
+
+    def set_offline(self, offline: bool):
+        self.offline = offline
+
+    @staticmethod
+    def get_key(url: str, params: Dict[str, Any]) -> str:
+        query = urlencode(sorted(params.items()), doseq=True)
+        return url if query == "" else f"{url}?{query}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                row = connection.execute(
+                    "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "UPDATE responses SET accessed_at = ? WHERE key = ?", (self.timer.time(), key)
+                    )
+        return None if row is None else CachedResponse(*row)
+
+    def put(self, key: str, body: str, etag: Optional[str], last_modified: Optional[str]):
+        now = self.timer.time()
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, body, etag, last_modified, stored_at, accessed_at, size) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, body, etag, last_modified, now, now, len(body))
+                )
+                self._evict(connection)
+
+    def refresh(self, key: str):
+        now = self.timer.time()
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute(
+                    "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+                )
+
+    def get_size(self) -> int:
+        with self._lock:
+            return self._get_connection().execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _evict(self, connection: sqlite3.Connection):
+        total_size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total_size <= self.max_size:
+            return
+
+        entries = connection.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        evicted = []
+        for key, size in entries:
+            if total_size <= self.max_size:
+                break
+            evicted.append((key,))
+            total_size -= size
+
+        connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self.logger.info(f"Evicted {len(evicted)} cached responses")
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, body TEXT, etag TEXT, last_modified TEXT, stored_at REAL, "
+                    "accessed_at REAL, size INTEGER)"
+                )
+        return self._connection
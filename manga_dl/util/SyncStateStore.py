@@ -0,0 +1,108 @@
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from injector import singleton
+
+from manga_dl.model.ChapterState import ChapterState
+from manga_dl.model.MangaChapter import MangaChapter
+
+
+@singleton
+class SyncStateStore:
+    DEFAULT_PATH = Path.home() / ".local/share/manga-dl/state.db"
+
+    def __init__(self):
+        self.path = self.DEFAULT_PATH
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def set_path(self, path: Path):
+        self.close()
+        self.path = path
+
+    def get_last_sync(self, series_id: str) -> Optional[datetime]:
+        row = self._query_one("SELECT last_sync FROM series WHERE series_id = ?", (series_id,))
+        return None if row is None else self._parse_datetime(row[0])
+
+    def set_last_sync(self, series_id: str, last_sync: datetime):
+        self._execute(
+            "INSERT INTO series (series_id, last_sync) VALUES (?, ?) "
+            "ON CONFLICT (series_id) DO UPDATE SET last_sync = excluded.last_sync",
+            (series_id, last_sync.isoformat())
+        )
+
+    def get_chapter_state(self, series_id: str, chapter_id: str) -> Optional[ChapterState]:
+        row = self._query_one(
+            "SELECT chapter_id, chapter_hash, updated_at, downloaded_at FROM chapters "
+            "WHERE series_id = ? AND chapter_id = ?",
+            (series_id, chapter_id)
+        )
+
+        if row is None:
+            return None
+
+        chapter_id, chapter_hash, updated_at, downloaded_at = row
+        return ChapterState(
+            chapter_id, chapter_hash, self._parse_datetime(updated_at), datetime.fromisoformat(downloaded_at)
+        )
+
+    def mark_downloaded(self, series_id: str, chapter: MangaChapter, downloaded_at: datetime):
+        if chapter.id is None:
+            return
+
+        self._execute(
+            "INSERT OR REPLACE INTO chapters (series_id, chapter_id, number, chapter_hash, updated_at, downloaded_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                series_id, chapter.id, str(chapter.number), chapter.content_hash,
+                self._format_datetime(chapter.updated_at), downloaded_at.isoformat()
+            )
+        )
+
+    def mark_unchanged(self, series_id: str, chapter: MangaChapter):
+        self._execute(
+            "UPDATE chapters SET updated_at = ? WHERE series_id = ? AND chapter_id = ?",
+            (self._format_datetime(chapter.updated_at), series_id, chapter.id)
+        )
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _execute(self, statement: str, parameters: tuple):
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute(statement, parameters)
+
+    def _query_one(self, statement: str, parameters: tuple) -> Optional[tuple]:
+        with self._lock:
+            return self._get_connection().execute(statement, parameters).fetchone()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS series (series_id TEXT PRIMARY KEY, last_sync TEXT)"
+                )
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS chapters ("
+                    "series_id TEXT, chapter_id TEXT, number TEXT, chapter_hash TEXT, updated_at TEXT, "
+                    "downloaded_at TEXT, PRIMARY KEY (series_id, chapter_id))"
+                )
+        return self._connection
+
+    @staticmethod
+    def _format_datetime(value: Optional[datetime]) -> Optional[str]:
+        return None if value is None else value.isoformat()
+
+    @staticmethod
+    def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+        return None if value is None else datetime.fromisoformat(value)
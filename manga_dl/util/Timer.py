@@ -1,8 +1,24 @@
+import asyncio
 import time
 
+from injector import singleton
 
+
+@singleton
 class Timer:
 
     @staticmethod
     def sleep(seconds: float):
         time.sleep(seconds)
+
+    @staticmethod
+    async def sleep_async(seconds: float):
+        await asyncio.sleep(seconds)
+
+    @staticmethod
+    def monotonic() -> float:
+        return time.monotonic()
+
+    @staticmethod
+    def time() -> float:
+        return time.time()
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class TokenBucket:
+    rate: float
+    capacity: float
+    tokens: float
+    updated_at: float
+    blocked_until: float = 0.0
@@ -20,6 +20,7 @@ if __name__ == "__main__":
         scripts=list(map(lambda x: os.path.join("bin", x), os.listdir("bin"))),
         install_requires=[
             "requests",
+            "aiohttp",
             "sentry-sdk",
             "injector",
             "lxml",
@@ -31,6 +32,16 @@ if __name__ == "__main__":
             "pytest-unordered",
             "pytest-cov"
         ],
+        entry_points={
+            "manga_dl.scraping_methods": [
+                "mangadex = manga_dl.scraping.methods.MangadexScraping:MangadexScraping"
+            ],
+            "manga_dl.bundlers": [
+                "cbz = manga_dl.bundling.impl.CBZBundler:CBZBundler",
+                "zip = manga_dl.bundling.impl.ZipBundler:ZipBundler",
+                "dir = manga_dl.bundling.impl.DirectoryBundler:DirectoryBundler"
+            ]
+        },
         include_package_data=True,
         zip_safe=False
     )